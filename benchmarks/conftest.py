@@ -0,0 +1,72 @@
+# benchmarks/conftest.py
+import json
+import pytest
+from spliit import FakeSpliitServer, Spliit, SplitMode
+
+PARTICIPANTS = ["John", "Jane", "Alice", "Bob"]
+
+
+def make_expenses(count, participants=("p0", "p1", "p2", "p3")):
+    """Build ``groups.expenses.list`` items shaped like the API's."""
+    return [
+        {
+            "id": f"e{index}",
+            "title": f"Expense {index}",
+            "amount": 1000 + index,
+            "category": {"id": index % 40, "grouping": "Uncategorized", "name": "General"},
+            "createdAt": "2025-02-20T10:00:00.000Z",
+            "expenseDate": f"2025-02-{index % 28 + 1:02d}T00:00:00.000Z",
+            "isReimbursement": False,
+            "paidBy": {"id": participants[index % len(participants)], "name": "Payer"},
+            "paidFor": [
+                {"participant": {"id": participant, "name": participant}, "shares": 100}
+                for participant in participants
+            ],
+            "splitMode": SplitMode.EVENLY.value,
+            "recurrenceRule": None,
+            "_count": {"documents": 0},
+        }
+        for index in range(count)
+    ]
+
+
+class StaticResponse:
+    """Minimal response object holding an encoded body."""
+
+    status_code = 200
+
+    def __init__(self, payload):
+        self.content = json.dumps(payload).encode()
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture(scope="session")
+def server():
+    with FakeSpliitServer(seed=0) as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def client(server):
+    """Client of a group with four participants and 200 expenses."""
+    client = Spliit.create_group(
+        "Benchmark", server_url=server.url, participants=[{"name": name} for name in PARTICIPANTS]
+    )
+    ids = [participant["id"] for participant in client.get_group()["participants"]]
+    result = client.add_expenses(
+        [
+            {
+                "title": f"Expense {index}",
+                "amount": 1000 + index,
+                "paid_by": ids[index % len(ids)],
+                "paid_for": [(participant_id, 1) for participant_id in ids],
+            }
+            for index in range(200)
+        ],
+        chunk_size=50,
+    )
+    assert result.ok
+    yield client
+    client.close()
@@ -0,0 +1,80 @@
+import itertools
+from spliit import Spliit
+
+
+def test_get_group(benchmark, client):
+    group = benchmark(client.get_group)
+    assert group["name"] == "Benchmark"
+
+
+def test_get_participants(benchmark, client):
+    assert len(benchmark(client.get_participants)) == 4
+
+
+def test_get_username_id(benchmark, client):
+    assert benchmark(client.get_username_id, "Jane")
+
+
+def test_get_expenses(benchmark, client):
+    assert len(benchmark(client.get_expenses)) >= 200
+
+
+def test_iter_expenses(benchmark, client):
+    assert benchmark(lambda: sum(1 for _ in client.iter_expenses(page_size=50))) >= 200
+
+
+def test_get_expense_page(benchmark, client):
+    page = benchmark(client.get_expense_page, 0, 50)
+    assert len(page["expenses"]) == 50
+
+
+def test_get_expense(benchmark, client):
+    expense_id = client.get_expense_page(0, 1)["expenses"][0]["id"]
+    assert benchmark(client.get_expense, expense_id)["id"] == expense_id
+
+
+def test_batch_get_expense(benchmark, client):
+    ids = [expense["id"] for expense in client.get_expense_page(0, 20)["expenses"]]
+
+    def run():
+        with client.batch() as batch:
+            calls = [batch.get_expense(expense_id) for expense_id in ids]
+        return [call.result() for call in calls]
+
+    assert len(benchmark(run)) == 20
+
+
+def test_get_balances(benchmark, client):
+    assert len(benchmark(client.get_balances)) == 4
+
+
+def test_add_and_remove_expense(benchmark, client):
+    payer = client.get_username_id("John")
+    counter = itertools.count()
+
+    def run():
+        client.add_expense(f"Bench {next(counter)}", 100, payer, [(payer, 1)])
+
+    benchmark(run)
+    # Keep the group at its seeded size for the other benchmarks
+    for expense in client.get_expenses():
+        if expense["title"].startswith("Bench "):
+            client.remove_expense(expense["id"])
+
+
+def test_remove_expense(benchmark, client):
+    payer = client.get_username_id("John")
+
+    def setup():
+        response = client.add_expense("Removed", 100, payer, [(payer, 1)])
+        expense_id = client.codec.loads(response)[0]["result"]["data"]["json"]["expenseId"]
+        return (expense_id,), {}
+
+    benchmark.pedantic(client.remove_expense, setup=setup, rounds=50)
+
+
+def test_create_group(benchmark, server):
+    def run():
+        Spliit.create_group("Created", server_url=server.url, participants=[{"name": "John"}]).close()
+
+    benchmark(run)
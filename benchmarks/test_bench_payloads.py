@@ -0,0 +1,45 @@
+import pytest
+from datetime import datetime
+from conftest import StaticResponse, make_expenses
+from spliit import ExpenseTable, SplitMode, compute_balances, format_expense_payload, get_codec, get_current_timestamp
+from spliit.codec import CODECS
+from spliit.trpc import decode_batch_response
+
+
+def test_format_expense_payload(benchmark):
+    paid_for = [(f"p{index}", 25) for index in range(4)]
+    benchmark(
+        format_expense_payload,
+        "group", "Dinner", 4200, "p0", paid_for, SplitMode.BY_PERCENTAGE, datetime(2025, 2, 20, 10), "notes", 8,
+    )
+
+
+def test_get_current_timestamp(benchmark):
+    benchmark(get_current_timestamp)
+
+
+@pytest.mark.parametrize("codec_name", list(CODECS))
+@pytest.mark.parametrize("size", [10, 2000])
+def test_decode_expense_list(benchmark, codec_name, size):
+    try:
+        codec = get_codec(codec_name)
+    except ImportError:
+        pytest.skip(f"{codec_name} is not installed")
+    response = StaticResponse([{"result": {"data": {"json": {
+        "expenses": make_expenses(size), "hasMore": False, "nextCursor": size,
+    }}}}])
+    items = benchmark(decode_batch_response, response, 1, codec)
+    assert len(items[0]["result"]["data"]["json"]["expenses"]) == size
+
+
+@pytest.mark.parametrize("size", [10, 2000])
+def test_build_expense_table(benchmark, size):
+    expenses = make_expenses(size)
+    table = benchmark(ExpenseTable.from_expenses, expenses)
+    assert len(table) == size
+
+
+def test_compute_balances(benchmark):
+    expenses = make_expenses(2000)
+    balances = benchmark(compute_balances, expenses, False)
+    assert sum(balance.total for balance in balances.values()) == 0
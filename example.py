@@ -6,6 +6,7 @@ import json
 sys.path.append(str(Path(__file__).parent / "src"))
 
 from spliit.client import Spliit
+from spliit.balances import compute_balances
 
 # Your group ID from Spliit
 GROUP_ID = "nldjPQDNgMJaiwigAr4HE"
@@ -27,10 +28,14 @@ print("\nExpenses:")
 for expense in expenses:
     print(f"\n{expense['title']} - {expense['amount']/100:.2f} {group['currency']}")
     print(f"Paid by: {expense['paidBy']['name']}")
-    print("Paid for:")
-    for paid_for in expense['paidFor']:
-        share_amount = (expense['amount'] * paid_for['shares']) / 300  # 300 is total shares (100 per person)
-        print(f"  - {paid_for['participant']['name']}: {share_amount/100:.2f} {group['currency']}")
+    print("Paid for:", ", ".join(paid_for['participant']['name'] for paid_for in expense['paidFor']))
+
+# Compute who owes what, following each expense's split mode
+balances = compute_balances(expenses)
+names = {participant_id: name for name, participant_id in participants.items()}
+print("\nBalances:")
+for participant_id, balance in balances.items():
+    print(f"  - {names.get(participant_id, participant_id)}: {balance.total/100:.2f} {group['currency']}")
 
 # Example of adding an expense (commented out - uncomment and modify as needed)
 # Add an expense where someone paid for others
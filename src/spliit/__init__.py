@@ -1,9 +1,108 @@
 #!/usr/bin/env python3
 """
 Python client for the Spliit expense sharing application API.
+
+Names are imported from their submodules on first access, so importing the
+package (e.g. by the ``spliit`` command) does not load ``requests``,
+``httpx`` or the other heavier dependencies until they are used.
 """
 
-from .client import Spliit, CATEGORIES, get_current_timestamp
+import importlib
+from typing import Any, List, TYPE_CHECKING
 
 __version__ = "0.1.5"
-__all__ = ["Spliit", "CATEGORIES", "get_current_timestamp"]
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    "Spliit": ".client",
+    "CATEGORIES": ".utils",
+    "get_current_timestamp": ".utils",
+    "SplitMode": ".utils",
+    "format_expense_payload": ".utils",
+    "Transport": ".transport",
+    "PoolConfig": ".transport",
+    "RetryPolicy": ".retry",
+    "TokenBucket": ".retry",
+    "ResponseCache": ".http_cache",
+    "Batch": ".batch",
+    "BatchCall": ".batch",
+    "SpliitError": ".exceptions",
+    "TRPCError": ".exceptions",
+    "AsyncSpliit": ".async_client",
+    "BulkResult": ".bulk",
+    "BulkItemResult": ".bulk",
+    "GroupCache": ".cache",
+    "ParticipantIndex": ".cache",
+    "ExpenseMirror": ".mirror",
+    "SyncResult": ".mirror",
+    "ExpenseEvent": ".watch",
+    "ExpenseWatcher": ".watch",
+    "EventKind": ".watch",
+    "Balance": ".balances",
+    "compute_balances": ".balances",
+    "Transfer": ".settle",
+    "plan_settlement": ".settle",
+    "Category": ".categories",
+    "CategoryIndex": ".categories",
+    "CategoryStats": ".categories",
+    "CATEGORY_INDEX": ".categories",
+    "ExpenseTable": ".table",
+    "ExpenseRow": ".table",
+    "JSONCodec": ".codec",
+    "get_codec": ".codec",
+    "Hooks": ".instrumentation",
+    "RequestEvent": ".instrumentation",
+    "StatsCollector": ".instrumentation",
+    "FakeSpliitServer": ".fake_server",
+    "ColumnMapping": ".importer",
+    "ExpenseImporter": ".importer",
+    "ImportReport": ".importer",
+    "import_file": ".importer",
+    "export_expenses": ".export",
+    "Outbox": ".outbox",
+    "OutboxEntry": ".outbox",
+    "FlushResult": ".outbox",
+    "SpliitManager": ".manager",
+    "GroupResult": ".manager",
+    "GroupResults": ".manager",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .client import Spliit
+    from .transport import Transport, PoolConfig
+    from .retry import RetryPolicy, TokenBucket
+    from .http_cache import ResponseCache
+    from .batch import Batch, BatchCall
+    from .exceptions import SpliitError, TRPCError
+    from .async_client import AsyncSpliit
+    from .bulk import BulkResult, BulkItemResult
+    from .cache import GroupCache, ParticipantIndex
+    from .mirror import ExpenseMirror, SyncResult
+    from .watch import EventKind, ExpenseEvent, ExpenseWatcher
+    from .balances import Balance, compute_balances
+    from .settle import Transfer, plan_settlement
+    from .categories import Category, CategoryIndex, CategoryStats, CATEGORY_INDEX
+    from .table import ExpenseTable, ExpenseRow
+    from .codec import JSONCodec, get_codec
+    from .instrumentation import Hooks, RequestEvent, StatsCollector
+    from .fake_server import FakeSpliitServer
+    from .importer import ColumnMapping, ExpenseImporter, ImportReport, import_file
+    from .export import export_expenses
+    from .outbox import Outbox, OutboxEntry, FlushResult
+    from .manager import SpliitManager, GroupResult, GroupResults
+    from .utils import CATEGORIES, SplitMode, format_expense_payload, get_current_timestamp
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
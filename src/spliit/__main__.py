@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+"""
+Run the ``spliit`` command with ``python -m spliit``.
+"""
+
+import sys
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Asyncio implementation of the Spliit API client.
+
+Requires the optional ``httpx`` dependency (``pip install spliit-api-client[async]``).
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Any, TYPE_CHECKING
+from urllib.parse import urljoin
+from datetime import datetime, timezone
+from .codec import JSONCodec, default_codec
+from .trpc import JSON_HEADERS
+from .retry import RetryPolicy, TokenBucket
+from .utils import (
+    SplitMode,
+    OFFICIAL_INSTANCE,
+    format_expense_payload,
+    format_group_payload,
+    parse_timestamp,
+    as_utc,
+)
+
+if TYPE_CHECKING:
+    from .watch import ExpenseEvent
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+def _require_httpx() -> None:
+    if httpx is None:
+        raise ImportError(
+            "AsyncSpliit requires httpx; install it with "
+            "'pip install spliit-api-client[async]'"
+        )
+
+
+@dataclass
+class AsyncSpliit:
+    """
+    Asyncio client for interacting with the Spliit API.
+
+    At most ``max_concurrency`` requests are in flight at once. Pass the same
+    ``http_client`` and ``semaphore`` to several instances to share their
+    connections and concurrency limit; an HTTP client created by the instance
+    itself is closed by :meth:`aclose`.
+
+    Requests are retried and throttled like those of :class:`Transport`,
+    according to ``retry`` and the optional ``rate_limiter``.
+    """
+
+    group_id: str
+    server_url: str = OFFICIAL_INSTANCE
+    max_concurrency: int = 20
+    timeout: float = 30.0
+    http_client: Optional["httpx.AsyncClient"] = field(default=None, repr=False, compare=False)
+    semaphore: Optional[asyncio.Semaphore] = field(default=None, repr=False, compare=False)
+    codec: Optional[JSONCodec] = field(default=None, repr=False, compare=False)
+    retry: RetryPolicy = field(default_factory=RetryPolicy, repr=False, compare=False)
+    rate_limiter: Optional[TokenBucket] = field(default=None, repr=False, compare=False)
+    _owns_client: bool = field(default=False, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        _require_httpx()
+        if self.http_client is None:
+            self.http_client = self.create_http_client(self.max_concurrency, self.timeout)
+            self._owns_client = True
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.codec is None:
+            self.codec = default_codec
+
+    @staticmethod
+    def create_http_client(max_connections: int = 20, timeout: float = 30.0) -> "httpx.AsyncClient":
+        """Create a pooled HTTP client suitable for sharing between instances."""
+        _require_httpx()
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+        )
+
+    @property
+    def base_url(self) -> str:
+        """Get the base URL for API requests."""
+        return urljoin(self.server_url, "/api/trpc")
+
+    async def aclose(self) -> None:
+        """Close the HTTP client if it is owned by this instance."""
+        if self._owns_client:
+            await self.http_client.aclose()
+
+    async def __aenter__(self) -> "AsyncSpliit":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> "httpx.Response":
+        """Send a request, retrying it according to the retry policy."""
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            try:
+                async with self.semaphore:
+                    response = await self.http_client.request(method, url, **kwargs)
+            except httpx.TransportError as error:
+                if not self.retry.should_retry_error(method, error, attempt):
+                    raise
+                delay = self.retry.delay(attempt + 1)
+            else:
+                retry_after = response.headers.get("Retry-After") if response.status_code == 429 else None
+                if retry_after is not None and self.rate_limiter is not None:
+                    self.rate_limiter.pause(self.retry.delay(attempt + 1, retry_after))
+                if not self.retry.should_retry_status(method, response.status_code, attempt):
+                    return response
+                delay = self.retry.delay(attempt + 1, retry_after)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _get(self, procedures: str, params_input: Dict[str, Any]) -> List[Any]:
+        params = {
+            "batch": "1",
+            "input": self.codec.dumps(params_input)
+        }
+        response = await self._request("GET", f"{self.base_url}/{procedures}", params=params)
+        response.raise_for_status()
+        return self.codec.loads(response.content)
+
+    async def _post(self, procedure: str, json_data: Dict[str, Any]) -> "httpx.Response":
+        response = await self._request(
+            "POST",
+            f"{self.base_url}/{procedure}",
+            params={"batch": "1"},
+            content=self.codec.dumps_bytes(json_data),
+            headers=JSON_HEADERS
+        )
+        response.raise_for_status()
+        return response
+
+    @classmethod
+    async def create_group(
+        cls,
+        name: str,
+        currency: str = "$",
+        server_url: str = OFFICIAL_INSTANCE,
+        participants: List[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> "AsyncSpliit":
+        """
+        Create a new group and return a client instance for it.
+
+        Extra keyword arguments are passed to the returned instance.
+        """
+        client = cls(group_id="", server_url=server_url, **kwargs)
+        try:
+            response = await client._post(
+                "groups.create", format_group_payload(name, currency, participants)
+            )
+        except BaseException:
+            await client.aclose()
+            raise
+        client.group_id = client.codec.loads(response.content)[0]["result"]["data"]["json"]["groupId"]
+        return client
+
+    async def get_group(self) -> Dict:
+        """Get group details."""
+        params_input = {
+            "0": {"json": {"groupId": self.group_id}},
+            "1": {"json": {"groupId": self.group_id}}
+        }
+        data = await self._get("groups.get,groups.getDetails", params_input)
+        return data[0]["result"]["data"]["json"]["group"]
+
+    async def get_username_id(self, name: str) -> Optional[str]:
+        """Get participant ID by name."""
+        group = await self.get_group()
+        for participant in group["participants"]:
+            if name == participant["name"]:
+                return participant["id"]
+        return None
+
+    async def get_participants(self) -> Dict[str, str]:
+        """Get all participants with their IDs."""
+        group = await self.get_group()
+        return {
+            participant["name"]: participant["id"]
+            for participant in group["participants"]
+        }
+
+    async def get_expenses(self) -> List[Dict]:
+        """Get all expenses in the group."""
+        params_input = {
+            "0": {"json": {"groupId": self.group_id}}
+        }
+        data = await self._get("groups.expenses.list", params_input)
+        return data[0]["result"]["data"]["json"]["expenses"]
+
+    async def iter_expenses(self, page_size: int = 50, since: Optional[datetime] = None) -> AsyncIterator[Dict]:
+        """
+        Iterate over the group's expenses page by page, newest first.
+
+        See :meth:`Spliit.iter_expenses` for the arguments.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        since = as_utc(since) if since is not None else None
+        cursor = 0
+        while True:
+            page = await self.get_expense_page(cursor=cursor, limit=page_size)
+            for expense in page["expenses"]:
+                if since is not None and parse_timestamp(expense["expenseDate"]) < since:
+                    return
+                yield expense
+            if not page.get("hasMore") or not page["expenses"]:
+                return
+            cursor = page.get("nextCursor", cursor + page_size)
+
+    def watch(self, **kwargs: Any) -> AsyncIterator["ExpenseEvent"]:
+        """
+        Poll the group and yield added, updated and deleted expenses.
+
+        See :func:`spliit.watch.awatch` for the options.
+        """
+        from .watch import awatch
+
+        return awatch(self, **kwargs)
+
+    async def get_expense_page(self, cursor: int = 0, limit: int = 50) -> Dict:
+        """Get one page of the group's expenses."""
+        params_input = {
+            "0": {"json": {"groupId": self.group_id, "cursor": cursor, "limit": limit}}
+        }
+        data = await self._get("groups.expenses.list", params_input)
+        return data[0]["result"]["data"]["json"]
+
+    async def get_expense(self, expense_id: str) -> Dict:
+        """
+        Get details of a specific expense.
+
+        Args:
+            expense_id: The ID of the expense to retrieve
+
+        Returns:
+            Dict containing the expense details
+        """
+        params_input = {
+            "0": {"json": {"groupId": self.group_id, "expenseId": expense_id}}
+        }
+        data = await self._get("groups.expenses.get", params_input)
+        return data[0]["result"]["data"]["json"]["expense"]
+
+    async def add_expense(
+        self,
+        title: str,
+        amount: int,
+        paid_by: str,
+        paid_for: List[Tuple[str, int]],
+        split_mode: SplitMode = SplitMode.EVENLY,
+        expense_date: Optional[datetime] = None,
+        notes: str = "",
+        category: int = 0,
+        is_reimbursement: bool = False
+    ) -> str:
+        """
+        Add a new expense to the group.
+
+        Takes the same arguments as :meth:`Spliit.add_expense` and returns the
+        raw response content.
+        """
+        if expense_date is None:
+            expense_date = datetime.now(timezone.utc)
+
+        json_data = format_expense_payload(
+            self.group_id,
+            title,
+            amount,
+            paid_by,
+            paid_for,
+            split_mode,
+            expense_date,
+            notes,
+            category,
+            is_reimbursement
+        )
+        response = await self._post("groups.expenses.create", json_data)
+        return response.text
+
+    async def remove_expense(self, expense_id: str) -> Dict:
+        """
+        Remove an expense from the group.
+
+        Args:
+            expense_id: The ID of the expense to remove
+
+        Returns:
+            Dict containing the response data
+        """
+        json_data = {
+            "0": {"json": {"groupId": self.group_id, "expenseId": expense_id}}
+        }
+        response = await self._post("groups.expenses.delete", json_data)
+        return self.codec.loads(response.content)[0]["result"]["data"]["json"]
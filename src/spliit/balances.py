@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Local computation of participant balances, matching Spliit's server logic.
+
+Expenses are flattened into a sparse participant-by-expense share matrix
+(one entry per ``paidFor`` row) and reduced with NumPy when it is installed
+(``pip install spliit-api-client[numpy]``), or with plain Python otherwise.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from .utils import SplitMode, paid_by_id, paid_for_id
+
+# NumPy is slow to import, so it is only imported by the first computation
+np: Any = None
+_numpy_loaded = False
+
+
+def _load_numpy() -> Any:
+    """Import NumPy on first use; ``None`` when it is not installed."""
+    global np, _numpy_loaded
+    if not _numpy_loaded:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - optional dependency
+            numpy = None
+        np = numpy
+        _numpy_loaded = True
+    return np
+
+
+@dataclass
+class Balance:
+    """Amounts in cents paid and owed by one participant."""
+
+    paid: int = 0
+    paid_for: int = 0
+
+    @property
+    def total(self) -> int:
+        """Get the net balance: positive when the participant is owed money."""
+        return self.paid - self.paid_for
+
+
+@dataclass
+class ShareMatrix:
+    """
+    Columnar form of a list of expenses.
+
+    ``amounts``, ``payers`` and ``evenly`` have one value per expense; the
+    ``share_*`` columns have one value per ``paidFor`` entry, grouped by
+    expense in order. Participants are referenced by their index in
+    ``participants``.
+    """
+
+    participants: List[str]
+    amounts: List[int]
+    payers: List[int]
+    evenly: List[bool]
+    share_expenses: List[int]
+    share_participants: List[int]
+    share_weights: List[float]
+
+    @classmethod
+    def from_expenses(cls, expenses: Iterable[Dict[str, Any]]) -> "ShareMatrix":
+        """Build the matrix from expenses as returned by the API."""
+        index: Dict[str, int] = {}
+        matrix = cls([], [], [], [], [], [], [])
+
+        def participant_index(participant_id: str) -> int:
+            position = index.get(participant_id)
+            if position is None:
+                position = index[participant_id] = len(matrix.participants)
+                matrix.participants.append(participant_id)
+            return position
+
+        for expense_index, expense in enumerate(expenses):
+            matrix.amounts.append(int(expense["amount"]))
+            matrix.payers.append(participant_index(paid_by_id(expense)))
+            matrix.evenly.append(expense.get("splitMode", SplitMode.EVENLY.value) == SplitMode.EVENLY.value)
+            for paid_for in expense.get("paidFor", []):
+                matrix.share_expenses.append(expense_index)
+                matrix.share_participants.append(participant_index(paid_for_id(paid_for)))
+                matrix.share_weights.append(float(paid_for["shares"]))
+        return matrix
+
+
+def _round(value: float) -> int:
+    # JavaScript's Math.round: halves are rounded towards positive infinity
+    return int(math.floor(value + 0.5))
+
+
+def split_shares(amount: int, weights: Sequence[float]) -> List[float]:
+    """
+    Divide an amount in proportion to weights, like the Spliit server.
+
+    The last entry receives the remainder, so the parts add up to the amount.
+    """
+    total_weight = sum(weights)
+    remaining = float(amount)
+    parts = []
+    for offset, weight in enumerate(weights):
+        if offset == len(weights) - 1:
+            divided = remaining
+        elif total_weight == 0:
+            divided = 0.0
+        else:
+            divided = amount * weight / total_weight
+        remaining -= divided
+        parts.append(divided)
+    return parts
+
+
+def _reduce_python(matrix: ShareMatrix) -> Tuple[List[float], List[float]]:
+    paid = [0.0] * len(matrix.participants)
+    paid_for = [0.0] * len(matrix.participants)
+    for expense_index, amount in enumerate(matrix.amounts):
+        paid[matrix.payers[expense_index]] += amount
+
+    start = 0
+    count = len(matrix.share_expenses)
+    while start < count:
+        expense_index = matrix.share_expenses[start]
+        end = start
+        while end < count and matrix.share_expenses[end] == expense_index:
+            end += 1
+        if matrix.evenly[expense_index]:
+            weights: Sequence[float] = [1.0] * (end - start)
+        else:
+            weights = matrix.share_weights[start:end]
+        for offset, divided in enumerate(split_shares(matrix.amounts[expense_index], weights)):
+            paid_for[matrix.share_participants[start + offset]] += divided
+        start = end
+    return paid, paid_for
+
+
+def _reduce_numpy(matrix: ShareMatrix) -> Tuple[Sequence[float], Sequence[float]]:
+    size = len(matrix.participants)
+    amounts = np.asarray(matrix.amounts, dtype=np.float64)
+    paid = np.bincount(np.asarray(matrix.payers, dtype=np.intp), weights=amounts, minlength=size)
+    if not matrix.share_expenses:
+        return paid, np.zeros(size)
+
+    expenses = np.asarray(matrix.share_expenses, dtype=np.intp)
+    participants = np.asarray(matrix.share_participants, dtype=np.intp)
+    evenly = np.asarray(matrix.evenly, dtype=bool)[expenses]
+    weights = np.where(evenly, 1.0, np.asarray(matrix.share_weights, dtype=np.float64))
+
+    expense_count = len(matrix.amounts)
+    total_weights = np.bincount(expenses, weights=weights, minlength=expense_count)[expenses]
+    share_amounts = amounts[expenses]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        divided = np.where(total_weights != 0, share_amounts * weights / total_weights, 0.0)
+
+    # The last entry of every expense receives the remainder
+    is_last = np.ones(len(expenses), dtype=bool)
+    is_last[:-1] = expenses[1:] != expenses[:-1]
+    others = np.where(is_last, 0.0, divided)
+    others_sum = np.bincount(expenses, weights=others, minlength=expense_count)[expenses]
+    divided = np.where(is_last, share_amounts - others_sum, divided)
+
+    paid_for = np.bincount(participants, weights=divided, minlength=size)
+    return paid, paid_for
+
+
+def compute_balances(
+    expenses: Iterable[Dict[str, Any]],
+    use_numpy: Optional[bool] = None,
+) -> Dict[str, Balance]:
+    """
+    Compute per-participant balances the way the Spliit server does.
+
+    Each participant's share of an expense follows its split mode, the last
+    participant of an expense receives the remainder, and totals are rounded
+    to whole cents per participant.
+
+    Args:
+        expenses: Expenses as returned by :meth:`Spliit.get_expenses`, or a
+            :class:`ShareMatrix`
+        use_numpy: Force or disable the NumPy implementation; by default it
+            is used when NumPy is installed
+
+    Returns:
+        Dict mapping participant IDs to their :class:`Balance`
+    """
+    matrix = expenses if isinstance(expenses, ShareMatrix) else ShareMatrix.from_expenses(expenses)
+    numpy = _load_numpy()
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    if use_numpy and numpy is None:
+        raise ImportError("NumPy is not installed")
+
+    paid, paid_for = _reduce_numpy(matrix) if use_numpy else _reduce_python(matrix)
+    return {
+        participant_id: Balance(paid=_round(paid[index]), paid_for=_round(paid_for[index]))
+        for index, participant_id in enumerate(matrix.participants)
+    }
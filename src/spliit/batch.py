@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Batch executor that packs many tRPC procedure calls into few HTTP requests.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+import requests
+from .codec import JSONCodec, default_codec
+from .exceptions import SpliitError
+from .trpc import JSON_HEADERS, encode_batch_input, unwrap_result, decode_batch_response
+from .utils import SplitMode, format_expense_payload
+
+if TYPE_CHECKING:
+    from .client import Spliit
+    from .transport import Transport
+
+_PENDING = object()
+
+
+class BatchCall:
+    """
+    Handle for a single procedure call queued in a :class:`Batch`.
+
+    The call is resolved once the batch is executed; :meth:`result` then
+    returns the call's data or raises its error.
+    """
+
+    def __init__(
+        self,
+        procedure: str,
+        envelope: Dict[str, Any],
+        extract: Callable[[Any], Any] = lambda data: data,
+        mutation: bool = False,
+    ):
+        self.procedure = procedure
+        self.envelope = envelope
+        self.mutation = mutation
+        self._extract = extract
+        self._result: Any = _PENDING
+        self._error: Optional[BaseException] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the call has been executed."""
+        return self._result is not _PENDING or self._error is not None
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """Get the error of the call, if it failed."""
+        return self._error
+
+    def result(self) -> Any:
+        """
+        Get the result of the call.
+
+        Raises:
+            SpliitError: If the batch has not been executed yet
+            TRPCError: If the server returned an error for this call
+        """
+        if self._error is not None:
+            raise self._error
+        if self._result is _PENDING:
+            raise SpliitError(f"{self.procedure}: batch has not been executed")
+        return self._result
+
+    def _resolve(self, item: Dict[str, Any]) -> None:
+        try:
+            self._result = self._extract(unwrap_result(item, self.procedure))
+        except (SpliitError, KeyError, TypeError) as error:
+            self._error = error
+
+    def _fail(self, error: BaseException) -> None:
+        self._error = error
+
+    def __repr__(self) -> str:
+        state = "failed" if self._error is not None else "done" if self.done else "pending"
+        return f"<BatchCall {self.procedure} {state}>"
+
+
+def execute_calls(
+    transport: "Transport",
+    base_url: str,
+    calls: List[BatchCall],
+    codec: JSONCodec = default_codec,
+) -> None:
+    """
+    Send calls of the same kind in one HTTP request and resolve them.
+
+    Queries are sent as a single GET and mutations as a single POST. A
+    failure of the request itself is recorded on every call.
+    """
+    if not calls:
+        return
+    mutation = calls[0].mutation
+    if any(call.mutation != mutation for call in calls):
+        raise ValueError("Cannot mix queries and mutations in one request")
+
+    url = f"{base_url}/{','.join(call.procedure for call in calls)}"
+    payload = encode_batch_input([call.envelope for call in calls])
+    try:
+        if mutation:
+            response = transport.post(
+                url,
+                params={"batch": "1"},
+                data=codec.dumps_bytes(payload),
+                headers=JSON_HEADERS,
+            )
+        else:
+            response = transport.get(
+                url, params={"batch": "1", "input": codec.dumps(payload)}
+            )
+        items = decode_batch_response(response, len(calls), codec)
+    except (requests.RequestException, SpliitError) as error:
+        for call in calls:
+            call._fail(error)
+        return
+
+    for call, item in zip(calls, items):
+        call._resolve(item)
+
+
+class Batch:
+    """
+    Collects procedure calls and executes them in as few requests as possible.
+
+    Consecutive queries are packed into one GET and consecutive mutations
+    into one POST, in chunks of at most ``max_size`` calls. Calls keep their
+    queue order. Usually created through :meth:`Spliit.batch`::
+
+        with client.batch() as batch:
+            first = batch.get_expense(first_id)
+            second = batch.get_expense(second_id)
+        print(first.result(), second.result())
+    """
+
+    def __init__(self, client: "Spliit", max_size: int = 50):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.client = client
+        self.max_size = max_size
+        self.calls: List[BatchCall] = []
+        self._pending: List[BatchCall] = []
+
+    def add(self, call: BatchCall) -> BatchCall:
+        """Queue a call for the next execution."""
+        self.calls.append(call)
+        self._pending.append(call)
+        return call
+
+    def get_group(self) -> BatchCall:
+        """Queue a request for the group details."""
+        return self.add(BatchCall(
+            "groups.get",
+            {"json": {"groupId": self.client.group_id}},
+            lambda data: data["group"],
+        ))
+
+    def get_expenses(self) -> BatchCall:
+        """Queue a request for all expenses in the group."""
+        return self.add(BatchCall(
+            "groups.expenses.list",
+            {"json": {"groupId": self.client.group_id}},
+            lambda data: data["expenses"],
+        ))
+
+    def get_expense(self, expense_id: str) -> BatchCall:
+        """Queue a request for the details of a specific expense."""
+        return self.add(BatchCall(
+            "groups.expenses.get",
+            {"json": {"groupId": self.client.group_id, "expenseId": expense_id}},
+            lambda data: data["expense"],
+        ))
+
+    def add_expense(
+        self,
+        title: str,
+        amount: int,
+        paid_by: str,
+        paid_for: List[Tuple[str, int]],
+        split_mode: SplitMode = SplitMode.EVENLY,
+        expense_date: Optional[datetime] = None,
+        notes: str = "",
+        category: int = 0,
+        is_reimbursement: bool = False,
+    ) -> BatchCall:
+        """
+        Queue a new expense; see :meth:`Spliit.add_expense` for the arguments.
+
+        The call resolves to the ID of the created expense.
+        """
+        if expense_date is None:
+            expense_date = datetime.now(timezone.utc)
+        payload = format_expense_payload(
+            self.client.group_id,
+            title,
+            amount,
+            paid_by,
+            paid_for,
+            split_mode,
+            expense_date,
+            notes,
+            category,
+            is_reimbursement,
+        )
+        return self.add(BatchCall(
+            "groups.expenses.create",
+            payload["0"],
+            lambda data: data["expenseId"],
+            mutation=True,
+        ))
+
+    def remove_expense(self, expense_id: str) -> BatchCall:
+        """Queue the removal of an expense."""
+        return self.add(BatchCall(
+            "groups.expenses.delete",
+            {"json": {"groupId": self.client.group_id, "expenseId": expense_id}},
+            mutation=True,
+        ))
+
+    def execute(self) -> List[BatchCall]:
+        """
+        Execute all pending calls and return them in queue order.
+
+        When any call is a mutation, the client's cached group details and
+        responses are dropped once the requests have been sent.
+        """
+        pending, self._pending = self._pending, []
+        chunk: List[BatchCall] = []
+        try:
+            for call in pending:
+                if chunk and (call.mutation != chunk[0].mutation or len(chunk) >= self.max_size):
+                    self._send(chunk)
+                    chunk = []
+                chunk.append(call)
+            self._send(chunk)
+        finally:
+            if any(call.mutation for call in pending):
+                self.client.invalidate()
+        return pending
+
+    def _send(self, calls: List[BatchCall]) -> None:
+        execute_calls(self.client.transport, self.client.base_url, calls, self.client.codec)
+
+    def __enter__(self) -> "Batch":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        if exc_type is None:
+            self.execute()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Bulk operations executed as chunked tRPC batches with partial-failure reporting.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .batch import Batch, BatchCall
+    from .client import Spliit
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class BulkItemResult:
+    """Outcome of one item of a bulk operation."""
+
+    index: int
+    value: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item succeeded."""
+        return self.error is None
+
+
+@dataclass
+class BulkResult:
+    """Per-item outcomes of a bulk operation, in input order."""
+
+    items: List[BulkItemResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> List[BulkItemResult]:
+        """Get the items that succeeded."""
+        return [item for item in self.items if item.ok]
+
+    @property
+    def failed(self) -> List[BulkItemResult]:
+        """Get the items that failed."""
+        return [item for item in self.items if not item.ok]
+
+    @property
+    def ok(self) -> bool:
+        """Whether every item succeeded."""
+        return all(item.ok for item in self.items)
+
+    @property
+    def values(self) -> List[Any]:
+        """Get the value of every item, ``None`` for failed ones."""
+        return [item.value for item in self.items]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[BulkItemResult]:
+        return iter(self.items)
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Split an iterable into lists of at most ``size`` items, lazily."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bounded_map(fn: Callable[[T], R], iterable: Iterable[T], workers: int = 1) -> Iterator[R]:
+    """
+    Map ``fn`` over ``iterable`` with up to ``workers`` threads, in order.
+
+    Unlike ``Executor.map`` the input is consumed lazily, keeping at most
+    ``2 * workers`` items in flight.
+    """
+    if workers <= 1:
+        for item in iterable:
+            yield fn(item)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: deque = deque()
+        for item in iterable:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def parallel_map(fn: Callable[[T], Any], items: Iterable[T], workers: int = 1) -> BulkResult:
+    """
+    Call ``fn`` for every item with up to ``workers`` threads.
+
+    An exception raised for one item is recorded in its result and does not
+    stop the others.
+
+    Returns:
+        A :class:`BulkResult` with one entry per item, in input order
+    """
+
+    def run(indexed: Tuple[int, T]) -> BulkItemResult:
+        index, item = indexed
+        try:
+            return BulkItemResult(index, value=fn(item))
+        except Exception as error:
+            return BulkItemResult(index, error=error)
+
+    return BulkResult(list(bounded_map(run, enumerate(items), workers)))
+
+
+def run_batched(
+    client: "Spliit",
+    items: Iterable[T],
+    queue: Callable[["Batch", T], "BatchCall"],
+    chunk_size: int = 25,
+    workers: int = 1,
+) -> BulkResult:
+    """
+    Queue every item on a batch and execute the batches chunk by chunk.
+
+    Args:
+        client: Client the batches are executed with
+        items: Items to process
+        queue: Callable queueing the call for one item on a batch
+        chunk_size: Number of calls sent per HTTP request
+        workers: Number of chunks executed in parallel
+
+    Returns:
+        A :class:`BulkResult` with one entry per item, in input order
+    """
+    # Imported here so the helpers above do not load requests
+    from .batch import Batch
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    def run_chunk(chunk: List[Tuple[int, T]]) -> List[BulkItemResult]:
+        batch = Batch(client, max_size=chunk_size)
+        queued: List[Tuple[int, Any]] = []
+        for index, item in chunk:
+            try:
+                queued.append((index, queue(batch, item)))
+            except (TypeError, ValueError, KeyError, AttributeError) as error:
+                queued.append((index, error))
+        batch.execute()
+
+        results = []
+        for index, call in queued:
+            if isinstance(call, BaseException):
+                results.append(BulkItemResult(index, error=call))
+            elif call.error is not None:
+                results.append(BulkItemResult(index, error=call.error))
+            else:
+                results.append(BulkItemResult(index, value=call.result()))
+        return results
+
+    result = BulkResult()
+    for chunk_results in bounded_map(run_chunk, chunked(enumerate(items), chunk_size), workers):
+        result.items.extend(chunk_results)
+    return result
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+In-memory caching of group metadata for the Spliit client.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe mapping whose entries expire after ``ttl`` seconds.
+
+    When more than ``maxsize`` entries are stored, the least recently used
+    entry is evicted.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 300.0, timer: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live entry, or ``default`` when it is missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= self._timer():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store an entry, evicting the least recently used ones if needed."""
+        with self._lock:
+            self._data[key] = (self._timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class ParticipantIndex:
+    """Constant-time lookups of a group's participants by name and by ID."""
+
+    __slots__ = ("by_name", "by_id")
+
+    def __init__(self, participants: List[Dict[str, Any]]):
+        self.by_name: Dict[str, str] = {}
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        for participant in participants:
+            self.by_name[participant["name"]] = participant["id"]
+            self.by_id[participant["id"]] = participant
+
+    def id_for(self, name: str) -> Optional[str]:
+        """Get the ID of the participant with the given name."""
+        return self.by_name.get(name)
+
+    def participant(self, participant_id: str) -> Optional[Dict[str, Any]]:
+        """Get the participant with the given ID."""
+        return self.by_id.get(participant_id)
+
+    def name_for(self, participant_id: str) -> Optional[str]:
+        """Get the name of the participant with the given ID."""
+        participant = self.by_id.get(participant_id)
+        return participant["name"] if participant is not None else None
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+
+class GroupCache:
+    """
+    Cache of group details and participant indexes, keyed by server and group.
+
+    One cache can be shared by several clients.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 300.0, timer: Callable[[], float] = time.monotonic):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl, timer=timer)
+
+    def get(self, key: Hashable) -> Optional[Tuple[Dict[str, Any], ParticipantIndex]]:
+        """Get the cached ``(group, index)`` pair for a key."""
+        return self._entries.get(key)
+
+    def store(self, key: Hashable, group: Dict[str, Any]) -> Tuple[Dict[str, Any], ParticipantIndex]:
+        """Cache a group and its participant index."""
+        entry = (group, ParticipantIndex(group.get("participants", [])))
+        self._entries.set(key, entry)
+        return entry
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key, or every entry when no key is given."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
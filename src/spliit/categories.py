@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Category lookups and incremental spending statistics.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+from .balances import _round, split_shares
+from .utils import CATEGORIES, SplitMode, category_id, paid_for_id
+
+
+class Category(NamedTuple):
+    """A Spliit expense category."""
+
+    id: int
+    name: str
+    grouping: str
+
+
+class CategoryIndex:
+    """
+    Constant-time lookups of categories by ID and by name.
+
+    Names are matched case-insensitively, either alone (``"Dining Out"``)
+    or qualified by their grouping (``"Food and Drink/Dining Out"``).
+    """
+
+    __slots__ = ("by_id", "by_name", "by_grouping")
+
+    def __init__(self, categories: Mapping[str, Mapping[str, int]] = CATEGORIES):
+        self.by_id: Dict[int, Category] = {}
+        self.by_name: Dict[str, int] = {}
+        self.by_grouping: Dict[str, List[int]] = {}
+        for grouping, members in categories.items():
+            for name, member_id in members.items():
+                self.by_id[member_id] = Category(member_id, name, grouping)
+                self.by_name.setdefault(name.lower(), member_id)
+                self.by_name[f"{grouping}/{name}".lower()] = member_id
+                self.by_grouping.setdefault(grouping, []).append(member_id)
+
+    def get(self, category_id: int) -> Optional[Category]:
+        """Get the category with the given ID."""
+        return self.by_id.get(category_id)
+
+    def name_for(self, category_id: int) -> Optional[str]:
+        """Get the name of the category with the given ID."""
+        category = self.by_id.get(category_id)
+        return category.name if category is not None else None
+
+    def grouping_for(self, category_id: int) -> Optional[str]:
+        """Get the name of the grouping (parent) of the category with the given ID."""
+        category = self.by_id.get(category_id)
+        return category.grouping if category is not None else None
+
+    def id_for(self, name: str) -> Optional[int]:
+        """Get the ID of a category from its name or ``Grouping/Name``."""
+        return self.by_name.get(name.strip().lower())
+
+    def groupings(self) -> List[str]:
+        """Get the names of all groupings."""
+        return list(self.by_grouping)
+
+    def __contains__(self, category_id: object) -> bool:
+        return category_id in self.by_id
+
+    def __iter__(self) -> Iterator[Category]:
+        return iter(self.by_id.values())
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+
+CATEGORY_INDEX = CategoryIndex()
+
+UNKNOWN_GROUPING = "Unknown"
+
+
+def _month(value: Any) -> str:
+    # Spliit timestamps are UTC ISO strings, so the month is their prefix
+    if isinstance(value, str):
+        return value[:7]
+    return value.strftime("%Y-%m") if value is not None else ""
+
+
+def split_amount(expense: Dict[str, Any]) -> List[Tuple[str, int]]:
+    """
+    Get the amount of an expense owed by each of its participants, in cents.
+
+    Shares are divided with :func:`spliit.balances.split_shares` and rounded
+    like the balances; the last participant receives the rounding remainder
+    so the parts add up to the amount.
+    """
+    amount = int(expense["amount"])
+    entries = expense.get("paidFor") or []
+    if not entries:
+        return []
+    evenly = expense.get("splitMode", SplitMode.EVENLY.value) == SplitMode.EVENLY.value
+    weights = [1.0 if evenly else float(entry["shares"]) for entry in entries]
+    parts = [_round(part) for part in split_shares(amount, weights)[:-1]]
+    parts.append(amount - sum(parts))
+    return [(paid_for_id(entry), part) for entry, part in zip(entries, parts)]
+
+
+class _Contribution(NamedTuple):
+    category: int
+    grouping: str
+    month: str
+    amount: int
+    parts: List[Tuple[str, int]]
+
+
+def _add(totals: Dict[Any, int], key: Any, amount: int) -> None:
+    value = totals.get(key, 0) + amount
+    if value:
+        totals[key] = value
+    else:
+        totals.pop(key, None)
+
+
+class CategoryStats:
+    """
+    Spending per category, grouping, participant and month.
+
+    Expenses are added one by one; adding an expense that was already added
+    replaces its earlier contribution, so updated expenses can simply be
+    added again, and :meth:`remove` undoes deleted ones. Amounts are in
+    cents; participant spending is each participant's owed share.
+
+    Args:
+        index: Category index used to resolve groupings
+        include_reimbursements: Count reimbursements as spending
+    """
+
+    def __init__(self, index: Optional[CategoryIndex] = None, include_reimbursements: bool = False):
+        self.index = index or CATEGORY_INDEX
+        self.include_reimbursements = include_reimbursements
+        self.by_category: Dict[int, int] = {}
+        self.by_grouping: Dict[str, int] = {}
+        self.by_participant: Dict[str, int] = {}
+        self.by_month: Dict[str, int] = {}
+        self.by_category_month: Dict[Tuple[int, str], int] = {}
+        self.by_participant_category: Dict[Tuple[str, int], int] = {}
+        self.total = 0
+        self._contributions: Dict[str, _Contribution] = {}
+
+    @classmethod
+    def from_expenses(cls, expenses: Iterable[Dict[str, Any]], **kwargs: Any) -> "CategoryStats":
+        """Build statistics from expenses as returned by the API, consuming them lazily."""
+        stats = cls(**kwargs)
+        stats.update(expenses)
+        return stats
+
+    def _apply(self, contribution: _Contribution, sign: int) -> None:
+        amount = sign * contribution.amount
+        _add(self.by_category, contribution.category, amount)
+        _add(self.by_grouping, contribution.grouping, amount)
+        _add(self.by_month, contribution.month, amount)
+        _add(self.by_category_month, (contribution.category, contribution.month), amount)
+        for participant_id, part in contribution.parts:
+            _add(self.by_participant, participant_id, sign * part)
+            _add(self.by_participant_category, (participant_id, contribution.category), sign * part)
+        self.total += amount
+
+    def add(self, expense: Dict[str, Any]) -> None:
+        """Add an expense, replacing it if it was already added."""
+        self.remove(expense["id"])
+        if expense.get("isReimbursement") and not self.include_reimbursements:
+            return
+        category = category_id(expense)
+        contribution = _Contribution(
+            category=category,
+            grouping=self.index.grouping_for(category) or UNKNOWN_GROUPING,
+            month=_month(expense.get("expenseDate")),
+            amount=int(expense["amount"]),
+            parts=split_amount(expense),
+        )
+        self._contributions[expense["id"]] = contribution
+        self._apply(contribution, 1)
+
+    def update(self, expenses: Iterable[Dict[str, Any]]) -> None:
+        """Add or replace several expenses."""
+        for expense in expenses:
+            self.add(expense)
+
+    def remove(self, expense: Union[str, Dict[str, Any]]) -> bool:
+        """Remove an expense or expense ID; returns whether it was counted."""
+        expense_id = expense if isinstance(expense, str) else expense["id"]
+        contribution = self._contributions.pop(expense_id, None)
+        if contribution is None:
+            return False
+        self._apply(contribution, -1)
+        return True
+
+    def __contains__(self, expense_id: object) -> bool:
+        return expense_id in self._contributions
+
+    def __len__(self) -> int:
+        return len(self._contributions)
+
+    def by_category_name(self) -> Dict[str, int]:
+        """Get spending per category keyed by category name."""
+        return {
+            self.index.name_for(category) or str(category): amount
+            for category, amount in self.by_category.items()
+        }
+
+    def top(self, n: int = 5) -> List[Tuple[Category, int]]:
+        """Get the ``n`` categories with the highest spending."""
+        ranked = sorted(self.by_category.items(), key=lambda item: item[1], reverse=True)[:n]
+        return [
+            (self.index.get(category) or Category(category, str(category), UNKNOWN_GROUPING), amount)
+            for category, amount in ranked
+        ]
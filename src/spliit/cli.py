@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+The ``spliit`` command-line tool.
+
+Only the standard library and the light spliit modules defining the
+arguments are imported at startup; each subcommand imports what it needs
+when it runs, so ``spliit --help`` and argument errors do not pay for
+loading ``requests``.
+
+The group and server can be given as options or through the
+``SPLIIT_GROUP_ID`` and ``SPLIIT_SERVER_URL`` environment variables.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Callable, List, Optional, Sequence
+from .exceptions import SpliitError
+from .importer import add_arguments as add_import_arguments
+from .utils import OFFICIAL_INSTANCE
+
+
+def _client(args: argparse.Namespace) -> Any:
+    from .client import Spliit
+
+    if not args.group:
+        raise SystemExit("spliit: error: no group given; use --group or set SPLIIT_GROUP_ID")
+    return Spliit(group_id=args.group, server_url=args.server_url)
+
+
+def _money(cents: int) -> str:
+    return f"{cents / 100:.2f}"
+
+
+def _print_rows(rows: List[List[str]]) -> None:
+    for row in rows:
+        print("\t".join(row))
+
+
+def cmd_expenses(args: argparse.Namespace) -> int:
+    from itertools import islice
+    from .utils import parse_timestamp
+
+    since = parse_timestamp(args.since) if args.since else None
+    with _client(args) as client:
+        expenses = islice(client.iter_expenses(page_size=args.page_size, since=since), args.limit)
+        for expense in expenses:
+            if args.json:
+                print(json.dumps(expense, ensure_ascii=False))
+                continue
+            paid_by = expense.get("paidBy") or {}
+            _print_rows([[
+                expense["expenseDate"][:10],
+                _money(expense["amount"]),
+                expense["title"],
+                paid_by.get("name", "") if isinstance(paid_by, dict) else str(paid_by),
+                expense["id"],
+            ]])
+    return 0
+
+
+def cmd_add(args: argparse.Namespace) -> int:
+    from .importer import ExpenseImporter
+
+    with _client(args) as client:
+        importer = ExpenseImporter(client, amount_scale=1 if args.cents else 100)
+        payer = args.paid_by
+        expense = importer.prepare({
+            "title": args.title,
+            "amount": args.amount,
+            "paid_by": payer,
+            "paid_for": ";".join(args.paid_for or [payer]),
+            "split_mode": args.split_mode,
+            "date": args.date,
+            "notes": args.notes,
+            "category": args.category,
+        })
+        response = json.loads(client.add_expense(**expense))
+    print(response[0]["result"]["data"]["json"]["expenseId"])
+    return 0
+
+
+def cmd_delete(args: argparse.Namespace) -> int:
+    with _client(args) as client:
+        result = client.remove_expenses(args.expense_ids)
+    for item in result.succeeded:
+        print(item.value)
+    for item in result.failed:
+        print(f"spliit: error: {args.expense_ids[item.index]}: {item.error}", file=sys.stderr)
+    return 0 if result.ok else 1
+
+
+def cmd_purge(args: argparse.Namespace) -> int:
+    from .utils import parse_timestamp
+
+    if not (args.date_from or args.date_to or args.title or args.category or args.all):
+        raise SystemExit("spliit: error: purge needs a filter, or --all to delete every expense")
+    with _client(args) as client:
+        category = int(args.category) if args.category and args.category.isdigit() else args.category
+        result = client.purge(
+            date_from=parse_timestamp(args.date_from) if args.date_from else None,
+            date_to=parse_timestamp(args.date_to) if args.date_to else None,
+            title_pattern=args.title,
+            category=category,
+            dry_run=args.dry_run,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+        )
+    for item in result.succeeded:
+        print(item.value)
+    for item in result.failed:
+        print(f"error: {item.error}", file=sys.stderr)
+    action = "Would remove" if args.dry_run else "Removed"
+    print(f"{action} {len(result.succeeded)} expenses", file=sys.stderr)
+    return 0 if result.ok else 1
+
+
+def cmd_balances(args: argparse.Namespace) -> int:
+    with _client(args) as client:
+        names = {participant["id"]: participant["name"] for participant in client.get_group()["participants"]}
+        balances = client.get_balances()
+        if args.json:
+            print(json.dumps({
+                names.get(participant_id, participant_id): {"paid": balance.paid, "paid_for": balance.paid_for, "total": balance.total}
+                for participant_id, balance in balances.items()
+            }, ensure_ascii=False))
+            return 0
+        _print_rows([
+            [names.get(participant_id, participant_id), _money(balance.total)]
+            for participant_id, balance in sorted(balances.items(), key=lambda item: -item[1].total)
+        ])
+    return 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    target = sys.stdout if args.target == "-" else args.target
+    with _client(args) as client:
+        count = client.export_expenses(
+            target,
+            format=args.format or ("csv" if args.target == "-" else None),
+            page_size=args.page_size,
+        )
+    print(f"Exported {count} rows", file=sys.stderr)
+    return 0
+
+
+def cmd_import(args: argparse.Namespace) -> int:
+    from .importer import run_command
+
+    with _client(args) as client:
+        return run_command(client, args)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser of the ``spliit`` command."""
+    parser = argparse.ArgumentParser(prog="spliit", description="Command-line client for Spliit groups.")
+    parser.add_argument("-g", "--group", default=os.environ.get("SPLIIT_GROUP_ID"), help="group ID")
+    parser.add_argument("--server-url", default=os.environ.get("SPLIIT_SERVER_URL", OFFICIAL_INSTANCE))
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    commands.required = True
+
+    def command(name: str, handler: Callable[[argparse.Namespace], int], help: str) -> argparse.ArgumentParser:
+        subparser = commands.add_parser(name, help=help, description=help)
+        subparser.set_defaults(handler=handler)
+        return subparser
+
+    expenses = command("expenses", cmd_expenses, "List expenses, newest first.")
+    expenses.add_argument("-n", "--limit", type=int, help="maximum number of expenses")
+    expenses.add_argument("--since", help="only expenses dated on or after this ISO date")
+    expenses.add_argument("--json", action="store_true", help="print one JSON object per line")
+    expenses.add_argument("--page-size", type=int, default=100)
+
+    add = command("add", cmd_add, "Add an expense and print its ID.")
+    add.add_argument("title")
+    add.add_argument("amount", help="amount in currency units, e.g. 12.50")
+    add.add_argument("--paid-by", required=True, metavar="NAME")
+    add.add_argument("--for", dest="paid_for", action="append", metavar="NAME[:SHARES]",
+                     help="participant the expense is for; repeat for several (default: the payer). "
+                          "With BY_PERCENTAGE, SHARES is a percentage, e.g. John:60")
+    add.add_argument("--split-mode", choices=["EVENLY", "BY_SHARES", "BY_PERCENTAGE", "BY_AMOUNT"])
+    add.add_argument("--category", help="category ID or name")
+    add.add_argument("--date", help="ISO date of the expense (default: now)")
+    add.add_argument("--notes")
+    add.add_argument("--cents", action="store_true", help="the amount is in cents")
+
+    delete = command("delete", cmd_delete, "Delete expenses by ID.")
+    delete.add_argument("expense_ids", nargs="+", metavar="EXPENSE_ID")
+
+    purge = command("purge", cmd_purge, "Delete the expenses matching the filters and print their IDs.")
+    purge.add_argument("--from", dest="date_from", help="only expenses dated on or after this ISO date")
+    purge.add_argument("--to", dest="date_to", help="only expenses dated before this ISO date")
+    purge.add_argument("--title", help="regular expression searched in the title")
+    purge.add_argument("--category", help="category ID or name")
+    purge.add_argument("--all", action="store_true", help="delete every expense when no filter is given")
+    purge.add_argument("--dry-run", action="store_true", help="only print what would be deleted")
+    purge.add_argument("--chunk-size", type=int, default=25)
+    purge.add_argument("--workers", type=int, default=1)
+
+    balances = command("balances", cmd_balances, "Show the balance of every participant.")
+    balances.add_argument("--json", action="store_true")
+
+    export = command("export", cmd_export, "Export expenses to CSV, JSON Lines or Parquet.")
+    export.add_argument("target", help="output file, or - for CSV on standard output")
+    export.add_argument("--format", choices=["csv", "jsonl", "parquet"])
+    export.add_argument("--page-size", type=int, default=200)
+
+    # Same options as python -m spliit.importer
+    add_import_arguments(command("import", cmd_import, "Import expenses from CSV, JSON Lines or a JSON array."))
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the ``spliit`` command; returns the exit status."""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except BrokenPipeError:  # pragma: no cover - e.g. piped into head
+        return 0
+    except (SpliitError, ValueError, OSError) as error:
+        # requests' exceptions derive from OSError
+        print(f"spliit: error: {error}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
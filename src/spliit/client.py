@@ -3,254 +3,351 @@
 Implementation of the Spliit API client.
 """
 
-import json
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Union, Any
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Pattern, Tuple, Union, Any, TYPE_CHECKING
 from urllib.parse import urljoin
-from enum import Enum
-import requests
-import uuid
-from datetime import datetime, timezone, UTC
-
-class SplitMode(str, Enum):
-    """Split modes available in Spliit."""
-    EVENLY = "EVENLY"
-    BY_SHARES = "BY_SHARES"
-    BY_PERCENTAGE = "BY_PERCENTAGE"
-    BY_AMOUNT = "BY_AMOUNT"
-
-OFFICIAL_INSTANCE = "https://spliit.app"
-
-CATEGORIES = {
-    "Uncategorized": {
-        "General": 0,
-        "Payment": 1
-    },
-    "Entertainment": {
-        "Entertainment": 2,
-        "Games": 3,
-        "Movies": 4,
-        "Music": 5,
-        "Sports": 6
-    },
-    "Food and Drink": {
-        "Food and Drink": 7,
-        "Dining Out": 8,
-        "Groceries": 9,
-        "Liquor": 10
-    },
-    "Home": {
-        "Home": 11,
-        "Electronics": 12,
-        "Furniture": 13,
-        "Household Supplies": 14,
-        "Maintenance": 15,
-        "Mortgage": 16,
-        "Pets": 17,
-        "Rent": 18,
-        "Services": 19
-    },
-    "Life": {
-        "Childcare": 20,
-        "Clothing": 21,
-        "Education": 22,
-        "Gifts": 23,
-        "Insurance": 24,
-        "Medical Expenses": 25,
-        "Taxes": 26
-    },
-    "Transportation": {
-        "Transportation": 27,
-        "Bicycle": 28,
-        "Bus/Train": 29,
-        "Car": 30,
-        "Gas/Fuel": 31,
-        "Hotel": 32,
-        "Parking": 33,
-        "Plane": 34,
-        "Taxi": 35
-    },
-    "Utilities": {
-        "Utilities": 36,
-        "Cleaning": 37,
-        "Electricity": 38,
-        "Heat/Gas": 39,
-        "Trash": 40,
-        "TV/Phone/Internet": 41,
-        "Water": 42
-    }
-}
-
-def format_expense_payload(
-    group_id: str,
-    title: str,
-    amount: int,
-    paid_by: str,
-    paid_for: List[Tuple[str, int]],
-    split_mode: SplitMode,
-    expense_date: datetime,
-    notes: str = "",
-    category: int = 0,
-) -> Dict[str, Any]:
-    """Format the expense payload according to the API requirements."""
-    # Convert paid_for to the expected format
-    formatted_paid_for = []
-    
-    for participant_id, shares in paid_for:
-        formatted_paid_for.append({
-            "participant": participant_id,
-            "shares": shares
-        })
-
-    # Format the expense date
-    formatted_date = expense_date.strftime('%Y-%m-%dT%H:%M:%S.') + f"{expense_date.microsecond // 10000:03d}Z"
-
-    # Create the expense form values
-    expense_form_values = {
-        "expenseDate": formatted_date,
-        "title": title,
-        "category": category,
-        "amount": amount,
-        "paidBy": paid_by,
-        "paidFor": formatted_paid_for,
-        "splitMode": split_mode.value,
-        "saveDefaultSplittingOptions": False,
-        "isReimbursement": False,
-        "documents": [],
-        "notes": notes
-    }
-
-    return {
-        "0": {
-            "json": {
-                "groupId": group_id,
-                "expenseFormValues": expense_form_values,
-                "participantId": "None"
-            },
-            "meta": {
-                "values": {
-                    "expenseFormValues.expenseDate": ["Date"]
-                }
-            }
-        }
-    }
+from datetime import datetime, timezone
+from .transport import Transport
+from .codec import JSONCodec, default_codec
+from .trpc import JSON_HEADERS
+from .instrumentation import Hook
+from .batch import Batch
+from .bulk import BulkItemResult, BulkResult, parallel_map, run_batched
+from .cache import GroupCache, ParticipantIndex
+from .balances import Balance, compute_balances
+from .settle import Transfer, plan_settlement
+from .table import ExpenseTable
+from .categories import CATEGORY_INDEX, CategoryStats
+from .utils import (
+    SplitMode,
+    OFFICIAL_INSTANCE,
+    CATEGORIES,
+    format_expense_payload,
+    format_group_payload,
+    get_current_timestamp,
+    parse_timestamp,
+    as_utc,
+    category_id,
+)
 
-def get_current_timestamp() -> str:
-    """Get current timestamp in Spliit format."""
-    now = datetime.now(UTC)
-    return now.strftime('%Y-%m-%dT%H:%M:%S.') + f"{now.microsecond // 10000:03d}Z"
+if TYPE_CHECKING:
+    from .watch import ExpenseEvent
 
 @dataclass
 class Spliit:
-    """Client for interacting with the Spliit API."""
+    """
+    Client for interacting with the Spliit API.
+
+    All requests go through a pooled :class:`Transport`. Pass the same
+    transport to several clients to share their connections; a transport
+    created by the client itself is closed by :meth:`close`.
+
+    Group details are only cached when a :class:`GroupCache` is given; the
+    cache is invalidated by every write made through the client.
+
+    A client can be shared between threads: its transport gives every
+    thread its own session over a shared connection pool, and the caches
+    are locked. :meth:`map` and :meth:`map_get_expense` run calls in
+    parallel on a thread pool.
+    """
     
     group_id: str
     server_url: str = OFFICIAL_INSTANCE
+    transport: Optional[Transport] = field(default=None, repr=False, compare=False)
+    cache: Optional[GroupCache] = field(default=None, repr=False, compare=False)
+    codec: Optional[JSONCodec] = field(default=None, repr=False, compare=False)
+    _owns_transport: bool = field(default=False, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.transport is None:
+            self.transport = Transport()
+            self._owns_transport = True
+        if self.codec is None:
+            self.codec = default_codec
+
+    def close(self) -> None:
+        """Close the transport if it is owned by this client."""
+        if self._owns_transport:
+            self.transport.close()
+
+    def add_hook(
+        self,
+        before_request: Optional[Hook] = None,
+        after_response: Optional[Hook] = None,
+        on_error: Optional[Hook] = None,
+    ) -> None:
+        """
+        Register request hooks on the client's transport.
+
+        Each hook receives a :class:`RequestEvent` with the procedure name,
+        payload size, status and timing of the request. Hooks run for every
+        client sharing the transport.
+        """
+        self.transport.hooks.add(before_request, after_response, on_error)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-procedure request counters and latency histograms.
+
+        Statistics are collected by the transport, so clients sharing a
+        transport share their statistics.
+        """
+        if self.transport.stats is None:
+            return {}
+        return self.transport.stats.snapshot()
+
+    @property
+    def _cache_key(self) -> Tuple[str, str]:
+        return (self.server_url, self.group_id)
+
+    def invalidate(self) -> None:
+        """Drop the cached details and HTTP responses of this group, if any."""
+        if self.cache is not None:
+            self.cache.invalidate(self._cache_key)
+        if self.transport.cache is not None:
+            self.transport.cache.invalidate(self.group_id)
+
+    def __enter__(self) -> "Spliit":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
     
     @property
     def base_url(self) -> str:
         """Get the base URL for API requests."""
         return urljoin(self.server_url, "/api/trpc")
     
-    @classmethod
-    def create_group(cls, name: str, currency: str = "$", server_url: str = OFFICIAL_INSTANCE, participants: List[Dict[str, str]] = None) -> "Spliit":
-        """Create a new group and return a client instance for it."""
-        if participants is None:
-            participants = [{"name": "You"}]
-            
-        # Add UUIDs to participants
-        for participant in participants:
-            participant["id"] = str(uuid.uuid4())
-            
-        json_data = {
-            "0": {
-                "json": {
-                    "groupFormValues": {
-                        "name": name,
-                        "currency": currency,
-                        "information": "",
-                        "participants": participants
-                    }
-                }
-            }
-        }
-        
-        headers = {
-            "Content-Type": "application/json"
+    def _query(self, procedures: str, params_input: Dict[str, Any]) -> List[Any]:
+        """Send a batched GET for comma-joined procedures and decode the response."""
+        params = {
+            "batch": "1",
+            "input": self.codec.dumps(params_input)
         }
         
-        url = f"{urljoin(server_url, '/api/trpc/groups.create')}"
-        print("\nDebug: Request details:")
-        print(f"URL: {url}")
-        print(f"Headers: {headers}")
-        print(f"JSON data: {json_data}")
+        response = self.transport.get(
+            f"{self.base_url}/{procedures}",
+            params=params
+        )
+        response.raise_for_status()
+        return self.codec.loads(response.content)
+
+    def _mutate(self, procedure: str, json_data: Dict[str, Any]) -> Any:
+        """Send a batched POST for a procedure and return the raw response."""
+        return self.transport.post(
+            f"{self.base_url}/{procedure}",
+            params={"batch": "1"},
+            data=self.codec.dumps_bytes(json_data),
+            headers=JSON_HEADERS
+        )
+
+    def batch(self, max_size: int = 50) -> Batch:
+        """
+        Start a batch of procedure calls sent in as few requests as possible.
+
+        Args:
+            max_size: Maximum number of calls packed into one HTTP request
+
+        Returns:
+            A :class:`Batch`, executed when its ``with`` block exits
+        """
+        return Batch(self, max_size=max_size)
+
+    @classmethod
+    def create_group(cls, name: str, currency: str = "$", server_url: str = OFFICIAL_INSTANCE, participants: List[Dict[str, str]] = None, transport: Optional[Transport] = None, codec: Optional[JSONCodec] = None) -> "Spliit":
+        """
+        Create a new group and return a client instance for it.
+
+        The returned client uses ``transport`` when given, otherwise it owns
+        the transport used to create the group.
+        """
+        owns_transport = transport is None
+        if owns_transport:
+            transport = Transport()
+        codec = codec or default_codec
+        json_data = format_group_payload(name, currency, participants)
         
-        response = requests.post(
-            url,
-            json=json_data,
-            headers=headers,
+        response = transport.post(
+            urljoin(server_url, "/api/trpc/groups.create"),
+            data=codec.dumps_bytes(json_data),
+            headers=JSON_HEADERS,
             params={"batch": "1"}
         )
-        
-        print(f"Debug: Response status: {response.status_code}")
-        print(f"Debug: Response content: {response.content.decode()}")
-        
         response.raise_for_status()
-        group_id = response.json()[0]["result"]["data"]["json"]["groupId"]
-        return cls(group_id=group_id, server_url=server_url)
+        group_id = codec.loads(response.content)[0]["result"]["data"]["json"]["groupId"]
+        client = cls(group_id=group_id, server_url=server_url, transport=transport, codec=codec)
+        client._owns_transport = owns_transport
+        return client
     
     def get_group(self) -> Dict:
-        """Get group details."""
+        """Get group details, from the cache when one is configured."""
+        if self.cache is not None:
+            return self._cached_group()[0]
+        return self._fetch_group()
+
+    def _cached_group(self) -> Tuple[Dict, ParticipantIndex]:
+        entry = self.cache.get(self._cache_key)
+        if entry is None:
+            entry = self.cache.store(self._cache_key, self._fetch_group())
+        return entry
+
+    def _fetch_group(self) -> Dict:
         params_input = {
             "0": {"json": {"groupId": self.group_id}},
             "1": {"json": {"groupId": self.group_id}}
         }
-        
-        params = {
-            "batch": "1",
-            "input": json.dumps(params_input)
-        }
-        
-        response = requests.get(
-            f"{self.base_url}/groups.get,groups.getDetails",
-            params=params
-        )
-        response.raise_for_status()
-        return response.json()[0]["result"]["data"]["json"]["group"]
+        data = self._query("groups.get,groups.getDetails", params_input)
+        return data[0]["result"]["data"]["json"]["group"]
     
+    def get_participant_index(self) -> ParticipantIndex:
+        """Get the name and ID index of the group's participants."""
+        if self.cache is not None:
+            return self._cached_group()[1]
+        return ParticipantIndex(self.get_group()["participants"])
+
     def get_username_id(self, name: str) -> Optional[str]:
         """Get participant ID by name."""
-        group = self.get_group()
-        for participant in group["participants"]:
-            if name == participant["name"]:
-                return participant["id"]
-        return None
+        return self.get_participant_index().id_for(name)
     
     def get_participants(self) -> Dict[str, str]:
         """Get all participants with their IDs."""
-        group = self.get_group()
-        return {
-            participant["name"]: participant["id"]
-            for participant in group["participants"]
-        }
+        return dict(self.get_participant_index().by_name)
     
     def get_expenses(self) -> List[Dict]:
         """Get all expenses in the group."""
         params_input = {
             "0": {"json": {"groupId": self.group_id}}
         }
-        
-        params = {
-            "batch": "1",
-            "input": json.dumps(params_input)
-        }
-        
-        response = requests.get(
-            f"{self.base_url}/groups.expenses.list",
-            params=params
+        data = self._query("groups.expenses.list", params_input)
+        return data[0]["result"]["data"]["json"]["expenses"]
+    
+    def iter_expenses(self, page_size: int = 50, since: Optional[datetime] = None) -> Iterator[Dict]:
+        """
+        Iterate over the group's expenses page by page, newest first.
+
+        Pages are requested lazily with the server's ``cursor``/``limit``
+        parameters, so only one page is held in memory at a time.
+
+        Args:
+            page_size: Number of expenses requested per page
+            since: Stop at the first expense dated before this datetime
+                (naive datetimes are treated as UTC)
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        since = as_utc(since) if since is not None else None
+        cursor = 0
+        while True:
+            page = self.get_expense_page(cursor=cursor, limit=page_size)
+            for expense in page["expenses"]:
+                if since is not None and parse_timestamp(expense["expenseDate"]) < since:
+                    return
+                yield expense
+            if not page.get("hasMore") or not page["expenses"]:
+                return
+            cursor = page.get("nextCursor", cursor + page_size)
+
+    def get_expense_table(self, page_size: int = 200) -> ExpenseTable:
+        """
+        Get all expenses in the group as a columnar :class:`ExpenseTable`.
+
+        Pages are converted as they arrive, so the raw expense dicts of only
+        one page are held in memory at a time.
+        """
+        return ExpenseTable.from_expenses(self.iter_expenses(page_size=page_size))
+
+    def get_category_stats(self, page_size: int = 200) -> CategoryStats:
+        """
+        Get spending per category, grouping, participant and month.
+
+        Keep the returned :class:`CategoryStats` up to date by adding new or
+        changed expenses to it instead of calling this again.
+        """
+        return CategoryStats.from_expenses(self.iter_expenses(page_size=page_size))
+
+    def export_expenses(self, target: Any, format: Optional[str] = None, **kwargs: Any) -> int:
+        """
+        Stream the group's expenses to a CSV, JSON Lines or Parquet file.
+
+        Each ``paidFor`` entry becomes one row; see
+        :func:`spliit.export.export_expenses` for the options.
+
+        Returns:
+            The number of rows written
+        """
+        from .export import export_expenses
+
+        return export_expenses(self, target, format=format, **kwargs)
+
+    def watch(self, **kwargs: Any) -> Iterator["ExpenseEvent"]:
+        """
+        Poll the group and yield added, updated and deleted expenses.
+
+        The polling interval adapts to the group's activity; see
+        :func:`spliit.watch.watch` for the options::
+
+            for event in client.watch(stop=stop_event):
+                print(event.kind, event.expense_id)
+        """
+        from .watch import watch
+
+        return watch(self, **kwargs)
+
+    def get_balances(self) -> Dict[str, Balance]:
+        """
+        Compute the balance of every participant from the group's expenses.
+
+        Returns:
+            Dict mapping participant IDs to their :class:`Balance`
+        """
+        return compute_balances(self.iter_expenses(page_size=200))
+
+    def plan_settlement(self, method: str = "auto") -> List[Transfer]:
+        """
+        Plan the reimbursements that settle the group.
+
+        Args:
+            method: ``"greedy"``, ``"exact"`` or ``"auto"``; see
+                :func:`spliit.settle.plan_settlement`
+
+        Returns:
+            List of :class:`Transfer`
+        """
+        return plan_settlement(self.get_balances(), method=method)
+
+    def add_reimbursements(
+        self,
+        transfers: Iterable[Transfer],
+        expense_date: Optional[datetime] = None,
+        chunk_size: int = 25,
+        workers: int = 1,
+    ) -> BulkResult:
+        """
+        Record transfers as reimbursement expenses in one bulk submission.
+
+        Returns:
+            A :class:`BulkResult` whose values are the created expense IDs
+        """
+        return self.add_expenses(
+            (transfer.to_expense(expense_date=expense_date) for transfer in transfers),
+            chunk_size=chunk_size,
+            workers=workers,
         )
-        response.raise_for_status()
-        return response.json()[0]["result"]["data"]["json"]["expenses"]
+
+    def get_expense_page(self, cursor: int = 0, limit: int = 50) -> Dict:
+        """
+        Get one page of the group's expenses.
+
+        Returns:
+            Dict with the page's ``expenses`` and, on servers supporting
+            pagination, ``hasMore`` and ``nextCursor``
+        """
+        params_input = {
+            "0": {"json": {"groupId": self.group_id, "cursor": cursor, "limit": limit}}
+        }
+        data = self._query("groups.expenses.list", params_input)
+        return data[0]["result"]["data"]["json"]
     
     def get_expense(self, expense_id: str) -> Dict:
         """
@@ -270,18 +367,8 @@ class Spliit:
                 }
             }
         }
-        
-        params = {
-            "batch": "1",
-            "input": json.dumps(params_input)
-        }
-        
-        response = requests.get(
-            f"{self.base_url}/groups.expenses.get",
-            params=params
-        )
-        response.raise_for_status()
-        return response.json()[0]["result"]["data"]["json"]["expense"]
+        data = self._query("groups.expenses.get", params_input)
+        return data[0]["result"]["data"]["json"]["expense"]
     
     def add_expense(
         self,
@@ -292,7 +379,8 @@ class Spliit:
         split_mode: SplitMode = SplitMode.EVENLY,
         expense_date: Optional[datetime] = None,
         notes: str = "",
-        category: int = 0
+        category: int = 0,
+        is_reimbursement: bool = False
     ) -> str:
         """
         Add a new expense to the group.
@@ -306,11 +394,10 @@ class Spliit:
             expense_date: Optional datetime for the expense (defaults to current UTC time)
             notes: Optional notes for the expense
             category: Expense category ID
+            is_reimbursement: Whether the expense is a reimbursement between participants
         """
         if expense_date is None:
             expense_date = datetime.now(timezone.utc)
-            
-        params = {"batch": "1"}
         
         json_data = format_expense_payload(
             self.group_id,
@@ -321,24 +408,78 @@ class Spliit:
             split_mode,
             expense_date,
             notes,
-            category
+            category,
+            is_reimbursement
         )
         
-        print("\nDebug: Request payload:")
-        print(json.dumps(json_data, indent=2))
-        
-        response = requests.post(
-            f"{self.base_url}/groups.expenses.create",
-            params=params,
-            json=json_data
-        )
-        
-        print("\nDebug: Response status:", response.status_code)
-        print("Debug: Response content:", response.content.decode())
-        
+        response = self._mutate("groups.expenses.create", json_data)
+        self.invalidate()
         response.raise_for_status()
         return response.content.decode()
 
+    def add_expenses(
+        self,
+        expenses: Iterable[Mapping[str, Any]],
+        chunk_size: int = 25,
+        workers: int = 1,
+    ) -> BulkResult:
+        """
+        Add many expenses using batched mutations.
+
+        A failing item does not abort the others; check the returned report.
+
+        Args:
+            expenses: Mappings of :meth:`add_expense` keyword arguments
+            chunk_size: Number of expenses created per HTTP request
+            workers: Number of requests sent in parallel
+
+        Returns:
+            A :class:`BulkResult` whose values are the created expense IDs,
+            in input order
+        """
+        # Every batch drops the cached group after its writes
+        return run_batched(
+            self,
+            expenses,
+            lambda batch, expense: batch.add_expense(**expense),
+            chunk_size=chunk_size,
+            workers=workers,
+        )
+
+    def map(self, fn: Callable[["Spliit", Any], Any], items: Iterable[Any], workers: int = 8) -> BulkResult:
+        """
+        Call ``fn(client, item)`` for every item, in parallel.
+
+        Args:
+            fn: Operation to run for each item
+            items: Items to process, consumed lazily
+            workers: Number of threads
+
+        Returns:
+            A :class:`BulkResult` with the value or error of every item, in
+            input order
+        """
+        return parallel_map(lambda item: fn(self, item), items, workers)
+
+    def map_get_expense(self, expense_ids: Iterable[str], workers: int = 8, chunk_size: int = 10) -> BulkResult:
+        """
+        Get the details of many expenses, in parallel.
+
+        Expenses are requested ``chunk_size`` at a time in batched queries,
+        with up to ``workers`` requests in flight.
+
+        Returns:
+            A :class:`BulkResult` whose values are the expenses, in input
+            order; a missing expense fails only its own item
+        """
+        return run_batched(
+            self,
+            expense_ids,
+            lambda batch, expense_id: batch.get_expense(expense_id),
+            chunk_size=chunk_size,
+            workers=workers,
+        )
+
     def remove_expense(self, expense_id: str) -> Dict:
         """
         Remove an expense from the group.
@@ -349,7 +490,6 @@ class Spliit:
         Returns:
             Dict containing the response data
         """
-        params = {"batch": "1"}
         json_data = {
             "0": {
                 "json": {
@@ -359,10 +499,103 @@ class Spliit:
             }
         }
         
-        response = requests.post(
-            f"{self.base_url}/groups.expenses.delete",
-            params=params,
-            json=json_data
-        )
+        response = self._mutate("groups.expenses.delete", json_data)
+        self.invalidate()
         response.raise_for_status()
-        return response.json()[0]["result"]["data"]["json"]
\ No newline at end of file
+        return self.codec.loads(response.content)[0]["result"]["data"]["json"]
+
+    def remove_expenses(
+        self,
+        expense_ids: Iterable[str],
+        chunk_size: int = 25,
+        workers: int = 1,
+        dry_run: bool = False,
+    ) -> BulkResult:
+        """
+        Remove many expenses using batched mutations.
+
+        A failing item does not abort the others; check the returned report.
+
+        Args:
+            expense_ids: IDs of the expenses to remove
+            chunk_size: Number of expenses removed per HTTP request
+            workers: Number of requests sent in parallel
+            dry_run: Only report the expenses that would be removed
+
+        Returns:
+            A :class:`BulkResult` whose values are the removed expense IDs,
+            in input order
+        """
+        expense_ids = list(expense_ids)
+        if dry_run:
+            return BulkResult([BulkItemResult(index, value=expense_id) for index, expense_id in enumerate(expense_ids)])
+        result = run_batched(
+            self,
+            expense_ids,
+            lambda batch, expense_id: batch.remove_expense(expense_id),
+            chunk_size=chunk_size,
+            workers=workers,
+        )
+        for item in result.succeeded:
+            item.value = expense_ids[item.index]
+        return result
+
+    def find_expenses(
+        self,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        title_pattern: Union[str, Pattern[str], None] = None,
+        category: Union[int, str, None] = None,
+        page_size: int = 100,
+    ) -> Iterator[Dict]:
+        """
+        Iterate over the expenses matching every given filter, newest first.
+
+        Args:
+            date_from: Only expenses dated on or after this datetime
+            date_to: Only expenses dated before this datetime
+            title_pattern: Regular expression searched in the title
+            category: Category ID or name
+            page_size: Number of expenses requested per page
+        """
+        pattern = re.compile(title_pattern) if isinstance(title_pattern, str) else title_pattern
+        if isinstance(category, str):
+            name = category
+            category = CATEGORY_INDEX.id_for(name)
+            if category is None:
+                raise ValueError(f"Unknown category: {name!r}")
+        date_to = as_utc(date_to) if date_to is not None else None
+        for expense in self.iter_expenses(page_size=page_size, since=date_from):
+            if date_to is not None and parse_timestamp(expense["expenseDate"]) >= date_to:
+                continue
+            if pattern is not None and not pattern.search(expense.get("title") or ""):
+                continue
+            if category is not None and category_id(expense) != category:
+                continue
+            yield expense
+
+    def purge(
+        self,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        title_pattern: Union[str, Pattern[str], None] = None,
+        category: Union[int, str, None] = None,
+        dry_run: bool = False,
+        chunk_size: int = 25,
+        workers: int = 1,
+    ) -> BulkResult:
+        """
+        Remove every expense matching the filters of :meth:`find_expenses`.
+
+        Matching expenses are listed before anything is removed. Without
+        any filter, every expense of the group is removed.
+
+        Returns:
+            A :class:`BulkResult` whose values are the removed (or, with
+            ``dry_run``, the matching) expense IDs
+        """
+        expense_ids = [
+            expense["id"]
+            for expense in self.find_expenses(date_from, date_to, title_pattern, category)
+        ]
+        return self.remove_expenses(expense_ids, chunk_size=chunk_size, workers=workers, dry_run=dry_run)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+JSON codecs used to encode requests and decode responses.
+
+The fastest installed library is selected automatically: orjson, then
+msgspec, then the standard library (``pip install spliit-api-client[fast]``).
+"""
+
+import json
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+
+class JSONCodec:
+    """Codec backed by the standard library ``json`` module."""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> str:
+        """Encode an object to a JSON string."""
+        return json.dumps(obj, separators=(",", ":"))
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """Encode an object to UTF-8 JSON bytes."""
+        return self.dumps(obj).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decode JSON data into dicts and lists.
+
+        Args:
+            data: JSON document
+
+        Raises:
+            ValueError: If the data is not valid JSON
+        """
+        return json.loads(data)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}>"
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec backed by orjson."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+
+    def dumps(self, obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """Codec backed by msgspec."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        if msgspec is None:
+            raise ImportError("msgspec is not installed")
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> str:
+        return self._encoder.encode(obj).decode()
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as error:
+            raise ValueError(str(error)) from error
+
+
+CODECS = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JSONCodec,
+}
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    """
+    Get a codec by name, or the fastest installed one.
+
+    Args:
+        name: ``"orjson"``, ``"msgspec"`` or ``"json"``; ``None`` selects
+            automatically
+
+    Raises:
+        ImportError: If the requested library is not installed
+    """
+    if name is not None:
+        if name not in CODECS:
+            raise ValueError(f"Unknown codec: {name!r}; expected one of {', '.join(CODECS)}")
+        return CODECS[name]()
+    if orjson is not None:
+        return OrjsonCodec()
+    if msgspec is not None:
+        return MsgspecCodec()
+    return JSONCodec()
+
+
+default_codec = get_codec()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Exceptions raised by the Spliit API client.
+"""
+
+from typing import Any, Dict, Optional
+
+
+class SpliitError(Exception):
+    """Base class for errors raised by the Spliit client."""
+
+
+class TRPCError(SpliitError):
+    """An error returned by the server for a single tRPC procedure call."""
+
+    def __init__(
+        self,
+        message: str,
+        procedure: Optional[str] = None,
+        code: Optional[str] = None,
+        http_status: Optional[int] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(message)
+        self.message = message
+        self.procedure = procedure
+        self.code = code
+        self.http_status = http_status
+        self.data = data or {}
+
+    def __str__(self) -> str:
+        prefix = f"{self.procedure}: " if self.procedure else ""
+        suffix = f" ({self.code})" if self.code else ""
+        return f"{prefix}{self.message}{suffix}"
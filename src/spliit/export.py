@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Streaming export of a group's expenses to CSV, JSON Lines and Parquet.
+
+Every ``paidFor`` entry becomes one row repeating the fields of its
+expense, so the output loads directly into a DataFrame. Expenses are read
+page by page with :meth:`Spliit.iter_expenses` and written as they arrive.
+
+Parquet and Arrow output require the optional ``pyarrow`` dependency
+(``pip install spliit-api-client[parquet]``).
+"""
+
+import csv
+import json
+import os
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Union, TYPE_CHECKING
+from .bulk import chunked
+from .utils import category_id, paid_by_id, paid_for_id, parse_timestamp
+
+# pyarrow is slow to import, so it is only imported by the first Arrow or Parquet export
+pa: Any = None
+pq: Any = None
+_pyarrow_loaded = False
+
+if TYPE_CHECKING:
+    from .client import Spliit
+
+PathOrFile = Union[str, "os.PathLike[str]", IO[Any]]
+
+FIELDS = (
+    "expense_id",
+    "title",
+    "amount",
+    "category",
+    "expense_date",
+    "created_at",
+    "paid_by_id",
+    "paid_by_name",
+    "split_mode",
+    "is_reimbursement",
+    "participant_id",
+    "participant_name",
+    "shares",
+)
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+
+def _load_pyarrow() -> Any:
+    """Import pyarrow on first use; ``None`` when it is not installed."""
+    global pa, pq, _pyarrow_loaded
+    if not _pyarrow_loaded:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:  # pragma: no cover - optional dependency
+            pyarrow = None
+        pa = pyarrow
+        pq = pyarrow.parquet if pyarrow is not None else None
+        _pyarrow_loaded = True
+    return pa
+
+
+def _require_pyarrow() -> None:
+    if _load_pyarrow() is None:
+        raise ImportError(
+            "Parquet and Arrow export require pyarrow; install it with "
+            "'pip install spliit-api-client[parquet]'"
+        )
+
+
+def arrow_schema() -> "pa.Schema":
+    """Get the Arrow schema of exported rows."""
+    _require_pyarrow()
+    timestamp = pa.timestamp("ms", tz="UTC")
+    return pa.schema([
+        ("expense_id", pa.string()),
+        ("title", pa.string()),
+        ("amount", pa.int64()),
+        ("category", pa.int32()),
+        ("expense_date", timestamp),
+        ("created_at", timestamp),
+        ("paid_by_id", pa.string()),
+        ("paid_by_name", pa.string()),
+        ("split_mode", pa.dictionary(pa.int8(), pa.string())),
+        ("is_reimbursement", pa.bool_()),
+        ("participant_id", pa.string()),
+        ("participant_name", pa.string()),
+        ("shares", pa.float64()),
+    ])
+
+
+def _name(participant: Any) -> Optional[str]:
+    return participant.get("name") if isinstance(participant, dict) else None
+
+
+def flatten_expense(expense: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Get one row per ``paidFor`` entry of an expense as returned by the API.
+
+    An expense without ``paidFor`` entries yields a single row with empty
+    participant fields.
+    """
+    base = {
+        "expense_id": expense["id"],
+        "title": expense.get("title"),
+        "amount": expense["amount"],
+        "category": category_id(expense),
+        "expense_date": expense.get("expenseDate"),
+        "created_at": expense.get("createdAt"),
+        "paid_by_id": paid_by_id(expense),
+        "paid_by_name": _name(expense.get("paidBy")),
+        "split_mode": expense.get("splitMode"),
+        "is_reimbursement": bool(expense.get("isReimbursement")),
+    }
+    paid_for = expense.get("paidFor") or []
+    if not paid_for:
+        yield dict(base, participant_id=None, participant_name=None, shares=None)
+    for entry in paid_for:
+        yield dict(
+            base,
+            participant_id=paid_for_id(entry),
+            participant_name=_name(entry.get("participant")),
+            shares=entry["shares"],
+        )
+
+
+def iter_rows(client: "Spliit", page_size: int = 200) -> Iterator[Dict[str, Any]]:
+    """Stream the flattened rows of every expense in the client's group."""
+    for expense in client.iter_expenses(page_size=page_size):
+        yield from flatten_expense(expense)
+
+
+def write_csv(rows: Iterable[Dict[str, Any]], target: PathOrFile) -> int:
+    """Write rows as CSV with a header line; returns the number of rows."""
+    count = 0
+    with _open_target(target, "w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def write_jsonl(rows: Iterable[Dict[str, Any]], target: PathOrFile) -> int:
+    """Write rows as JSON Lines; returns the number of rows."""
+    count = 0
+    with _open_target(target, "w") as handle:
+        for row in rows:
+            handle.write(json.dumps(row, ensure_ascii=False))
+            handle.write("\n")
+            count += 1
+    return count
+
+
+def _timestamp(value: Optional[str]) -> Any:
+    return parse_timestamp(value) if value else None
+
+
+def iter_record_batches(rows: Iterable[Dict[str, Any]], batch_size: int = 10_000) -> Iterator["pa.RecordBatch"]:
+    """Convert rows to Arrow record batches of at most ``batch_size`` rows."""
+    _require_pyarrow()
+    schema = arrow_schema()
+    for chunk in chunked(rows, batch_size):
+        columns: Dict[str, List[Any]] = {name: [] for name in FIELDS}
+        for row in chunk:
+            for name in FIELDS:
+                columns[name].append(row.get(name))
+        columns["expense_date"] = [_timestamp(value) for value in columns["expense_date"]]
+        columns["created_at"] = [_timestamp(value) for value in columns["created_at"]]
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(columns[name], type=schema.field(name).type) for name in FIELDS],
+            schema=schema,
+        )
+
+
+def write_parquet(rows: Iterable[Dict[str, Any]], target: PathOrFile, row_group_size: int = 10_000) -> int:
+    """
+    Write rows as Parquet, one row group per ``row_group_size`` rows.
+
+    Only one row group is held in memory at a time.
+    """
+    _require_pyarrow()
+    count = 0
+    with pq.ParquetWriter(target, arrow_schema()) as writer:
+        for batch in iter_record_batches(rows, row_group_size):
+            writer.write_batch(batch)
+            count += batch.num_rows
+    return count
+
+
+def export_expenses(
+    client: "Spliit",
+    target: PathOrFile,
+    format: Optional[str] = None,
+    page_size: int = 200,
+    row_group_size: int = 10_000,
+    limit: Optional[int] = None,
+) -> int:
+    """
+    Export the client's group to a file, streaming pages as they arrive.
+
+    Args:
+        client: Client of the group to export
+        target: Path or open file; Parquet needs a path or binary file
+        format: ``"csv"``, ``"jsonl"`` or ``"parquet"``; guessed from the
+            file extension by default
+        page_size: Number of expenses requested per page
+        row_group_size: Rows per Parquet row group
+        limit: Maximum number of rows to write
+
+    Returns:
+        The number of rows written
+    """
+    if format is None:
+        format = _guess_format(target)
+    rows: Iterable[Dict[str, Any]] = iter_rows(client, page_size=page_size)
+    if limit is not None:
+        rows = islice(rows, limit)
+    if format == "csv":
+        return write_csv(rows, target)
+    if format == "jsonl":
+        return write_jsonl(rows, target)
+    if format == "parquet":
+        return write_parquet(rows, target, row_group_size=row_group_size)
+    raise ValueError(f"Unknown format: {format!r}; expected one of {', '.join(FORMATS)}")
+
+
+def _guess_format(target: PathOrFile) -> str:
+    name = str(getattr(target, "name", target)).lower()
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith((".parquet", ".pq")):
+        return "parquet"
+    return "csv"
+
+
+@contextmanager
+def _open_target(target: PathOrFile, mode: str, **kwargs: Any) -> Iterator[IO[Any]]:
+    """Open a path for writing, or borrow an already open file without closing it."""
+    if hasattr(target, "write"):
+        yield target  # type: ignore[misc]
+        return
+    with open(target, mode, encoding="utf-8", **kwargs) as handle:
+        yield handle
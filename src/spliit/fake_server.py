@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+In-process stand-in for the Spliit tRPC API, for offline tests and load tests.
+
+The server speaks the same batch envelope as the real API and keeps groups
+and expenses in memory::
+
+    with FakeSpliitServer(latency=0.01) as server:
+        client = Spliit.create_group("Trip", server_url=server.url)
+        client.add_expense(...)
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Union
+from urllib.parse import parse_qs, urlsplit
+from .categories import CATEGORY_INDEX
+from .utils import get_current_timestamp
+
+TRPC_PREFIX = "/api/trpc/"
+
+QUERIES = {"groups.get", "groups.getDetails", "groups.expenses.list", "groups.expenses.get"}
+MUTATIONS = {"groups.create", "groups.expenses.create", "groups.expenses.delete"}
+
+_CATEGORY_BY_ID = {
+    category.id: {"id": category.id, "grouping": category.grouping, "name": category.name}
+    for category in CATEGORY_INDEX
+}
+
+
+class ProcedureError(Exception):
+    """Error returned for a single procedure call."""
+
+    STATUS = {"BAD_REQUEST": 400, "NOT_FOUND": 404, "METHOD_NOT_SUPPORTED": 405, "INTERNAL_SERVER_ERROR": 500}
+    RPC_CODE = {"BAD_REQUEST": -32600, "NOT_FOUND": -32004, "METHOD_NOT_SUPPORTED": -32005, "INTERNAL_SERVER_ERROR": -32603}
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+    @property
+    def http_status(self) -> int:
+        return self.STATUS.get(self.code, 500)
+
+    def to_item(self, path: str) -> Dict[str, Any]:
+        return {"error": {"json": {
+            "message": self.message,
+            "code": self.RPC_CODE.get(self.code, -32603),
+            "data": {"code": self.code, "httpStatus": self.http_status, "path": path},
+        }}}
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex[:21]
+
+
+@dataclass
+class _Group:
+    id: str
+    name: str
+    currency: str
+    information: str
+    participants: List[Dict[str, str]]
+    created_at: str
+    expenses: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+class FakeSpliitStore:
+    """In-memory storage and procedure implementations of the fake server."""
+
+    def __init__(self) -> None:
+        self.groups: Dict[str, _Group] = {}
+        self._lock = threading.RLock()
+
+    def call(self, procedure: str, data: Dict[str, Any]) -> Any:
+        """Run a procedure with its decoded input."""
+        handler = getattr(self, "_" + procedure.replace(".", "_"), None)
+        if handler is None:
+            raise ProcedureError("NOT_FOUND", f'No "query"-procedure on path "{procedure}"')
+        with self._lock:
+            return handler(data or {})
+
+    def _group(self, data: Dict[str, Any]) -> _Group:
+        group = self.groups.get(data.get("groupId"))
+        if group is None:
+            raise ProcedureError("NOT_FOUND", "Group not found")
+        return group
+
+    def _group_json(self, group: _Group) -> Dict[str, Any]:
+        return {
+            "id": group.id,
+            "name": group.name,
+            "currency": group.currency,
+            "information": group.information,
+            "createdAt": group.created_at,
+            "participants": [dict(participant, groupId=group.id) for participant in group.participants],
+        }
+
+    def _groups_create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        values = data.get("groupFormValues") or {}
+        if not values.get("name"):
+            raise ProcedureError("BAD_REQUEST", "Group name is required")
+        participants = [
+            {"id": participant.get("id") or _new_id(), "name": participant["name"]}
+            for participant in values.get("participants", [])
+        ]
+        group = _Group(
+            id=_new_id(),
+            name=values["name"],
+            currency=values.get("currency", "$"),
+            information=values.get("information", ""),
+            participants=participants,
+            created_at=get_current_timestamp(),
+        )
+        self.groups[group.id] = group
+        return {"groupId": group.id}
+
+    def _groups_get(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {"group": self._group_json(self._group(data))}
+
+    def _groups_getDetails(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        group = self._group(data)
+        payers = {expense["paidById"] for expense in group.expenses.values()}
+        return {"group": self._group_json(group), "participantsWithExpenses": sorted(payers)}
+
+    def _participant(self, group: _Group, participant_id: str) -> Dict[str, str]:
+        for participant in group.participants:
+            if participant["id"] == participant_id:
+                return participant
+        raise ProcedureError("BAD_REQUEST", f"Unknown participant: {participant_id}")
+
+    def _list_item(self, group: _Group, expense: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "amount": expense["amount"],
+            "category": _CATEGORY_BY_ID.get(expense["categoryId"]),
+            "createdAt": expense["createdAt"],
+            "expenseDate": expense["expenseDate"],
+            "id": expense["id"],
+            "isReimbursement": expense["isReimbursement"],
+            "paidBy": dict(self._participant(group, expense["paidById"])),
+            "paidFor": [
+                {"participant": dict(self._participant(group, row["participantId"])), "shares": row["shares"]}
+                for row in expense["paidFor"]
+            ],
+            "splitMode": expense["splitMode"],
+            "recurrenceRule": None,
+            "title": expense["title"],
+            "_count": {"documents": 0},
+        }
+
+    def _groups_expenses_list(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        group = self._group(data)
+        expenses = sorted(
+            group.expenses.values(),
+            key=lambda expense: (expense["expenseDate"], expense["createdAt"]),
+            reverse=True,
+        )
+        cursor = int(data.get("cursor") or 0)
+        limit = data.get("limit")
+        end = len(expenses) if limit is None else cursor + int(limit)
+        page = expenses[cursor:end]
+        return {
+            "expenses": [self._list_item(group, expense) for expense in page],
+            "hasMore": end < len(expenses),
+            "nextCursor": end,
+        }
+
+    def _groups_expenses_get(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        group = self._group(data)
+        expense = group.expenses.get(data.get("expenseId"))
+        if expense is None:
+            raise ProcedureError("NOT_FOUND", "Expense not found")
+        return {"expense": dict(
+            expense,
+            paidBy=dict(self._participant(group, expense["paidById"]), groupId=group.id),
+            category=_CATEGORY_BY_ID.get(expense["categoryId"]),
+            paidFor=[dict(row) for row in expense["paidFor"]],
+            documents=[],
+        )}
+
+    def _groups_expenses_create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        group = self._group(data)
+        values = data.get("expenseFormValues") or {}
+        if not values.get("title"):
+            raise ProcedureError("BAD_REQUEST", "Title is required")
+        amount = values.get("amount")
+        if not isinstance(amount, int) or amount == 0:
+            raise ProcedureError("BAD_REQUEST", "Amount must be a non-zero integer")
+        paid_for = values.get("paidFor") or []
+        if not paid_for:
+            raise ProcedureError("BAD_REQUEST", "The expense must be paid for at least one participant")
+        self._participant(group, values.get("paidBy"))
+        for row in paid_for:
+            self._participant(group, row["participant"])
+
+        expense_id = _new_id()
+        group.expenses[expense_id] = {
+            "id": expense_id,
+            "groupId": group.id,
+            "expenseDate": values.get("expenseDate") or get_current_timestamp(),
+            "title": values["title"],
+            "categoryId": values.get("category", 0),
+            "amount": amount,
+            "paidById": values["paidBy"],
+            "paidFor": [
+                {"expenseId": expense_id, "participantId": row["participant"], "shares": row["shares"]}
+                for row in paid_for
+            ],
+            "splitMode": values.get("splitMode", "EVENLY"),
+            "isReimbursement": bool(values.get("isReimbursement")),
+            "notes": values.get("notes", ""),
+            "createdAt": get_current_timestamp(),
+            "recurrenceRule": None,
+        }
+        return {"expenseId": expense_id}
+
+    def _groups_expenses_delete(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        group = self._group(data)
+        if group.expenses.pop(data.get("expenseId"), None) is None:
+            raise ProcedureError("NOT_FOUND", "Expense not found")
+        return {}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_HTTPServer"
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid delayed-ACK stalls on keep-alive connections
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._handle(mutation=False)
+
+    def do_POST(self) -> None:
+        self._handle(mutation=True)
+
+    def _handle(self, mutation: bool) -> None:
+        fake = self.server.fake
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        fake._before_request()
+        injected = fake._next_failure()
+        if injected is not None:
+            self._send(injected, [ProcedureError(
+                "INTERNAL_SERVER_ERROR", "Injected failure"
+            ).to_item(url.path)], {"Retry-After": "0"} if injected == 429 else None)
+            return
+
+        if not url.path.startswith(TRPC_PREFIX):
+            self._send(404, {"error": "Not found"})
+            return
+        procedures = url.path[len(TRPC_PREFIX):].split(",")
+        query = parse_qs(url.query)
+        try:
+            if mutation:
+                inputs = json.loads(body or b"{}")
+            else:
+                inputs = json.loads(query.get("input", ["{}"])[0])
+        except ValueError:
+            self._send(400, [ProcedureError("BAD_REQUEST", "Invalid JSON").to_item(url.path)])
+            return
+
+        items = []
+        statuses = set()
+        for index, procedure in enumerate(procedures):
+            envelope = inputs.get(str(index)) or {}
+            try:
+                if (procedure in MUTATIONS) != mutation and procedure in QUERIES | MUTATIONS:
+                    raise ProcedureError("METHOD_NOT_SUPPORTED", f"Unsupported {self.command} for {procedure}")
+                result = fake.store.call(procedure, envelope.get("json"))
+                items.append({"result": {"data": {"json": result}}})
+                statuses.add(200)
+            except ProcedureError as error:
+                items.append(error.to_item(procedure))
+                statuses.add(error.http_status)
+        status = statuses.pop() if len(statuses) == 1 else 207
+        if fake.etags and not mutation and status == 200:
+            etag = '"%s"' % hashlib.sha1(json.dumps(items).encode()).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, None, {"ETag": etag})
+            else:
+                self._send(status, items, {"ETag": etag})
+            return
+        self._send(status, items)
+
+    def _send(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode() if status != 304 else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: "FakeSpliitServer"
+
+
+class FakeSpliitServer:
+    """
+    Threaded HTTP server implementing the Spliit procedures used by the client.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind; 0 picks a free port
+        latency: Artificial delay in seconds added to every request, or a
+            callable returning one
+        error_rate: Probability of answering a request with a 500 error
+        seed: Seed of the random generator used for error injection
+        etags: Send an ``ETag`` with query responses and answer matching
+            ``If-None-Match`` requests with ``304 Not Modified``
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Union[float, Callable[[], float]] = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        etags: bool = False,
+    ):
+        self.store = FakeSpliitStore()
+        self.etags = etags
+        self.latency = latency
+        self.error_rate = error_rate
+        self.request_count = 0
+        self._random = random.Random(seed)
+        self._failures: List[int] = []
+        self._lock = threading.Lock()
+        self._httpd = _HTTPServer((host, port), _Handler)
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Get the base URL to use as ``server_url``."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, count: int = 1, status: int = 500) -> None:
+        """Answer the next ``count`` requests with the given error status."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def _before_request(self) -> None:
+        with self._lock:
+            self.request_count += 1
+        delay = self.latency() if callable(self.latency) else self.latency
+        if delay > 0:
+            time.sleep(delay)
+
+    def _next_failure(self) -> Optional[int]:
+        with self._lock:
+            if self._failures:
+                return self._failures.pop(0)
+            if self.error_rate and self._random.random() < self.error_rate:
+                return 500
+        return None
+
+    def start(self) -> "FakeSpliitServer":
+        """Start serving in a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeSpliitServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    """Run a fake server in the foreground: ``python -m spliit.fake_server [port]``."""
+    import sys
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    server = FakeSpliitServer(port=port)
+    print(f"Fake Spliit server listening on {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of tRPC query responses with HTTP revalidation.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Union
+from urllib.parse import unquote_plus
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    group_id TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    content_type TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+CREATE INDEX IF NOT EXISTS idx_responses_group ON responses (group_id);
+"""
+
+_GROUP_ID = re.compile(r'"groupId"\s*:\s*"([^"]+)"')
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body and its validators."""
+
+    key: str
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_type: Optional[str]
+    stored_at: float
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Get the headers revalidating this response."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    SQLite-backed LRU cache of GET responses, keyed by their full URL.
+
+    The URL of a tRPC query holds its procedures and encoded input, so it
+    identifies the response. A response younger than ``max_age`` seconds is
+    served without contacting the server; older ones are revalidated with
+    ``If-None-Match``/``If-Modified-Since`` and reused on ``304 Not
+    Modified``. Responses without an ``ETag`` or ``Last-Modified`` header
+    are only stored when ``max_age`` is positive.
+
+    Args:
+        path: Database file, or ``":memory:"``
+        max_entries: Maximum number of stored responses
+        max_bytes: Maximum total size of the stored bodies
+        max_age: Seconds during which a response is served without revalidation
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        max_age: float = 0.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Get a stored response, marking it as recently used."""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT body, etag, last_modified, content_type, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (self._clock(), key))
+            self.connection.commit()
+        return CachedResponse(key, bytes(row[0]), row[1], row[2], row[3], row[4])
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Whether a response can be served without revalidation."""
+        return self.max_age > 0 and self._clock() - entry.stored_at < self.max_age
+
+    def should_store(self, headers: Any) -> bool:
+        """Whether a 200 response with the given headers is worth storing."""
+        if "no-store" in (headers.get("Cache-Control") or ""):
+            return False
+        return self.max_age > 0 or bool(headers.get("ETag") or headers.get("Last-Modified"))
+
+    def put(self, key: str, body: bytes, headers: Any) -> None:
+        """Store a response and evict the least recently used ones beyond the limits."""
+        if self.max_bytes is not None and len(body) > self.max_bytes:
+            return
+        match = _GROUP_ID.search(unquote_plus(key))
+        now = self._clock()
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses (key, group_id, etag, last_modified, content_type, "
+                "body, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    match.group(1) if match else None,
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    headers.get("Content-Type"),
+                    body,
+                    len(body),
+                    now,
+                    now,
+                ),
+            )
+            self._evict()
+            self.connection.commit()
+
+    def refresh(self, entry: CachedResponse, headers: Any) -> None:
+        """Record a successful revalidation, updating the validators when sent again."""
+        with self._lock:
+            self.revalidated += 1
+            now = self._clock()
+            self.connection.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (now, now, headers.get("ETag"), headers.get("Last-Modified"), entry.key),
+            )
+            self.connection.commit()
+        entry.stored_at = now
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def _evict(self) -> None:
+        count, total = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        while count > self.max_entries or (self.max_bytes is not None and total > self.max_bytes):
+            row = self.connection.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return
+            self.connection.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            count -= 1
+            total -= row[1]
+
+    def invalidate_for(self, body: Union[bytes, str, None]) -> None:
+        """Drop the responses of the groups named in a mutation body, or all when it names none."""
+        if isinstance(body, bytes):
+            body = body.decode("utf-8", "replace")
+        group_ids = set(_GROUP_ID.findall(body or ""))
+        if not group_ids:
+            self.invalidate()
+        for group_id in group_ids:
+            self.invalidate(group_id)
+
+    def invalidate(self, group_id: Optional[str] = None) -> None:
+        """Drop the stored responses of a group, or all of them."""
+        with self._lock:
+            if group_id is None:
+                self.connection.execute("DELETE FROM responses")
+            else:
+                self.connection.execute("DELETE FROM responses WHERE group_id = ?", (group_id,))
+            self.connection.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of entries, stored bytes, hits, revalidations and misses."""
+        with self._lock:
+            count, total = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            return {
+                "entries": count,
+                "bytes": total,
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database."""
+        self.connection.close()
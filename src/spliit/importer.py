@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+Streaming import of expenses from CSV and JSON Lines files.
+
+Rows are read lazily, converted to :meth:`Spliit.add_expense` arguments and
+submitted chunk by chunk. Every chunk records its rows in a checkpoint file
+as soon as the server has answered, in whatever order chunks finish, and a
+resumed import skips the recorded rows. Resuming is at-least-once: a chunk
+that was sent but not yet recorded when the import stopped is sent again,
+which can duplicate its expenses::
+
+    python -m spliit.importer GROUP_ID ledger.csv --checkpoint ledger.ckpt
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import Any, Dict, IO, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+from .bulk import bounded_map, chunked
+from .categories import CATEGORY_INDEX
+from .exceptions import SpliitError
+from .utils import OFFICIAL_INSTANCE, SplitMode, parse_timestamp
+
+if TYPE_CHECKING:
+    from .client import Spliit
+
+PathOrFile = Union[str, "os.PathLike[str]", IO[str]]
+
+
+@dataclass
+class ColumnMapping:
+    """Names of the source columns holding each expense field."""
+
+    title: str = "title"
+    amount: str = "amount"
+    paid_by: str = "paid_by"
+    # "John:1;Jane:2", "John;Jane", or in JSON a list of names, of
+    # [name, shares] pairs or a {name: shares} object
+    paid_for: str = "paid_for"
+    split_mode: str = "split_mode"
+    expense_date: str = "date"
+    notes: str = "notes"
+    # Category ID, name ("Dining Out") or "Group/Name"
+    category: str = "category"
+    is_reimbursement: str = "is_reimbursement"
+
+
+@dataclass
+class RowError:
+    """A row that could not be imported."""
+
+    row: int
+    error: str
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import."""
+
+    # Rows processed by this run, excluding the ones skipped on resume
+    rows: int = 0
+    imported: int = 0
+    # Rows already processed by an earlier run
+    resumed_from: int = 0
+    errors: List[RowError] = field(default_factory=list)
+    expense_ids: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Whether every processed row was imported."""
+        return not self.errors
+
+
+def read_csv(source: PathOrFile, delimiter: str = ",") -> Iterator[Dict[str, str]]:
+    """Stream the rows of a CSV file with a header line as dicts."""
+    with _open_text(source) as handle:
+        yield from csv.DictReader(handle, delimiter=delimiter)
+
+
+def read_jsonl(source: PathOrFile) -> Iterator[Dict[str, Any]]:
+    """Stream the objects of a JSON Lines file, skipping blank lines."""
+    with _open_text(source) as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_json(source: PathOrFile) -> Iterator[Dict[str, Any]]:
+    """
+    Read the objects of a JSON file holding an array of records.
+
+    Unlike the other readers, the whole file is loaded at once.
+    """
+    with _open_text(source) as handle:
+        records = json.load(handle)
+    if not isinstance(records, list):
+        raise ValueError("A JSON file must hold an array of records; use JSON Lines for streams")
+    return iter(records)
+
+
+_FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "json"}
+
+
+def read_rows(source: PathOrFile, format: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream rows of a CSV, JSON Lines or JSON array file.
+
+    Args:
+        source: Path or open text file
+        format: ``"csv"``, ``"jsonl"`` or ``"json"``; guessed from the file
+            extension by default
+    """
+    if format is None:
+        name = str(getattr(source, "name", source)).lower()
+        format = next((value for suffix, value in _FORMATS.items() if name.endswith(suffix)), "csv")
+    if format == "csv":
+        return read_csv(source)
+    if format == "jsonl":
+        return read_jsonl(source)
+    if format == "json":
+        return read_json(source)
+    raise ValueError(f"Unknown format: {format!r}; expected 'csv', 'jsonl' or 'json'")
+
+
+@contextmanager
+def _open_text(source: PathOrFile) -> Iterator[IO[str]]:
+    """Open a path for reading, or borrow an already open file without closing it."""
+    if hasattr(source, "read"):
+        yield source  # type: ignore[misc]
+        return
+    with open(source, newline="", encoding="utf-8-sig") as handle:
+        yield handle
+
+
+def _is_blank(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+class ExpenseImporter:
+    """
+    Convert source rows to expenses and submit them in chunks.
+
+    Participant and category names are resolved once when the importer is
+    created; every row is validated locally before anything is sent.
+
+    Args:
+        client: Client of the target group
+        mapping: Source column names
+        amount_scale: Factor applied to amounts to get cents; use 1 when the
+            source already holds cents
+        default_split_mode: Split mode of rows without one
+    """
+
+    def __init__(
+        self,
+        client: "Spliit",
+        mapping: Optional[ColumnMapping] = None,
+        amount_scale: int = 100,
+        default_split_mode: SplitMode = SplitMode.EVENLY,
+    ):
+        self.client = client
+        self.mapping = mapping or ColumnMapping()
+        self.amount_scale = amount_scale
+        self.default_split_mode = default_split_mode
+        index = client.get_participant_index()
+        self._participants: Dict[str, str] = {}
+        for name, participant_id in index.by_name.items():
+            self._participants.setdefault(name.lower(), participant_id)
+        for name, participant_id in index.by_name.items():
+            self._participants[name] = participant_id
+        for participant_id in index.by_id:
+            self._participants[participant_id] = participant_id
+
+    def participant_id(self, value: str) -> str:
+        """Resolve a participant name or ID."""
+        value = str(value).strip()
+        participant_id = self._participants.get(value) or self._participants.get(value.lower())
+        if participant_id is None:
+            raise ValueError(f"Unknown participant: {value!r}")
+        return participant_id
+
+    def category_id(self, value: Any) -> int:
+        """Resolve a category ID, name or ``Group/Name``."""
+        if _is_blank(value):
+            return 0
+        if isinstance(value, int) or str(value).strip().isdigit():
+            return int(value)
+        category_id = CATEGORY_INDEX.id_for(str(value))
+        if category_id is None:
+            raise ValueError(f"Unknown category: {value!r}")
+        return category_id
+
+    def amount(self, value: Any) -> int:
+        """Convert an amount in currency units to cents."""
+        try:
+            cents = Decimal(str(value).strip()) * self.amount_scale
+        except InvalidOperation:
+            raise ValueError(f"Invalid amount: {value!r}") from None
+        if cents != cents.to_integral_value():
+            raise ValueError(f"Amount {value!r} has more precision than cents")
+        return int(cents)
+
+    def _shares(self, value: Any) -> List[Tuple[str, Any]]:
+        if isinstance(value, Mapping):
+            pairs = list(value.items())
+        elif isinstance(value, (list, tuple)):
+            pairs = [tuple(entry) if isinstance(entry, (list, tuple)) else (entry, 1) for entry in value]
+        else:
+            pairs = []
+            for entry in str(value).split(";"):
+                if entry.strip():
+                    name, _, shares = entry.partition(":")
+                    pairs.append((name, shares.strip() or 1))
+        return [(self.participant_id(name), self._share(shares)) for name, shares in pairs]
+
+    @staticmethod
+    def _share(value: Any) -> Union[int, float]:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid shares: {value!r}") from None
+        return int(number) if number.is_integer() else number
+
+    @staticmethod
+    def _basis_points(value: Union[int, float]) -> int:
+        points = Decimal(str(value)) * 100
+        if points != points.to_integral_value():
+            raise ValueError(f"Percentage {value!r} has more than two decimals")
+        return int(points)
+
+    def prepare(self, row: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Convert one row to :meth:`Spliit.add_expense` keyword arguments.
+
+        Percentage splits are given in percent (``John:60;Jane:40``) and
+        converted to the basis points the API expects.
+
+        Raises:
+            ValueError: If the row is invalid
+        """
+        mapping = self.mapping
+        title = row.get(mapping.title)
+        if _is_blank(title):
+            raise ValueError("Missing title")
+        if _is_blank(row.get(mapping.amount)):
+            raise ValueError("Missing amount")
+        amount = self.amount(row[mapping.amount])
+        if amount == 0:
+            raise ValueError("Amount must not be zero")
+        if _is_blank(row.get(mapping.paid_by)):
+            raise ValueError("Missing paid_by")
+        paid_by = self.participant_id(row[mapping.paid_by])
+
+        mode = row.get(mapping.split_mode)
+        try:
+            split_mode = SplitMode(str(mode).strip().upper()) if not _is_blank(mode) else self.default_split_mode
+        except ValueError:
+            raise ValueError(f"Unknown split mode: {mode!r}") from None
+
+        paid_for = self._shares(row.get(mapping.paid_for) or "")
+        if not paid_for:
+            raise ValueError("Missing paid_for")
+        if len({participant_id for participant_id, _ in paid_for}) != len(paid_for):
+            raise ValueError("A participant appears twice in paid_for")
+        shares = [share for _, share in paid_for]
+        if any(share < 0 for share in shares):
+            raise ValueError("Shares must not be negative")
+        if split_mode is SplitMode.BY_PERCENTAGE:
+            # Spliit stores percentages as basis points summing to 10000
+            paid_for = [(participant_id, self._basis_points(share)) for participant_id, share in paid_for]
+            total = sum(share for _, share in paid_for)
+            if total != 10000:
+                raise ValueError(f"Percentages add up to {Decimal(total) / 100}%, not 100%")
+        if split_mode is SplitMode.BY_AMOUNT:
+            paid_for = [(participant_id, self.amount(share)) for participant_id, share in paid_for]
+            if sum(share for _, share in paid_for) != amount:
+                raise ValueError("Split amounts do not add up to the expense amount")
+        if split_mode in (SplitMode.EVENLY, SplitMode.BY_SHARES):
+            # Spliit stores shares as integers
+            if any(not isinstance(share, int) for share in shares):
+                raise ValueError("Shares must be whole numbers")
+        if split_mode is SplitMode.BY_SHARES and sum(shares) <= 0:
+            raise ValueError("Shares add up to zero")
+
+        expense: Dict[str, Any] = {
+            "title": str(title).strip(),
+            "amount": amount,
+            "paid_by": paid_by,
+            "paid_for": paid_for,
+            "split_mode": split_mode,
+            "category": self.category_id(row.get(mapping.category)),
+            "notes": "" if _is_blank(row.get(mapping.notes)) else str(row[mapping.notes]),
+        }
+        date = row.get(mapping.expense_date)
+        if not _is_blank(date):
+            try:
+                expense["expense_date"] = date if isinstance(date, datetime) else parse_timestamp(str(date).strip())
+            except ValueError:
+                raise ValueError(f"Invalid date: {date!r}") from None
+        reimbursement = row.get(mapping.is_reimbursement)
+        if not _is_blank(reimbursement):
+            expense["is_reimbursement"] = str(reimbursement).strip().lower() in ("1", "true", "yes", "y")
+        return expense
+
+    def run(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        checkpoint: Optional[str] = None,
+        chunk_size: int = 25,
+        workers: int = 1,
+        dry_run: bool = False,
+    ) -> ImportReport:
+        """
+        Import rows, resuming from the checkpoint file when it exists.
+
+        Invalid rows and rows rejected by the server are reported without
+        stopping the import. Rows are numbered from 1 in source order. A
+        resumed import skips the rows of every chunk recorded in the
+        checkpoint; chunks that were in flight when the import stopped are
+        sent again.
+
+        Args:
+            rows: Source rows, consumed lazily
+            checkpoint: Path of the checkpoint file; removed once the import completes
+            chunk_size: Number of expenses created per HTTP request
+            workers: Number of chunks submitted in parallel
+            dry_run: Only validate the rows
+        """
+        report = ImportReport()
+        state = _Checkpoint.load(checkpoint, self.client.group_id)
+        report.resumed_from = state.processed
+        numbered = (
+            (number, row)
+            for number, row in islice(enumerate(rows, start=1), state.rows, None)
+            if not state.is_done(number)
+        )
+
+        def submit(chunk: List[Tuple[int, Mapping[str, Any]]]) -> Tuple[int, List[Any]]:
+            prepared: List[Tuple[int, Dict[str, Any]]] = []
+            outcomes: List[Any] = []
+            for number, row in chunk:
+                try:
+                    prepared.append((number, self.prepare(row)))
+                except ValueError as error:
+                    outcomes.append(RowError(number, str(error)))
+            if prepared and not dry_run:
+                result = self.client.add_expenses([expense for _, expense in prepared], chunk_size=len(prepared))
+                for (number, _), item in zip(prepared, result):
+                    outcomes.append(item.value if item.ok else RowError(number, str(item.error)))
+            else:
+                outcomes.extend(None for _ in prepared)
+            if not dry_run:
+                # Recorded here rather than in order, so chunks finished by other
+                # workers are not sent again if an earlier one never completes
+                state.finish(chunk[0][0], chunk[-1][0], [outcome for outcome in outcomes if isinstance(outcome, RowError)])
+            return outcomes
+
+        for outcomes in bounded_map(submit, chunked(numbered, chunk_size), workers):
+            for outcome in outcomes:
+                report.rows += 1
+                if isinstance(outcome, RowError):
+                    report.errors.append(outcome)
+                else:
+                    report.imported += 1
+                    if outcome is not None:
+                        report.expense_ids.append(outcome)
+        if not dry_run:
+            state.complete()
+        return report
+
+
+@dataclass
+class _Checkpoint:
+    path: Optional[str]
+    group_id: str
+    # Every row up to this one is processed
+    rows: int = 0
+    # [first, last] row ranges of chunks processed beyond ``rows``
+    chunks: List[List[int]] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def processed(self) -> int:
+        return self.rows + sum(last - first + 1 for first, last in self.chunks)
+
+    def is_done(self, row: int) -> bool:
+        return row <= self.rows or any(first <= row <= last for first, last in self.chunks)
+
+    def finish(self, first: int, last: int, errors: List[RowError]) -> None:
+        """Record a processed chunk and save the checkpoint."""
+        with self._lock:
+            self.chunks.append([first, last])
+            self.chunks.sort()
+            while self.chunks and self.chunks[0][0] <= self.rows + 1:
+                self.rows = max(self.rows, self.chunks.pop(0)[1])
+            self.errors.extend(asdict(error) for error in errors)
+            self.save()
+
+    @classmethod
+    def load(cls, path: Optional[str], group_id: str) -> "_Checkpoint":
+        if path is None or not os.path.exists(path):
+            return cls(path, group_id)
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        if data.get("group_id") != group_id:
+            raise SpliitError(f"Checkpoint {path} belongs to group {data.get('group_id')}, not {group_id}")
+        return cls(path, group_id, rows=data["rows"], chunks=data.get("chunks", []), errors=data.get("errors", []))
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(
+                {"group_id": self.group_id, "rows": self.rows, "chunks": self.chunks, "errors": self.errors}, handle
+            )
+        os.replace(temporary, self.path)
+
+    def complete(self) -> None:
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def import_file(
+    client: "Spliit",
+    source: PathOrFile,
+    format: Optional[str] = None,
+    mapping: Optional[ColumnMapping] = None,
+    amount_scale: int = 100,
+    **kwargs: Any,
+) -> ImportReport:
+    """
+    Import a CSV or JSON Lines file into the client's group.
+
+    Extra keyword arguments are passed to :meth:`ExpenseImporter.run`.
+    """
+    importer = ExpenseImporter(client, mapping=mapping, amount_scale=amount_scale)
+    return importer.run(read_rows(source, format), **kwargs)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of an import command, shared by ``spliit import`` and this module."""
+    parser.add_argument("source", help="CSV, JSON Lines or JSON array file, or - for CSV on standard input")
+    parser.add_argument("--format", choices=["csv", "jsonl", "json"])
+    parser.add_argument("--checkpoint", help="Checkpoint file used to resume an interrupted import")
+    parser.add_argument("--chunk-size", type=int, default=25)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--cents", action="store_true", help="Amounts are already in cents")
+    parser.add_argument("--dry-run", action="store_true", help="Only validate the rows")
+    for name in ColumnMapping.__dataclass_fields__:
+        parser.add_argument(f"--{name.replace('_', '-')}-column", dest=name, metavar="NAME")
+
+
+def run_command(client: "Spliit", args: argparse.Namespace) -> int:
+    """Run an import parsed with :func:`add_arguments` and print its report; returns the exit status."""
+    mapping = ColumnMapping(**{
+        name: getattr(args, name) for name in ColumnMapping.__dataclass_fields__ if getattr(args, name)
+    })
+    source = sys.stdin if args.source == "-" else args.source
+    report = import_file(
+        client,
+        source,
+        format=args.format or ("csv" if args.source == "-" else None),
+        mapping=mapping,
+        amount_scale=1 if args.cents else 100,
+        checkpoint=args.checkpoint,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        dry_run=args.dry_run,
+    )
+    for error in report.errors:
+        print(f"row {error.row}: {error.error}", file=sys.stderr)
+    action = "Validated" if args.dry_run else "Imported"
+    print(f"{action} {report.imported} of {report.rows} rows", file=sys.stderr)
+    return 0 if report.ok else 1
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point; returns the exit status."""
+    from .client import Spliit
+
+    parser = argparse.ArgumentParser(prog="python -m spliit.importer", description="Import expenses from CSV or JSON Lines.")
+    parser.add_argument("group_id")
+    parser.add_argument("--server-url", default=OFFICIAL_INSTANCE)
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    with Spliit(group_id=args.group_id, server_url=args.server_url) as client:
+        return run_command(client, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
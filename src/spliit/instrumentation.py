@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Request hooks and per-procedure latency statistics.
+"""
+
+import bisect
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+TRPC_PREFIX = "/api/trpc/"
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf,
+)
+
+
+def procedure_from_url(url: str) -> Tuple[str, int]:
+    """
+    Get the procedure name and number of calls of a tRPC request URL.
+
+    Repeated procedures of a batch are collapsed, so a batch of 50
+    ``groups.expenses.get`` calls is reported as ``groups.expenses.get``.
+    """
+    path = urlsplit(url).path
+    if TRPC_PREFIX in path:
+        path = path.split(TRPC_PREFIX, 1)[1]
+    procedures = path.split(",")
+    return ",".join(dict.fromkeys(procedures)), len(procedures)
+
+
+@dataclass
+class RequestEvent:
+    """Details of one HTTP request passed to the hooks."""
+
+    method: str
+    url: str
+    procedure: str
+    calls: int = 1
+    payload_size: int = 0
+    status: Optional[int] = None
+    response_size: Optional[int] = None
+    elapsed: Optional[float] = None
+    error: Optional[BaseException] = None
+    # Number of earlier attempts of the same request
+    attempt: int = 0
+
+
+Hook = Callable[[RequestEvent], None]
+
+
+@dataclass
+class Hooks:
+    """
+    Callbacks invoked around every request of a transport.
+
+    ``before_request`` hooks run before sending, ``after_response`` hooks
+    for every received response and ``on_error`` hooks when the request
+    raised or the response has an error status.
+    """
+
+    before_request: List[Hook] = field(default_factory=list)
+    after_response: List[Hook] = field(default_factory=list)
+    on_error: List[Hook] = field(default_factory=list)
+
+    def add(
+        self,
+        before_request: Optional[Hook] = None,
+        after_response: Optional[Hook] = None,
+        on_error: Optional[Hook] = None,
+    ) -> None:
+        """Register hooks; any of them may be omitted."""
+        if before_request is not None:
+            self.before_request.append(before_request)
+        if after_response is not None:
+            self.after_response.append(after_response)
+        if on_error is not None:
+            self.on_error.append(on_error)
+
+    def remove(self, hook: Hook) -> None:
+        """Unregister a hook from every event it was registered for."""
+        for hooks in (self.before_request, self.after_response, self.on_error):
+            while hook in hooks:
+                hooks.remove(hook)
+
+    @staticmethod
+    def emit(hooks: List[Hook], event: RequestEvent) -> None:
+        for hook in hooks:
+            hook(event)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of request latencies."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one latency in seconds."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip(self.buckets, self.counts)),
+        }
+
+
+class ProcedureStats:
+    """Counters and latency histogram of one procedure."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.statuses: Dict[int, int] = {}
+        self.latency = LatencyHistogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "statuses": dict(self.statuses),
+            "latency": self.latency.to_dict(),
+        }
+
+
+class StatsCollector:
+    """
+    Thread-safe collector of per-procedure request statistics.
+
+    Register it on :class:`Hooks` with :meth:`install`.
+    """
+
+    def __init__(self) -> None:
+        self._procedures: Dict[str, ProcedureStats] = {}
+        self._lock = threading.Lock()
+
+    def install(self, hooks: Hooks) -> "StatsCollector":
+        hooks.add(after_response=self.record, on_error=self.record_error)
+        return self
+
+    def _get(self, procedure: str) -> ProcedureStats:
+        stats = self._procedures.get(procedure)
+        if stats is None:
+            stats = self._procedures[procedure] = ProcedureStats()
+        return stats
+
+    def record(self, event: RequestEvent) -> None:
+        """Record a received response."""
+        with self._lock:
+            stats = self._get(event.procedure)
+            stats.requests += 1
+            stats.calls += event.calls
+            stats.retries += 1 if event.attempt else 0
+            stats.bytes_sent += event.payload_size
+            stats.bytes_received += event.response_size or 0
+            if event.status is not None:
+                stats.statuses[event.status] = stats.statuses.get(event.status, 0) + 1
+            if event.elapsed is not None:
+                stats.latency.observe(event.elapsed)
+
+    def record_error(self, event: RequestEvent) -> None:
+        """Record a failed request or an error response."""
+        with self._lock:
+            stats = self._get(event.procedure)
+            stats.errors += 1
+            if event.status is None:
+                # The request raised: no response was recorded for it
+                stats.requests += 1
+                stats.calls += event.calls
+                stats.retries += 1 if event.attempt else 0
+                stats.bytes_sent += event.payload_size
+                if event.elapsed is not None:
+                    stats.latency.observe(event.elapsed)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get the statistics of every procedure as plain dicts."""
+        with self._lock:
+            return {procedure: stats.to_dict() for procedure, stats in self._procedures.items()}
+
+    def reset(self) -> None:
+        """Forget all recorded statistics."""
+        with self._lock:
+            self._procedures.clear()
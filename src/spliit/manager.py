@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Fan-out of client operations across many groups over one connection pool.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, TypeVar
+from .bulk import bounded_map
+from .cache import GroupCache
+from .client import Spliit
+from .codec import JSONCodec
+from .transport import PoolConfig, Transport
+from .utils import OFFICIAL_INSTANCE
+
+R = TypeVar("R")
+
+
+@dataclass
+class GroupResult:
+    """Outcome of an operation on one group."""
+
+    group_id: str
+    value: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the operation succeeded."""
+        return self.error is None
+
+
+@dataclass
+class GroupResults:
+    """Per-group outcomes of a fan-out operation, in the order the groups were given."""
+
+    items: List[GroupResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> List[GroupResult]:
+        """Get the groups whose operation succeeded."""
+        return [item for item in self.items if item.ok]
+
+    @property
+    def failed(self) -> List[GroupResult]:
+        """Get the groups whose operation failed."""
+        return [item for item in self.items if not item.ok]
+
+    @property
+    def ok(self) -> bool:
+        """Whether the operation succeeded for every group."""
+        return all(item.ok for item in self.items)
+
+    @property
+    def values(self) -> Dict[str, Any]:
+        """Get the results of the groups that succeeded, by group ID."""
+        return {item.group_id: item.value for item in self.items if item.ok}
+
+    @property
+    def errors(self) -> Dict[str, BaseException]:
+        """Get the errors of the groups that failed, by group ID."""
+        return {item.group_id: item.error for item in self.items if not item.ok}
+
+    def __getitem__(self, group_id: str) -> GroupResult:
+        for item in self.items:
+            if item.group_id == group_id:
+                return item
+        raise KeyError(group_id)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[GroupResult]:
+        return iter(self.items)
+
+
+class SpliitManager:
+    """
+    Handles of many groups sharing one transport, cache and codec.
+
+    Operations run in a thread pool; at most ``max_workers`` requests are in
+    flight across all fan-out calls of the manager, even when several
+    threads use it at once. A transport created by the manager is sized for
+    ``max_workers`` connections and closed by :meth:`close`.
+
+    Args:
+        group_ids: Groups to manage
+        server_url: Server of the groups
+        max_workers: Global concurrency cap
+        transport: Transport shared by every group handle
+        cache: Group cache shared by every group handle
+        codec: JSON codec shared by every group handle
+    """
+
+    def __init__(
+        self,
+        group_ids: Iterable[str] = (),
+        server_url: str = OFFICIAL_INSTANCE,
+        max_workers: int = 16,
+        transport: Optional[Transport] = None,
+        cache: Optional[GroupCache] = None,
+        codec: Optional[JSONCodec] = None,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.server_url = server_url
+        self.max_workers = max_workers
+        self._owns_transport = transport is None
+        self.transport = transport or Transport(PoolConfig(pool_maxsize=max_workers))
+        self.cache = cache
+        self.codec = codec
+        self._clients: Dict[str, Spliit] = {}
+        self._slots = threading.BoundedSemaphore(max_workers)
+        for group_id in group_ids:
+            self.add(group_id)
+
+    def add(self, group_id: str) -> Spliit:
+        """Get the handle of a group, adding it if it is not managed yet."""
+        client = self._clients.get(group_id)
+        if client is None:
+            client = self._clients[group_id] = Spliit(
+                group_id=group_id,
+                server_url=self.server_url,
+                transport=self.transport,
+                cache=self.cache,
+                codec=self.codec,
+            )
+        return client
+
+    def remove(self, group_id: str) -> None:
+        """Stop managing a group."""
+        self._clients.pop(group_id, None)
+
+    def __getitem__(self, group_id: str) -> Spliit:
+        return self._clients[group_id]
+
+    def __contains__(self, group_id: object) -> bool:
+        return group_id in self._clients
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._clients))
+
+    def map(
+        self,
+        fn: Callable[[Spliit], R],
+        group_ids: Optional[Iterable[str]] = None,
+    ) -> GroupResults:
+        """
+        Call ``fn`` with the handle of every group, in parallel.
+
+        An exception raised for one group is recorded in its result and does
+        not stop the others.
+
+        Args:
+            fn: Operation to run for each group
+            group_ids: Groups to run it for; all managed groups by default.
+                Unmanaged groups are added.
+        """
+        clients = [self.add(group_id) for group_id in (group_ids if group_ids is not None else list(self._clients))]
+
+        def run(client: Spliit) -> GroupResult:
+            with self._slots:
+                try:
+                    return GroupResult(client.group_id, value=fn(client))
+                except Exception as error:
+                    return GroupResult(client.group_id, error=error)
+
+        return GroupResults(list(bounded_map(run, clients, self.max_workers)))
+
+    def get_groups(self, group_ids: Optional[Iterable[str]] = None) -> GroupResults:
+        """Get the details of every group."""
+        return self.map(lambda client: client.get_group(), group_ids)
+
+    def get_expenses(self, group_ids: Optional[Iterable[str]] = None) -> GroupResults:
+        """Get the expenses of every group."""
+        return self.map(lambda client: client.get_expenses(), group_ids)
+
+    def get_balances(self, group_ids: Optional[Iterable[str]] = None) -> GroupResults:
+        """Get the participant balances of every group."""
+        return self.map(lambda client: client.get_balances(), group_ids)
+
+    def add_expenses(
+        self,
+        expenses: Mapping[str, Iterable[Mapping[str, Any]]],
+        chunk_size: int = 25,
+    ) -> GroupResults:
+        """
+        Add expenses to several groups using batched mutations.
+
+        Args:
+            expenses: :meth:`Spliit.add_expense` keyword arguments by group ID
+
+        Returns:
+            Per-group results whose values are :class:`BulkResult` reports
+        """
+        return self.map(
+            lambda client: client.add_expenses(expenses[client.group_id], chunk_size=chunk_size),
+            list(expenses),
+        )
+
+    def close(self) -> None:
+        """Close the transport if it is owned by the manager."""
+        if self._owns_transport:
+            self.transport.close()
+
+    def __enter__(self) -> "SpliitManager":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Local SQLite mirror of Spliit groups with incremental synchronization.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
+from .utils import category_id, format_timestamp, get_current_timestamp, paid_by_id, paid_for_id
+
+if TYPE_CHECKING:
+    from .client import Spliit
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS groups (
+    group_id TEXT PRIMARY KEY,
+    server_url TEXT NOT NULL,
+    name TEXT,
+    currency TEXT,
+    synced_at TEXT
+);
+CREATE TABLE IF NOT EXISTS participants (
+    group_id TEXT NOT NULL,
+    participant_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (group_id, participant_id)
+);
+CREATE TABLE IF NOT EXISTS expenses (
+    group_id TEXT NOT NULL,
+    expense_id TEXT NOT NULL,
+    title TEXT,
+    amount INTEGER NOT NULL,
+    category INTEGER,
+    expense_date TEXT,
+    paid_by TEXT,
+    split_mode TEXT,
+    is_reimbursement INTEGER NOT NULL DEFAULT 0,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (group_id, expense_id)
+);
+CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses (group_id, expense_date);
+CREATE INDEX IF NOT EXISTS idx_expenses_paid_by ON expenses (group_id, paid_by);
+CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses (group_id, category);
+CREATE TABLE IF NOT EXISTS expense_shares (
+    group_id TEXT NOT NULL,
+    expense_id TEXT NOT NULL,
+    participant_id TEXT NOT NULL,
+    shares REAL NOT NULL,
+    PRIMARY KEY (group_id, expense_id, participant_id)
+);
+CREATE INDEX IF NOT EXISTS idx_shares_participant ON expense_shares (group_id, participant_id);
+"""
+
+
+def fingerprint(expense: Dict[str, Any]) -> str:
+    """Get a short digest identifying the content of an expense."""
+    encoded = json.dumps(expense, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+@dataclass
+class SyncResult:
+    """Counts of the changes applied by one :meth:`ExpenseMirror.sync`."""
+
+    added: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+
+class ExpenseMirror:
+    """
+    Mirrors groups' participants and expenses into a local SQLite database.
+
+    :meth:`sync` walks the server's expense listing and only writes rows
+    whose content changed, then removes expenses that no longer exist.
+    Queries never touch the network::
+
+        with ExpenseMirror("spliit.db") as mirror:
+            mirror.sync(client)
+            dinners = mirror.expenses(client.group_id, category=8)
+    """
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"] = ":memory:"):
+        self.path = path
+        self.connection = sqlite3.connect(str(path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def __enter__(self) -> "ExpenseMirror":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def sync(self, client: "Spliit", page_size: int = 100) -> SyncResult:
+        """
+        Bring the mirror of the client's group up to date.
+
+        Args:
+            client: Client of the group to mirror
+            page_size: Number of expenses requested per page
+
+        Returns:
+            A :class:`SyncResult` with the number of changed expenses
+        """
+        group = client.get_group()
+        group_id = client.group_id
+        known = {
+            row["expense_id"]: row["fingerprint"]
+            for row in self.connection.execute(
+                "SELECT expense_id, fingerprint FROM expenses WHERE group_id = ?", (group_id,)
+            )
+        }
+        result = SyncResult()
+
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO groups (group_id, server_url, name, currency, synced_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (group_id, client.server_url, group.get("name"), group.get("currency"),
+                 get_current_timestamp()),
+            )
+            self.connection.execute("DELETE FROM participants WHERE group_id = ?", (group_id,))
+            self.connection.executemany(
+                "INSERT INTO participants (group_id, participant_id, name) VALUES (?, ?, ?)",
+                [(group_id, p["id"], p["name"]) for p in group.get("participants", [])],
+            )
+
+            for expense in client.iter_expenses(page_size=page_size):
+                digest = fingerprint(expense)
+                previous = known.pop(expense["id"], None)
+                if previous == digest:
+                    result.unchanged += 1
+                    continue
+                self._store_expense(group_id, expense, digest)
+                if previous is None:
+                    result.added += 1
+                else:
+                    result.updated += 1
+
+            for expense_id in known:
+                self._delete_expense(group_id, expense_id)
+            result.deleted = len(known)
+        return result
+
+    def _store_expense(self, group_id: str, expense: Dict[str, Any], digest: str) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO expenses (group_id, expense_id, title, amount, category, "
+            "expense_date, paid_by, split_mode, is_reimbursement, fingerprint, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                group_id,
+                expense["id"],
+                expense.get("title"),
+                expense["amount"],
+                category_id(expense),
+                expense.get("expenseDate"),
+                paid_by_id(expense),
+                expense.get("splitMode"),
+                int(bool(expense.get("isReimbursement"))),
+                digest,
+                json.dumps(expense),
+            ),
+        )
+        self.connection.execute(
+            "DELETE FROM expense_shares WHERE group_id = ? AND expense_id = ?",
+            (group_id, expense["id"]),
+        )
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO expense_shares (group_id, expense_id, participant_id, shares) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (group_id, expense["id"], paid_for_id(paid_for), float(paid_for["shares"]))
+                for paid_for in expense.get("paidFor", [])
+            ],
+        )
+
+    def _delete_expense(self, group_id: str, expense_id: str) -> None:
+        for table in ("expenses", "expense_shares"):
+            self.connection.execute(
+                f"DELETE FROM {table} WHERE group_id = ? AND expense_id = ?",
+                (group_id, expense_id),
+            )
+
+    def participants(self, group_id: str) -> Dict[str, str]:
+        """Get the mirrored participants of a group by name."""
+        return {
+            row["name"]: row["participant_id"]
+            for row in self.connection.execute(
+                "SELECT name, participant_id FROM participants WHERE group_id = ?", (group_id,)
+            )
+        }
+
+    def get_expense(self, group_id: str, expense_id: str) -> Optional[Dict[str, Any]]:
+        """Get a mirrored expense, as returned by the expense listing."""
+        row = self.connection.execute(
+            "SELECT data FROM expenses WHERE group_id = ? AND expense_id = ?",
+            (group_id, expense_id),
+        ).fetchone()
+        return json.loads(row["data"]) if row is not None else None
+
+    def expenses(
+        self,
+        group_id: str,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        paid_by: Optional[str] = None,
+        category: Optional[int] = None,
+        participant: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query mirrored expenses, newest first.
+
+        Args:
+            group_id: Group to query
+            date_from: Only expenses dated at or after this datetime
+            date_to: Only expenses dated before this datetime
+            paid_by: Only expenses paid by this participant ID
+            category: Only expenses in this category ID
+            participant: Only expenses shared by this participant ID
+            limit: Maximum number of expenses returned
+        """
+        clauses = ["e.group_id = ?"]
+        params: List[Any] = [group_id]
+        if date_from is not None:
+            clauses.append("e.expense_date >= ?")
+            params.append(format_timestamp(date_from))
+        if date_to is not None:
+            clauses.append("e.expense_date < ?")
+            params.append(format_timestamp(date_to))
+        if paid_by is not None:
+            clauses.append("e.paid_by = ?")
+            params.append(paid_by)
+        if category is not None:
+            clauses.append("e.category = ?")
+            params.append(category)
+        if participant is not None:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM expense_shares s WHERE s.group_id = e.group_id "
+                "AND s.expense_id = e.expense_id AND s.participant_id = ?)"
+            )
+            params.append(participant)
+        query = (
+            f"SELECT e.data FROM expenses e WHERE {' AND '.join(clauses)} "
+            "ORDER BY e.expense_date DESC, e.expense_id"
+        )
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(row["data"]) for row in self.connection.execute(query, params)]
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Durable write-behind queue for expense mutations.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import requests
+from .batch import Batch, BatchCall
+from .client import Spliit
+from .exceptions import SpliitError, TRPCError
+from .retry import RETRY_STATUSES, RetryPolicy
+from .transport import Transport
+from .utils import OFFICIAL_INSTANCE, SplitMode, format_expense_payload
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    group_id TEXT NOT NULL,
+    procedure TEXT NOT NULL,
+    envelope TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    result TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox (status, group_id, seq);
+"""
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class OutboxEntry:
+    """State of one queued write."""
+
+    idempotency_key: str
+    group_id: str
+    procedure: str
+    status: str
+    attempts: int
+    last_error: Optional[str]
+    result: Optional[str]
+    created_at: float
+    updated_at: float
+
+
+@dataclass
+class FlushResult:
+    """Counts of the writes handled by one :meth:`Outbox.flush`."""
+
+    sent: int = 0
+    failed: int = 0
+    deferred: int = 0
+
+
+def _is_transient(error: BaseException) -> bool:
+    # Errors after which the write may succeed if sent again
+    if isinstance(error, TRPCError):
+        return error.http_status in RETRY_STATUSES
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRY_STATUSES
+    return isinstance(error, (requests.RequestException, SpliitError))
+
+
+class Outbox:
+    """
+    SQLite-backed queue that accepts expense writes instantly and sends them later.
+
+    Writes are validated and stored when they are enqueued, then flushed in
+    batches of up to ``batch_size`` mutations per request, either by calling
+    :meth:`flush` or by a background thread started with :meth:`start`.
+    Writes to the same group are sent in the order they were enqueued; a
+    transient failure (connection error, 429, 5xx) leaves the group's
+    remaining writes queued and backs off, while a write rejected by the
+    server is marked ``failed`` and skipped.
+
+    Enqueuing a write with an ``idempotency_key`` that is already known
+    does nothing, so producers can safely resubmit. The key only
+    deduplicates on the client: the Spliit API has no idempotency keys, so
+    an expense whose response was lost in transit may be created twice.
+
+    Args:
+        path: Database file, or ``":memory:"``
+        server_url: Spliit instance the writes are sent to
+        transport: Transport shared by the flushes; one is created if omitted
+        batch_size: Maximum number of writes sent per request
+        retry: Backoff between flushes after transient failures
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        server_url: str = OFFICIAL_INSTANCE,
+        transport: Optional[Transport] = None,
+        batch_size: int = 25,
+        retry: Optional[RetryPolicy] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.path = path
+        self.server_url = server_url
+        self.batch_size = batch_size
+        self.retry = retry or RetryPolicy(max_retries=0, max_backoff=60.0)
+        self._owns_transport = transport is None
+        self.transport = transport or Transport()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self._clients: Dict[str, Spliit] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self.failures = 0
+        self.flushes = 0
+        self.sent = 0
+        self.last_flush_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def _enqueue(self, group_id: str, procedure: str, envelope: Dict[str, Any], key: Optional[str]) -> str:
+        key = key or uuid.uuid4().hex
+        now = self._clock()
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO outbox (idempotency_key, group_id, procedure, envelope, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, group_id, procedure, json.dumps(envelope), now, now),
+            )
+            self.connection.commit()
+        self._wake.set()
+        return key
+
+    def add_expense(
+        self,
+        group_id: str,
+        title: str,
+        amount: int,
+        paid_by: str,
+        paid_for: List[Tuple[str, int]],
+        split_mode: SplitMode = SplitMode.EVENLY,
+        expense_date: Optional[datetime] = None,
+        notes: str = "",
+        category: int = 0,
+        is_reimbursement: bool = False,
+        idempotency_key: Optional[str] = None,
+    ) -> str:
+        """
+        Queue a new expense; see :meth:`Spliit.add_expense` for the arguments.
+
+        The expense date defaults to the time it is queued, not sent.
+
+        Returns:
+            The idempotency key of the write
+        """
+        if expense_date is None:
+            expense_date = datetime.now(timezone.utc)
+        payload = format_expense_payload(
+            group_id, title, amount, paid_by, paid_for, split_mode,
+            expense_date, notes, category, is_reimbursement,
+        )
+        return self._enqueue(group_id, "groups.expenses.create", payload["0"], idempotency_key)
+
+    def remove_expense(self, group_id: str, expense_id: str, idempotency_key: Optional[str] = None) -> str:
+        """
+        Queue the removal of an expense. Removing an expense that no longer
+        exists counts as success.
+
+        Returns:
+            The idempotency key of the write
+        """
+        envelope = {"json": {"groupId": group_id, "expenseId": expense_id}}
+        return self._enqueue(group_id, "groups.expenses.delete", envelope, idempotency_key)
+
+    def _client(self, group_id: str) -> Spliit:
+        client = self._clients.get(group_id)
+        if client is None:
+            client = Spliit(group_id=group_id, server_url=self.server_url, transport=self.transport)
+            self._clients[group_id] = client
+        return client
+
+    def _pending_groups(self) -> List[str]:
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT group_id FROM outbox WHERE status = ? GROUP BY group_id ORDER BY MIN(seq)",
+                (PENDING,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _next_batch(self, group_id: str) -> List[Tuple[int, str, str]]:
+        with self._lock:
+            return self.connection.execute(
+                "SELECT seq, procedure, envelope FROM outbox WHERE status = ? AND group_id = ? "
+                "ORDER BY seq LIMIT ?",
+                (PENDING, group_id, self.batch_size),
+            ).fetchall()
+
+    def _flush_group(self, group_id: str, result: FlushResult) -> bool:
+        client = self._client(group_id)
+        while True:
+            rows = self._next_batch(group_id)
+            if not rows:
+                return True
+            batch = Batch(client, max_size=self.batch_size)
+            calls: List[Tuple[int, BatchCall]] = [
+                (seq, batch.add(BatchCall(procedure, json.loads(envelope), mutation=True)))
+                for seq, procedure, envelope in rows
+            ]
+            batch.execute()
+
+            now = self._clock()
+            updates = []
+            transient: Optional[BaseException] = None
+            for seq, call in calls:
+                error = call.error
+                if error is None or (
+                    isinstance(error, TRPCError) and error.code == "NOT_FOUND"
+                    and call.procedure == "groups.expenses.delete"
+                ):
+                    value = call.result() if error is None else None
+                    expense_id = value.get("expenseId") if isinstance(value, dict) else None
+                    updates.append((DONE, None, expense_id, now, seq))
+                    result.sent += 1
+                elif transient is None and not _is_transient(error):
+                    updates.append((FAILED, str(error), None, now, seq))
+                    result.failed += 1
+                else:
+                    # Keep this write and every later one of the group queued, in order
+                    transient = transient or error
+                    updates.append((PENDING, str(error), None, now, seq))
+                    result.deferred += 1
+            with self._lock:
+                self.connection.executemany(
+                    "UPDATE outbox SET status = ?, last_error = ?, result = ?, updated_at = ?, "
+                    "attempts = attempts + 1 WHERE seq = ?",
+                    updates,
+                )
+                self.connection.commit()
+            if transient is not None:
+                self.last_error = str(transient)
+                logger.warning("Deferring writes to group %s: %s", group_id, transient)
+                return False
+
+    def flush(self) -> FlushResult:
+        """
+        Send every queued write, group by group.
+
+        Returns:
+            A :class:`FlushResult`; ``deferred`` counts writes left queued
+            after transient failures
+        """
+        result = FlushResult()
+        with self._flush_lock:
+            for group_id in self._pending_groups():
+                self._flush_group(group_id, result)
+            self.flushes += 1
+            self.sent += result.sent
+            self.last_flush_at = self._clock()
+            self.failures = self.failures + 1 if result.deferred else 0
+        return result
+
+    def _run(self, interval: float) -> None:
+        while not self._stopping.is_set():
+            try:
+                self.flush()
+            except Exception as error:  # pragma: no cover - keep the flusher alive
+                self.failures += 1
+                self.last_error = str(error)
+                logger.exception("Outbox flush failed")
+            delay = self.retry.backoff(self.failures) if self.failures else interval
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def start(self, interval: float = 1.0) -> "Outbox":
+        """
+        Flush in a background thread.
+
+        New writes wake the thread immediately; otherwise it flushes every
+        ``interval`` seconds, backing off after transient failures.
+        """
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, args=(interval,), name="spliit-outbox", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, flush: bool = True) -> None:
+        """Stop the background thread, flushing once more if ``flush`` is true."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        if flush:
+            self.flush()
+
+    def status(self, idempotency_key: str) -> Optional[OutboxEntry]:
+        """Get the state of a queued write, or ``None`` if the key is unknown."""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT idempotency_key, group_id, procedure, status, attempts, last_error, result, "
+                "created_at, updated_at FROM outbox WHERE idempotency_key = ?",
+                (idempotency_key,),
+            ).fetchone()
+        return OutboxEntry(*row) if row is not None else None
+
+    def failed(self) -> List[OutboxEntry]:
+        """Get the writes rejected by the server."""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT idempotency_key, group_id, procedure, status, attempts, last_error, result, "
+                "created_at, updated_at FROM outbox WHERE status = ? ORDER BY seq",
+                (FAILED,),
+            ).fetchall()
+        return [OutboxEntry(*row) for row in rows]
+
+    def retry_failed(self) -> int:
+        """Queue the failed writes again; returns how many were requeued."""
+        with self._lock:
+            count = self.connection.execute(
+                "UPDATE outbox SET status = ? WHERE status = ?", (PENDING, FAILED)
+            ).rowcount
+            self.connection.commit()
+        self._wake.set()
+        return count
+
+    def prune(self, older_than: float) -> int:
+        """
+        Forget sent writes last updated more than ``older_than`` seconds ago.
+
+        Their idempotency keys are forgotten with them.
+        """
+        with self._lock:
+            count = self.connection.execute(
+                "DELETE FROM outbox WHERE status = ? AND updated_at < ?",
+                (DONE, self._clock() - older_than),
+            ).rowcount
+            self.connection.commit()
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the backlog and flush metrics.
+
+        Returns:
+            A dict with the number of ``pending``, ``failed`` and ``done``
+            writes, the age in seconds of the oldest pending one, the number
+            of writes sent and flushes run, the consecutive flushes with
+            transient failures, and the time and last error of the flushes
+        """
+        with self._lock:
+            counts = dict(self.connection.execute(
+                "SELECT status, COUNT(*) FROM outbox GROUP BY status"
+            ).fetchall())
+            oldest = self.connection.execute(
+                "SELECT MIN(created_at) FROM outbox WHERE status = ?", (PENDING,)
+            ).fetchone()[0]
+        return {
+            "pending": counts.get(PENDING, 0),
+            "failed": counts.get(FAILED, 0),
+            "done": counts.get(DONE, 0),
+            "oldest_pending_age": self._clock() - oldest if oldest is not None else 0.0,
+            "sent": self.sent,
+            "flushes": self.flushes,
+            "consecutive_failures": self.failures,
+            "last_flush_at": self.last_flush_at,
+            "last_error": self.last_error,
+        }
+
+    def __len__(self) -> int:
+        """Get the number of pending writes."""
+        with self._lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status = ?", (PENDING,)
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        """Stop the background thread without flushing and close the database."""
+        self.stop(flush=False)
+        if self._owns_transport:
+            self.transport.close()
+        self.connection.close()
+
+    def __enter__(self) -> "Outbox":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
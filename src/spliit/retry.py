@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Retry policy with exponential backoff and a token-bucket rate limiter.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, FrozenSet, Optional
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header into a delay in seconds.
+
+    Both the delay-seconds and the HTTP-date forms are supported.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+
+    Only idempotent methods are retried by default: a mutation whose
+    response was lost may already have been applied by the server, so
+    retrying it could create a duplicate expense. Add ``"POST"`` to
+    ``methods`` to retry mutations as well.
+
+    The delay before retry ``n`` (starting at 1) is drawn uniformly from
+    ``[(1 - jitter) * d, d]`` with ``d = min(max_backoff, backoff_factor * 2 ** (n - 1))``.
+    A ``Retry-After`` header takes precedence when present.
+    """
+
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    # Fraction of the delay that is randomized; 1.0 is "full jitter"
+    jitter: float = 1.0
+    statuses: FrozenSet[int] = RETRY_STATUSES
+    methods: FrozenSet[str] = frozenset({"GET"})
+    # Retry connection errors and timeouts of retryable methods
+    retry_errors: bool = True
+    respect_retry_after: bool = True
+    # Upper bound of an honoured Retry-After delay
+    max_retry_after: float = 120.0
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False, compare=False)
+    random: Callable[[], float] = field(default=random.random, repr=False, compare=False)
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        """Whether a request with the given method may be sent again after ``attempt`` retries."""
+        return attempt < self.max_retries and method.upper() in self.methods
+
+    def should_retry_status(self, method: str, status: Any, attempt: int) -> bool:
+        """Whether a response with the given status should be retried."""
+        return isinstance(status, int) and status in self.statuses and self.can_retry(method, attempt)
+
+    def should_retry_error(self, method: str, error: BaseException, attempt: int) -> bool:
+        """Whether a request that raised should be retried."""
+        return self.retry_errors and self.can_retry(method, attempt)
+
+    def backoff(self, attempt: int) -> float:
+        """Get the jittered exponential backoff before retry number ``attempt``."""
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** (attempt - 1)))
+        return delay * (1.0 - self.jitter * self.random())
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Get the delay before retry number ``attempt``, honouring ``Retry-After``."""
+        if self.respect_retry_after:
+            seconds = parse_retry_after(retry_after)
+            if seconds is not None:
+                return min(seconds, self.max_retry_after)
+        return self.backoff(attempt)
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Tokens are added at ``rate`` per second up to ``capacity``; every
+    request takes one. Waiting callers queue up in arrival order because
+    tokens are reserved before sleeping, so the sustained request rate stays
+    at ``rate`` instead of bursting after every pause. :meth:`pause` stops
+    all callers, e.g. when the server answered 429 with ``Retry-After``.
+
+    Args:
+        rate: Tokens added per second
+        capacity: Maximum burst size; defaults to ``rate`` (at least 1)
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        # Time up to which tokens were accounted; in the future while paused
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens without blocking.
+
+        Returns:
+            Seconds the caller must wait before sending its request
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= tokens
+            wait = max(0.0, self._updated - now)
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return wait
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, sleeping until they are available; returns the time waited."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for the next ``seconds``; no tokens accrue meanwhile."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = max(self._updated, now + seconds)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Planning of the reimbursements that settle a group's balances.
+"""
+
+import heapq
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+from .balances import Balance
+from .utils import CATEGORIES, SplitMode
+
+# Groups with at most this many unsettled participants are solved exactly by default
+EXACT_LIMIT = 12
+
+
+@dataclass(frozen=True)
+class Transfer:
+    """A reimbursement of ``amount`` cents from one participant to another."""
+
+    from_id: str
+    to_id: str
+    amount: int
+
+    def to_expense(self, title: str = "Reimbursement", expense_date: Optional[datetime] = None) -> Dict[str, Any]:
+        """Get the :meth:`Spliit.add_expense` arguments recording this transfer."""
+        expense = {
+            "title": title,
+            "amount": self.amount,
+            "paid_by": self.from_id,
+            "paid_for": [(self.to_id, 1)],
+            "split_mode": SplitMode.EVENLY,
+            "category": CATEGORIES["Uncategorized"]["Payment"],
+            "is_reimbursement": True,
+        }
+        if expense_date is not None:
+            expense["expense_date"] = expense_date
+        return expense
+
+
+def _greedy(totals: List[Tuple[str, int]]) -> List[Transfer]:
+    """Repeatedly match the largest creditor with the largest debtor."""
+    creditors = [(-amount, participant) for participant, amount in totals if amount > 0]
+    debtors = [(amount, participant) for participant, amount in totals if amount < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+
+    transfers = []
+    while creditors and debtors:
+        credit, creditor = heapq.heappop(creditors)
+        debt, debtor = heapq.heappop(debtors)
+        amount = min(-credit, -debt)
+        transfers.append(Transfer(debtor, creditor, amount))
+        if -credit > amount:
+            heapq.heappush(creditors, (credit + amount, creditor))
+        if -debt > amount:
+            heapq.heappush(debtors, (debt + amount, debtor))
+    return transfers
+
+
+def _exact(totals: List[Tuple[str, int]]) -> List[Transfer]:
+    """
+    Find the minimum number of transfers.
+
+    A set of ``n`` participants split into ``k`` zero-sum subsets needs
+    ``n - k`` transfers, so the subsets are chosen to maximize ``k`` with a
+    dynamic program over participant bitmasks.
+    """
+    count = len(totals)
+    full = (1 << count) - 1
+    sums = [0] * (full + 1)
+    groups = [0] * (full + 1)
+    for mask in range(1, full + 1):
+        lowest = (mask & -mask).bit_length() - 1
+        sums[mask] = sums[mask & (mask - 1)] + totals[lowest][1]
+        best = 0
+        remaining = mask
+        while remaining:
+            bit = remaining & -remaining
+            best = max(best, groups[mask ^ bit])
+            remaining ^= bit
+        groups[mask] = best + (sums[mask] == 0)
+
+    # Walk back from the full set, recording the order participants are removed in
+    order = []
+    mask = full
+    while mask:
+        target = groups[mask] - (sums[mask] == 0)
+        remaining = mask
+        while remaining:
+            bit = remaining & -remaining
+            if groups[mask ^ bit] == target:
+                break
+            remaining ^= bit
+        order.append(bit.bit_length() - 1)
+        mask ^= bit
+
+    # Prefixes of the reversed order with a zero sum close a subset
+    transfers: List[Transfer] = []
+    subset: List[Tuple[str, int]] = []
+    running = 0
+    for index in reversed(order):
+        subset.append(totals[index])
+        running += totals[index][1]
+        if running == 0:
+            transfers.extend(_greedy(subset))
+            subset = []
+    transfers.extend(_greedy(subset))
+    return transfers
+
+
+def plan_settlement(
+    balances: Mapping[str, Union[Balance, int]],
+    method: str = "auto",
+    exact_limit: int = EXACT_LIMIT,
+) -> List[Transfer]:
+    """
+    Plan the reimbursements that bring every balance back to zero.
+
+    Args:
+        balances: Participant IDs mapped to a :class:`Balance` or a net amount
+            in cents (positive when the participant is owed money)
+        method: ``"greedy"`` for the heap-based heuristic (at most one
+            transfer fewer than the number of unsettled participants),
+            ``"exact"`` for the minimum number of transfers, or ``"auto"``
+            to solve exactly when at most ``exact_limit`` participants are
+            unsettled
+        exact_limit: Participant count up to which ``"auto"`` is exact
+
+    Returns:
+        List of :class:`Transfer`
+    """
+    totals = [
+        (participant_id, balance.total if isinstance(balance, Balance) else int(balance))
+        for participant_id, balance in balances.items()
+    ]
+    totals = [(participant_id, amount) for participant_id, amount in totals if amount != 0]
+
+    if method == "auto":
+        method = "exact" if len(totals) <= exact_limit else "greedy"
+    if method == "greedy":
+        return _greedy(totals)
+    if method == "exact":
+        return _exact(totals)
+    raise ValueError(f"Unknown settlement method: {method!r}")
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Compact columnar representation of a group's expenses.
+"""
+
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from .balances import ShareMatrix, _load_numpy
+from .utils import SplitMode, category_id, paid_by_id, paid_for_id, parse_timestamp, as_utc
+
+SPLIT_MODES = [mode.value for mode in SplitMode]
+_SPLIT_MODE_INDEX = {mode: index for index, mode in enumerate(SPLIT_MODES)}
+
+# Columns that can be used with sort_by, group_by and sum_by
+COLUMNS = ("id", "title", "amount", "category", "expense_date", "paid_by", "split_mode", "is_reimbursement")
+
+
+def _view(np: Any, column: array) -> Any:
+    """Get a typed-array column as a NumPy array sharing its memory."""
+    return np.frombuffer(column, dtype=column.typecode) if len(column) else np.zeros(0, dtype=column.typecode)
+
+
+def _from_numpy(np: Any, typecode: str, values: Any) -> array:
+    column = array(typecode)
+    column.frombytes(np.ascontiguousarray(values, dtype=typecode).tobytes())
+    return column
+
+
+def _gather(np: Any, column: array, positions: Any) -> array:
+    """Copy the given positions of a typed-array column in bulk."""
+    return _from_numpy(np, column.typecode, _view(np, column)[positions])
+
+
+class ExpenseRow:
+    """Read-only view of one row of an :class:`ExpenseTable`."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "ExpenseTable", index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def id(self) -> str:
+        return self._table.ids[self._index]
+
+    @property
+    def title(self) -> str:
+        return self._table.titles[self._index]
+
+    @property
+    def amount(self) -> int:
+        return self._table.amounts[self._index]
+
+    @property
+    def category(self) -> int:
+        return self._table.categories[self._index]
+
+    @property
+    def expense_date(self) -> datetime:
+        return datetime.fromtimestamp(self._table.dates[self._index] / 1000, tz=timezone.utc)
+
+    @property
+    def paid_by(self) -> str:
+        return self._table.participants[self._table.payers[self._index]]
+
+    @property
+    def split_mode(self) -> SplitMode:
+        return SplitMode(SPLIT_MODES[self._table.split_modes[self._index]])
+
+    @property
+    def is_reimbursement(self) -> bool:
+        return bool(self._table.reimbursements[self._index])
+
+    @property
+    def paid_for(self) -> List[Tuple[str, float]]:
+        """Get the ``(participant_id, shares)`` pairs of the expense."""
+        table = self._table
+        start, end = table.share_offsets[self._index], table.share_offsets[self._index + 1]
+        return [
+            (table.participants[table.share_participants[position]], table.share_weights[position])
+            for position in range(start, end)
+        ]
+
+    def __repr__(self) -> str:
+        return f"<ExpenseRow {self.id} {self.title!r} {self.amount}>"
+
+
+class ExpenseTable:
+    """
+    Expenses stored column by column in typed arrays.
+
+    With NumPy installed, selections, sorting and grouping build index
+    arrays from the columns and copy the selected rows in bulk; without it
+    they fall back to plain Python loops.
+
+    Participant IDs are interned once in ``participants`` and referenced by
+    index. The ``paidFor`` entries of row ``i`` are the positions
+    ``share_offsets[i]`` to ``share_offsets[i + 1]`` of the ``share_*``
+    columns. Dates are stored as milliseconds since the epoch.
+    """
+
+    def __init__(self) -> None:
+        self.participants: List[str] = []
+        self._participant_index: Dict[str, int] = {}
+        self._shared_participants = False
+        self.ids: List[str] = []
+        self.titles: List[str] = []
+        self.amounts = array("q")
+        self.categories = array("i")
+        self.dates = array("q")
+        self.payers = array("i")
+        self.split_modes = array("b")
+        self.reimbursements = array("b")
+        self.share_offsets = array("q", [0])
+        self.share_participants = array("i")
+        self.share_weights = array("d")
+
+    @classmethod
+    def from_expenses(cls, expenses: Iterable[Dict[str, Any]]) -> "ExpenseTable":
+        """Build a table from expenses as returned by the API, consuming them lazily."""
+        table = cls()
+        for expense in expenses:
+            table.append(expense)
+        return table
+
+    def _intern(self, participant_id: str) -> int:
+        index = self._participant_index.get(participant_id)
+        if index is None:
+            if self._shared_participants:
+                self.participants = list(self.participants)
+                self._participant_index = dict(self._participant_index)
+                self._shared_participants = False
+            index = self._participant_index[participant_id] = len(self.participants)
+            self.participants.append(participant_id)
+        return index
+
+    def append(self, expense: Dict[str, Any]) -> None:
+        """Append one expense as returned by the API."""
+        self.ids.append(expense["id"])
+        self.titles.append(expense.get("title", ""))
+        self.amounts.append(int(expense["amount"]))
+        self.categories.append(category_id(expense))
+        date = parse_timestamp(expense["expenseDate"]) if expense.get("expenseDate") else None
+        self.dates.append(int(date.timestamp() * 1000) if date is not None else 0)
+        self.payers.append(self._intern(paid_by_id(expense)))
+        self.split_modes.append(_SPLIT_MODE_INDEX[expense.get("splitMode", SplitMode.EVENLY.value)])
+        self.reimbursements.append(1 if expense.get("isReimbursement") else 0)
+        for paid_for in expense.get("paidFor", []):
+            self.share_participants.append(self._intern(paid_for_id(paid_for)))
+            self.share_weights.append(float(paid_for["shares"]))
+        self.share_offsets.append(len(self.share_participants))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> ExpenseRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ExpenseTable index out of range")
+        return ExpenseRow(self, index)
+
+    def __iter__(self) -> Iterator[ExpenseRow]:
+        return (ExpenseRow(self, index) for index in range(len(self)))
+
+    def column(self, name: str) -> Sequence[Any]:
+        """
+        Get a column by name.
+
+        ``paid_by`` and ``split_mode`` are resolved to participant IDs and
+        split mode names; use the raw arrays for vectorized work.
+        """
+        if name == "id":
+            return self.ids
+        if name == "title":
+            return self.titles
+        if name == "amount":
+            return self.amounts
+        if name == "category":
+            return self.categories
+        if name == "expense_date":
+            return self.dates
+        if name == "paid_by":
+            return [self.participants[payer] for payer in self.payers]
+        if name == "split_mode":
+            return [SPLIT_MODES[mode] for mode in self.split_modes]
+        if name == "is_reimbursement":
+            return self.reimbursements
+        raise KeyError(f"Unknown column: {name!r}; expected one of {', '.join(COLUMNS)}")
+
+    def to_numpy(self, name: str) -> Any:
+        """Get a typed-array column as a NumPy array sharing its memory."""
+        np = _load_numpy()
+        if np is None:
+            raise ImportError("to_numpy requires numpy; install it with 'pip install spliit-api-client[numpy]'")
+        column = self.column(name)
+        if not isinstance(column, array):
+            raise KeyError(f"Column {name!r} is not a typed array")
+        return np.frombuffer(column, dtype=column.typecode)
+
+    def _empty_like(self) -> "ExpenseTable":
+        table = ExpenseTable()
+        # Participants are shared until the new table interns a new one
+        table.participants = self.participants
+        table._participant_index = self._participant_index
+        table._shared_participants = True
+        return table
+
+    def take(self, indices: Iterable[int]) -> "ExpenseTable":
+        """Get a new table with the given rows, in the given order."""
+        np = _load_numpy()
+        if np is None:
+            return self._take_python(indices)
+        if not isinstance(indices, np.ndarray):
+            indices = np.fromiter(indices, dtype=np.intp)
+        size = len(self)
+        rows = indices.astype(np.intp, copy=False)
+        if len(rows) and (rows.min() < -size or rows.max() >= size):
+            raise IndexError("ExpenseTable index out of range")
+        rows = np.where(rows < 0, rows + size, rows)
+
+        table = self._empty_like()
+        table.ids = list(map(self.ids.__getitem__, rows.tolist()))
+        table.titles = list(map(self.titles.__getitem__, rows.tolist()))
+        for name in ("amounts", "categories", "dates", "payers", "split_modes", "reimbursements"):
+            setattr(table, name, _gather(np, getattr(self, name), rows))
+
+        # Positions of the share entries of every selected row, in row order
+        offsets = np.frombuffer(self.share_offsets, dtype=self.share_offsets.typecode)
+        starts = offsets[rows]
+        counts = offsets[rows + 1] - starts
+        new_offsets = np.zeros(len(rows) + 1, dtype=offsets.dtype)
+        np.cumsum(counts, out=new_offsets[1:])
+        positions = np.repeat(starts - new_offsets[:-1], counts) + np.arange(new_offsets[-1])
+        table.share_offsets = _from_numpy(np, "q", new_offsets)
+        table.share_participants = _gather(np, self.share_participants, positions)
+        table.share_weights = _gather(np, self.share_weights, positions)
+        return table
+
+    def _take_python(self, indices: Iterable[int]) -> "ExpenseTable":
+        table = self._empty_like()
+        for index in indices:
+            index = range(len(self))[index]
+            table.ids.append(self.ids[index])
+            table.titles.append(self.titles[index])
+            table.amounts.append(self.amounts[index])
+            table.categories.append(self.categories[index])
+            table.dates.append(self.dates[index])
+            table.payers.append(self.payers[index])
+            table.split_modes.append(self.split_modes[index])
+            table.reimbursements.append(self.reimbursements[index])
+            start, end = self.share_offsets[index], self.share_offsets[index + 1]
+            table.share_participants.extend(self.share_participants[start:end])
+            table.share_weights.extend(self.share_weights[start:end])
+            table.share_offsets.append(len(table.share_participants))
+        return table
+
+    def filter(self, condition: Union[Callable[[ExpenseRow], bool], Sequence[bool]]) -> "ExpenseTable":
+        """Get the rows matching a row predicate or a boolean mask."""
+        if callable(condition):
+            return self.take(index for index in range(len(self)) if condition(ExpenseRow(self, index)))
+        if len(condition) != len(self):
+            raise ValueError("Mask length does not match the table")
+        np = _load_numpy()
+        if np is None:
+            return self.take(index for index, keep in enumerate(condition) if keep)
+        return self.take(np.flatnonzero(np.asarray(condition, dtype=bool)))
+
+    def where(
+        self,
+        category: Optional[int] = None,
+        paid_by: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        participant: Optional[str] = None,
+    ) -> "ExpenseTable":
+        """Get the rows matching all the given column filters."""
+        payer = self._participant_index.get(paid_by, -1) if paid_by is not None else None
+        member = self._participant_index.get(participant, -1) if participant is not None else None
+        start = int(as_utc(date_from).timestamp() * 1000) if date_from is not None else None
+        end = int(as_utc(date_to).timestamp() * 1000) if date_to is not None else None
+
+        np = _load_numpy()
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            if category is not None:
+                mask &= _view(np, self.categories) == category
+            if payer is not None:
+                mask &= _view(np, self.payers) == payer
+            if start is not None:
+                mask &= _view(np, self.dates) >= start
+            if end is not None:
+                mask &= _view(np, self.dates) < end
+            if member is not None:
+                counts = np.diff(_view(np, self.share_offsets))
+                share_rows = np.repeat(np.arange(len(self)), counts)
+                hits = share_rows[_view(np, self.share_participants) == member]
+                mask &= np.bincount(hits, minlength=len(self)) > 0
+            return self.take(np.flatnonzero(mask))
+
+        def matches(index: int) -> bool:
+            if category is not None and self.categories[index] != category:
+                return False
+            if payer is not None and self.payers[index] != payer:
+                return False
+            if start is not None and self.dates[index] < start:
+                return False
+            if end is not None and self.dates[index] >= end:
+                return False
+            if member is not None:
+                shares = self.share_participants[self.share_offsets[index]:self.share_offsets[index + 1]]
+                if member not in shares:
+                    return False
+            return True
+
+        return self.take(index for index in range(len(self)) if matches(index))
+
+    def _codes(self, np: Any, name: str) -> Tuple[Any, Callable[[Any], Any]]:
+        """Get a column as an array of codes ordered like its values, and the decoder of a code."""
+        if name == "paid_by":
+            ranks = np.argsort(np.argsort(np.asarray(self.participants, dtype=object), kind="stable"))
+            names = sorted(self.participants)
+            return ranks[_view(np, self.payers)] if len(self) else np.zeros(0, dtype=np.intp), names.__getitem__
+        if name == "split_mode":
+            return _view(np, self.split_modes), SPLIT_MODES.__getitem__
+        column = self.column(name)
+        if isinstance(column, array):
+            return _view(np, column), int
+        values = np.empty(len(column), dtype=object)
+        values[:] = column
+        return values, lambda value: value
+
+    def sort_by(self, name: str, reverse: bool = False) -> "ExpenseTable":
+        """Get the table sorted by a column; rows with equal values keep their order."""
+        np = _load_numpy()
+        if np is None:
+            values = self.column(name)
+            return self.take(sorted(range(len(self)), key=values.__getitem__, reverse=reverse))
+        codes, _ = self._codes(np, name)
+        if not reverse:
+            return self.take(np.argsort(codes, kind="stable"))
+        # Like sorted(reverse=True): sort the reversed column and reverse the result
+        order = np.argsort(codes[::-1], kind="stable")[::-1]
+        return self.take(len(self) - 1 - order)
+
+    def _groups(self, np: Any, name: str) -> Tuple[List[Any], Any, Any]:
+        """Get the distinct values of a column in order of appearance, and each row's group number."""
+        codes, decode = self._codes(np, name)
+        uniques, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+        appearance = np.argsort(first, kind="stable")
+        renumber = np.empty(len(uniques), dtype=np.intp)
+        renumber[appearance] = np.arange(len(uniques))
+        keys = [decode(value) for value in uniques[appearance].tolist()]
+        return keys, renumber[inverse.reshape(-1)], len(uniques)
+
+    def group_by(self, name: str) -> Dict[Any, "ExpenseTable"]:
+        """Split the table by the values of a column, in order of first appearance."""
+        np = _load_numpy()
+        if np is None:
+            groups: Dict[Any, List[int]] = {}
+            for index, value in enumerate(self.column(name)):
+                groups.setdefault(value, []).append(index)
+            return {value: self.take(indices) for value, indices in groups.items()}
+        keys, groups_of_rows, count = self._groups(np, name)
+        rows = np.argsort(groups_of_rows, kind="stable")
+        bounds = np.cumsum(np.bincount(groups_of_rows, minlength=count))[:-1]
+        return {key: self.take(members) for key, members in zip(keys, np.split(rows, bounds))}
+
+    def sum_by(self, name: str) -> Dict[Any, int]:
+        """Get the total amount per value of a column."""
+        np = _load_numpy()
+        if np is None:
+            totals: Dict[Any, int] = {}
+            for value, amount in zip(self.column(name), self.amounts):
+                totals[value] = totals.get(value, 0) + amount
+            return totals
+        keys, groups_of_rows, count = self._groups(np, name)
+        sums = np.zeros(count, dtype=np.int64)
+        np.add.at(sums, groups_of_rows, _view(np, self.amounts))
+        return dict(zip(keys, sums.tolist()))
+
+    def total(self) -> int:
+        """Get the sum of all amounts."""
+        return sum(self.amounts)
+
+    def to_share_matrix(self) -> ShareMatrix:
+        """Get the table as a :class:`ShareMatrix` for :func:`compute_balances`."""
+        share_expenses: List[int] = []
+        for index in range(len(self)):
+            share_expenses.extend([index] * (self.share_offsets[index + 1] - self.share_offsets[index]))
+        evenly = _SPLIT_MODE_INDEX[SplitMode.EVENLY.value]
+        return ShareMatrix(
+            participants=self.participants,
+            amounts=self.amounts,
+            payers=self.payers,
+            evenly=[mode == evenly for mode in self.split_modes],
+            share_expenses=share_expenses,
+            share_participants=self.share_participants,
+            share_weights=self.share_weights,
+        )
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP transport shared by Spliit clients.
+"""
+
+import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.request import ACCEPT_ENCODING
+from .exceptions import SpliitError
+from .instrumentation import Hooks, RequestEvent, StatsCollector, procedure_from_url
+from .retry import RetryPolicy, TokenBucket
+from .http_cache import CachedResponse, ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolConfig:
+    """Connection pool settings for a :class:`Transport`."""
+
+    # Number of per-host connection pools kept alive
+    pool_connections: int = 10
+    # Maximum number of connections kept per host
+    pool_maxsize: int = 10
+    # Block instead of opening extra connections when a host pool is exhausted
+    pool_block: bool = False
+    keep_alive: bool = True
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """Get the (connect, read) timeout tuple used by requests."""
+        return (self.connect_timeout, self.read_timeout)
+
+
+def _payload_size(kwargs: Any) -> int:
+    data = kwargs.get("data")
+    if isinstance(data, (bytes, str)):
+        return len(data)
+    params = kwargs.get("params") or {}
+    return len(params.get("input", "")) if isinstance(params, dict) else 0
+
+
+def _response_size(response: requests.Response) -> Optional[int]:
+    # Non-streamed responses are already read, so this does not consume the body
+    content = getattr(response, "_content", None)
+    if isinstance(content, bytes):
+        return len(content)
+    try:
+        return int(response.headers["Content-Length"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _cached_response(entry: CachedResponse) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.url = entry.key
+    response._content = entry.body
+    response.headers = CaseInsensitiveDict({"Content-Type": entry.content_type or "application/json"})
+    response.encoding = "utf-8"
+    response.from_cache = True  # type: ignore[attr-defined]
+    return response
+
+
+class Transport:
+    """
+    Owns a pooled ``requests.Session`` that is reused across API calls.
+
+    A single transport can be shared between several ``Spliit`` instances so
+    that all of them reuse the same keep-alive connections. Every request
+    runs the transport's :class:`Hooks`; unless disabled, a
+    :class:`StatsCollector` records per-procedure counters and latencies.
+
+    Failed requests are retried according to ``retry`` (by default only
+    queries are retried). When a ``rate_limiter`` is given, every attempt
+    takes a token from it, and a 429 response pauses it for the
+    ``Retry-After`` delay so that all clients sharing it back off together.
+
+    A transport can be used from several threads at once. Each thread
+    gets its own ``requests.Session``, since sessions are not thread-safe,
+    and all of them share one connection pool. Size ``pool_maxsize`` to the
+    number of threads sending requests to the same host.
+
+    With a :class:`ResponseCache`, queries are served from the cache or
+    revalidated with conditional requests; mutations drop the cached
+    responses of the groups they name.
+
+    A closed transport cannot be reopened: any request sent through it
+    raises :class:`SpliitError`.
+    """
+
+    def __init__(
+        self,
+        config: Optional[PoolConfig] = None,
+        collect_stats: bool = True,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
+        self.config = config or PoolConfig()
+        self.hooks = Hooks()
+        self.stats = StatsCollector().install(self.hooks) if collect_stats else None
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self._adapter: Optional[HTTPAdapter] = None
+        self._local = threading.local()
+        # Sessions of live threads; a session goes away with its thread
+        self._sessions: "weakref.WeakSet[requests.Session]" = weakref.WeakSet()
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Get the calling thread's session, creating it on first use.
+
+        Raises:
+            SpliitError: If the transport has been closed
+        """
+        if self._closed:
+            raise SpliitError("Transport is closed")
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._create_session()
+            self._local.session = session
+        return session
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        with self._lock:
+            if self._closed:
+                raise SpliitError("Transport is closed")
+            if self._adapter is None:
+                self._adapter = HTTPAdapter(
+                    pool_connections=self.config.pool_connections,
+                    pool_maxsize=self.config.pool_maxsize,
+                    pool_block=self.config.pool_block,
+                )
+            adapter = self._adapter
+            self._sessions.add(session)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        # Advertise every encoding urllib3 can decode, including brotli when installed
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        if not self.config.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request through the pooled session."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a POST request through the pooled session."""
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request through the response cache, if any, and the retry policy."""
+        kwargs.setdefault("timeout", self.config.timeout)
+        if self.cache is None:
+            return self._request(method, url, kwargs)
+        if method != "GET":
+            response = self._request(method, url, kwargs)
+            self.cache.invalidate_for(kwargs.get("data"))
+            return response
+
+        key = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.record_hit()
+            return _cached_response(entry)
+        if entry is not None:
+            kwargs["headers"] = dict(kwargs.get("headers") or {}, **entry.conditional_headers())
+        response = self._request(method, url, kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(entry, response.headers)
+            return _cached_response(entry)
+        if response.status_code == 200 and self.cache.should_store(response.headers):
+            self.cache.put(key, response.content, response.headers)
+        return response
+
+    def _request(self, method: str, url: str, kwargs: Dict[str, Any]) -> requests.Response:
+        """Send a request, retrying it according to the retry policy."""
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self._send(method, url, attempt, kwargs)
+            except requests.RequestException as error:
+                if not self.retry.should_retry_error(method, error, attempt):
+                    raise
+                delay = self.retry.delay(attempt + 1)
+            else:
+                retry_after = response.headers.get("Retry-After") if response.status_code == 429 else None
+                if retry_after is not None and self.rate_limiter is not None:
+                    self.rate_limiter.pause(self.retry.delay(attempt + 1, retry_after))
+                if not self.retry.should_retry_status(method, response.status_code, attempt):
+                    return response
+                delay = self.retry.delay(attempt + 1, retry_after)
+                response.close()
+            attempt += 1
+            logger.debug("Retrying %s %s (attempt %d) in %.2fs", method, url, attempt, delay)
+            self.retry.sleep(delay)
+
+    def _send(self, method: str, url: str, attempt: int, kwargs: Any) -> requests.Response:
+        """Send one attempt of a request, running the hooks and debug logging around it."""
+        procedure, calls = procedure_from_url(url)
+        event = RequestEvent(
+            method=method,
+            url=url,
+            procedure=procedure,
+            calls=calls,
+            payload_size=_payload_size(kwargs),
+            attempt=attempt,
+        )
+        Hooks.emit(self.hooks.before_request, event)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "%s %s params=%s body=%r", method, url, kwargs.get("params"), kwargs.get("data")
+            )
+
+        session = self.session
+        start = time.perf_counter()
+        try:
+            response = session.request(method, url, **kwargs)
+        except requests.RequestException as error:
+            event.elapsed = time.perf_counter() - start
+            event.error = error
+            logger.debug("%s %s failed after %.3fs: %s", method, procedure, event.elapsed, error)
+            Hooks.emit(self.hooks.on_error, event)
+            raise
+
+        event.elapsed = time.perf_counter() - start
+        event.status = response.status_code
+        event.response_size = _response_size(response)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "%s %s -> %s in %.3fs: %s",
+                method, procedure, response.status_code, event.elapsed, response.text,
+            )
+        Hooks.emit(self.hooks.after_response, event)
+        if isinstance(event.status, int) and event.status >= 400:
+            Hooks.emit(self.hooks.on_error, event)
+        return response
+
+    @property
+    def closed(self) -> bool:
+        """Whether :meth:`close` has been called."""
+        return self._closed
+
+    def close(self) -> None:
+        """Close every thread's session and release all pooled connections."""
+        with self._lock:
+            self._closed = True
+            sessions = list(self._sessions)
+            self._sessions = weakref.WeakSet()
+            adapter, self._adapter = self._adapter, None
+        for session in sessions:
+            session.close()
+        if adapter is not None:
+            adapter.close()
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Helpers for the tRPC batch envelope used by the Spliit API.
+"""
+
+from typing import Any, Dict, List, Optional
+from .codec import JSONCodec, default_codec
+from .exceptions import SpliitError, TRPCError
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def encode_batch_input(envelopes: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Index a list of call envelopes the way tRPC expects batched input.
+
+    Each envelope is a ``{"json": ..., "meta": ...}`` dict; the result maps
+    ``"0"``, ``"1"``, ... to the envelopes in order.
+    """
+    return {str(index): envelope for index, envelope in enumerate(envelopes)}
+
+
+def unwrap_result(item: Dict[str, Any], procedure: Optional[str] = None) -> Any:
+    """
+    Get the data of one element of a batched response.
+
+    Raises:
+        TRPCError: If the element carries an error instead of a result
+    """
+    if "error" in item:
+        error = item["error"].get("json", item["error"])
+        data = error.get("data") or {}
+        raise TRPCError(
+            error.get("message", "Unknown error"),
+            procedure=data.get("path", procedure),
+            code=data.get("code"),
+            http_status=data.get("httpStatus"),
+            data=data,
+        )
+    return item["result"]["data"].get("json")
+
+
+def decode_batch_response(response: Any, expected: int, codec: JSONCodec = default_codec) -> List[Dict[str, Any]]:
+    """
+    Decode a batched response into its per-call elements.
+
+    tRPC answers a batch with an array even when some calls fail (the HTTP
+    status is then the shared error status or 207), so the body is decoded
+    before the status is checked.
+    """
+    try:
+        items = codec.loads(response.content)
+    except ValueError:
+        items = None
+    if isinstance(items, list) and len(items) == expected:
+        return items
+    response.raise_for_status()
+    raise SpliitError(
+        f"Unexpected batch response: expected {expected} results, "
+        f"got {len(items) if isinstance(items, list) else type(items).__name__}"
+    )
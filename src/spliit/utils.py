@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Payload builders and constants shared by the Spliit clients.
+"""
+
+import uuid
+from typing import Dict, List, Tuple, Any
+from enum import Enum
+from datetime import datetime, timezone, UTC
+
+class SplitMode(str, Enum):
+    """Split modes available in Spliit."""
+    EVENLY = "EVENLY"
+    BY_SHARES = "BY_SHARES"
+    BY_PERCENTAGE = "BY_PERCENTAGE"
+    BY_AMOUNT = "BY_AMOUNT"
+
+OFFICIAL_INSTANCE = "https://spliit.app"
+
+CATEGORIES = {
+    "Uncategorized": {
+        "General": 0,
+        "Payment": 1
+    },
+    "Entertainment": {
+        "Entertainment": 2,
+        "Games": 3,
+        "Movies": 4,
+        "Music": 5,
+        "Sports": 6
+    },
+    "Food and Drink": {
+        "Food and Drink": 7,
+        "Dining Out": 8,
+        "Groceries": 9,
+        "Liquor": 10
+    },
+    "Home": {
+        "Home": 11,
+        "Electronics": 12,
+        "Furniture": 13,
+        "Household Supplies": 14,
+        "Maintenance": 15,
+        "Mortgage": 16,
+        "Pets": 17,
+        "Rent": 18,
+        "Services": 19
+    },
+    "Life": {
+        "Childcare": 20,
+        "Clothing": 21,
+        "Education": 22,
+        "Gifts": 23,
+        "Insurance": 24,
+        "Medical Expenses": 25,
+        "Taxes": 26
+    },
+    "Transportation": {
+        "Transportation": 27,
+        "Bicycle": 28,
+        "Bus/Train": 29,
+        "Car": 30,
+        "Gas/Fuel": 31,
+        "Hotel": 32,
+        "Parking": 33,
+        "Plane": 34,
+        "Taxi": 35
+    },
+    "Utilities": {
+        "Utilities": 36,
+        "Cleaning": 37,
+        "Electricity": 38,
+        "Heat/Gas": 39,
+        "Trash": 40,
+        "TV/Phone/Internet": 41,
+        "Water": 42
+    }
+}
+
+def format_expense_payload(
+    group_id: str,
+    title: str,
+    amount: int,
+    paid_by: str,
+    paid_for: List[Tuple[str, int]],
+    split_mode: SplitMode,
+    expense_date: datetime,
+    notes: str = "",
+    category: int = 0,
+    is_reimbursement: bool = False,
+) -> Dict[str, Any]:
+    """Format the expense payload according to the API requirements."""
+    # Convert paid_for to the expected format
+    formatted_paid_for = []
+    
+    for participant_id, shares in paid_for:
+        formatted_paid_for.append({
+            "participant": participant_id,
+            "shares": shares
+        })
+
+    # Format the expense date
+    formatted_date = expense_date.strftime('%Y-%m-%dT%H:%M:%S.') + f"{expense_date.microsecond // 10000:03d}Z"
+
+    # Create the expense form values
+    expense_form_values = {
+        "expenseDate": formatted_date,
+        "title": title,
+        "category": category,
+        "amount": amount,
+        "paidBy": paid_by,
+        "paidFor": formatted_paid_for,
+        "splitMode": split_mode.value,
+        "saveDefaultSplittingOptions": False,
+        "isReimbursement": is_reimbursement,
+        "documents": [],
+        "notes": notes
+    }
+
+    return {
+        "0": {
+            "json": {
+                "groupId": group_id,
+                "expenseFormValues": expense_form_values,
+                "participantId": "None"
+            },
+            "meta": {
+                "values": {
+                    "expenseFormValues.expenseDate": ["Date"]
+                }
+            }
+        }
+    }
+
+def format_group_payload(
+    name: str,
+    currency: str = "$",
+    participants: List[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """Format the group creation payload, assigning an ID to each participant."""
+    if participants is None:
+        participants = [{"name": "You"}]
+
+    # Add UUIDs to participants
+    for participant in participants:
+        participant["id"] = str(uuid.uuid4())
+
+    return {
+        "0": {
+            "json": {
+                "groupFormValues": {
+                    "name": name,
+                    "currency": currency,
+                    "information": "",
+                    "participants": participants
+                }
+            }
+        }
+    }
+
+def get_current_timestamp() -> str:
+    """Get current timestamp in Spliit format."""
+    now = datetime.now(UTC)
+    return now.strftime('%Y-%m-%dT%H:%M:%S.') + f"{now.microsecond // 10000:03d}Z"
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a Spliit timestamp (e.g. ``2025-02-11T14:10:49.423Z``) as an aware UTC datetime."""
+    try:
+        parsed = datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%fZ')
+    except ValueError:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+def format_timestamp(value: datetime) -> str:
+    """Format a datetime as a Spliit UTC timestamp."""
+    value = as_utc(value)
+    return value.strftime('%Y-%m-%dT%H:%M:%S.') + f"{value.microsecond // 1000:03d}Z"
+
+def paid_by_id(expense: Dict[str, Any]) -> str:
+    """Get the ID of the participant who paid an expense."""
+    paid_by = expense.get("paidBy")
+    if isinstance(paid_by, dict):
+        return paid_by["id"]
+    return expense.get("paidById", paid_by)
+
+def paid_for_id(paid_for: Dict[str, Any]) -> str:
+    """Get the participant ID of one ``paidFor`` entry of an expense."""
+    if "participantId" in paid_for:
+        return paid_for["participantId"]
+    participant = paid_for["participant"]
+    return participant["id"] if isinstance(participant, dict) else participant
+
+def category_id(expense: Dict[str, Any]) -> int:
+    """Get the category ID of an expense; listings return the category as an object."""
+    category = expense.get("category")
+    if isinstance(category, dict):
+        return int(category["id"])
+    if category is None:
+        return int(expense.get("categoryId") or 0)
+    return int(category)
+
+def as_utc(value: datetime) -> datetime:
+    """Get an aware UTC datetime, treating naive values as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
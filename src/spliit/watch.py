@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Change feed of a group's expenses, built by polling the expense listing.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Set, TYPE_CHECKING
+from .mirror import fingerprint
+
+if TYPE_CHECKING:
+    from .async_client import AsyncSpliit
+    from .client import Spliit
+
+
+class EventKind(str, Enum):
+    """Kind of change to an expense."""
+
+    ADDED = "added"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+@dataclass
+class ExpenseEvent:
+    """
+    A change to an expense.
+
+    ``expense`` is the expense as listed by the server, or ``None`` when it
+    was deleted.
+    """
+
+    kind: EventKind
+    expense_id: str
+    expense: Optional[Dict[str, Any]] = None
+
+
+class ExpenseWatcher:
+    """
+    Turns successive expense listings into added/updated/deleted events.
+
+    Only a digest of each expense is kept between polls, not the expense
+    itself. The polling interval starts at ``min_interval``, is multiplied
+    by ``backoff`` after every poll without changes up to ``max_interval``,
+    and drops back to ``min_interval`` as soon as something changes.
+
+    The listing is paged by offset, so an expense deleted while a listing is
+    walked shifts the later ones and one of them can be skipped. When a
+    listing misses known expenses and a way to list again is given, the
+    listing is repeated up to ``stability_checks`` times until two of them
+    miss the same expenses, and only those are reported as deleted.
+
+    Args:
+        min_interval: Seconds between polls while the group is active
+        max_interval: Longest interval between polls of an idle group
+        backoff: Growth factor of the interval after a poll without changes
+        emit_existing: Report the expenses found by the first poll as added;
+            by default they only seed the known state
+        stability_checks: Maximum number of extra listings used to confirm
+            deletions
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 5.0,
+        max_interval: float = 300.0,
+        backoff: float = 2.0,
+        emit_existing: bool = False,
+        stability_checks: int = 3,
+    ):
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("intervals must satisfy 0 < min_interval <= max_interval")
+        if backoff < 1:
+            raise ValueError("backoff must be at least 1")
+        if stability_checks < 0:
+            raise ValueError("stability_checks must not be negative")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.stability_checks = stability_checks
+        self.interval = min_interval
+        self.fingerprints: Dict[str, str] = {}
+        self._seeded = emit_existing
+        self._begin()
+
+    def _begin(self) -> None:
+        self._current: Dict[str, str] = {}
+        self._changed = False
+
+    def _observe(self, expense: Dict[str, Any]) -> Optional[ExpenseEvent]:
+        expense_id = expense["id"]
+        digest = fingerprint(expense)
+        self._current[expense_id] = digest
+        known = self.fingerprints.get(expense_id)
+        if known == digest:
+            return None
+        self._changed = True
+        if not self._seeded:
+            return None
+        return ExpenseEvent(EventKind.ADDED if known is None else EventKind.UPDATED, expense_id, expense)
+
+    def _missing(self) -> List[str]:
+        return [expense_id for expense_id in self.fingerprints if expense_id not in self._current]
+
+    def _recheck(self, missing: List[str], listed: Set[str]) -> List[str]:
+        """Keep the expenses found by a new listing; return those still missing."""
+        for expense_id in missing:
+            if expense_id in listed:
+                # Skipped by the first listing: keep the known state until the next poll
+                self._current[expense_id] = self.fingerprints[expense_id]
+        return [expense_id for expense_id in missing if expense_id not in listed]
+
+    def _end(self, deleted: List[str]) -> List[ExpenseEvent]:
+        emit = self._seeded
+        self.fingerprints = self._current
+        self._seeded = True
+        if self._changed or deleted:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        return [ExpenseEvent(EventKind.DELETED, expense_id) for expense_id in deleted] if emit else []
+
+    def diff(
+        self,
+        expenses: Iterable[Dict[str, Any]],
+        relist: Optional[Callable[[], Iterable[Dict[str, Any]]]] = None,
+    ) -> Iterator[ExpenseEvent]:
+        """
+        Compare a full listing with the previous one and adapt the interval.
+
+        Events are yielded while the listing is consumed, so only one page
+        of expenses needs to be held at a time. The known state is only
+        replaced once the iteration is exhausted: abandoning it early keeps
+        the previous state, and the next call yields the same events again.
+
+        Args:
+            expenses: Every expense of the group, consumed lazily
+            relist: Callable listing the expenses again, used to confirm
+                deletions
+
+        Yields:
+            Additions and updates in listing order, then deletions
+        """
+        self._begin()
+        for expense in expenses:
+            event = self._observe(expense)
+            if event is not None:
+                yield event
+        missing = self._missing()
+        for _ in range(self.stability_checks if relist is not None else 0):
+            if not missing:
+                break
+            still_missing = self._recheck(missing, {expense["id"] for expense in relist()})
+            if still_missing == missing:
+                break
+            missing = still_missing
+        yield from self._end(missing)
+
+    async def adiff(
+        self,
+        expenses: AsyncIterator[Dict[str, Any]],
+        relist: Optional[Callable[[], AsyncIterator[Dict[str, Any]]]] = None,
+    ) -> AsyncIterator[ExpenseEvent]:
+        """Asynchronous variant of :meth:`diff`."""
+        self._begin()
+        async for expense in expenses:
+            event = self._observe(expense)
+            if event is not None:
+                yield event
+        missing = self._missing()
+        for _ in range(self.stability_checks if relist is not None else 0):
+            if not missing:
+                break
+            still_missing = self._recheck(missing, {expense["id"] async for expense in relist()})
+            if still_missing == missing:
+                break
+            missing = still_missing
+        for event in self._end(missing):
+            yield event
+
+
+def watch(
+    client: "Spliit",
+    watcher: Optional[ExpenseWatcher] = None,
+    page_size: int = 100,
+    stop: Optional[threading.Event] = None,
+    sleep: Callable[[float], Any] = time.sleep,
+) -> Iterator[ExpenseEvent]:
+    """
+    Poll a group and yield its expense changes as they are detected.
+
+    Each poll walks the paged expense listing; with a
+    :class:`~spliit.http_cache.ResponseCache` on the transport, unchanged
+    pages are revalidated with ``304 Not Modified`` instead of downloaded.
+    Apparent deletions are confirmed by listing the group again, see
+    :class:`ExpenseWatcher`. Events are only committed to the watcher once
+    a poll has been fully consumed, so breaking out of the loop in the
+    middle of a poll's events replays them on the next call.
+
+    Args:
+        client: Client of the group to watch
+        watcher: Watcher holding the known state and polling intervals
+        page_size: Number of expenses requested per page
+        stop: Event that ends the iteration; it also interrupts the wait
+            between polls
+        sleep: Function waiting between polls when no ``stop`` event is given
+    """
+    watcher = watcher or ExpenseWatcher()
+    while stop is None or not stop.is_set():
+        yield from watcher.diff(
+            client.iter_expenses(page_size=page_size),
+            lambda: client.iter_expenses(page_size=page_size),
+        )
+        if stop is not None:
+            stop.wait(watcher.interval)
+        else:
+            sleep(watcher.interval)
+
+
+async def awatch(
+    client: "AsyncSpliit",
+    watcher: Optional[ExpenseWatcher] = None,
+    page_size: int = 100,
+    stop: Optional[asyncio.Event] = None,
+) -> AsyncIterator[ExpenseEvent]:
+    """
+    Asynchronous variant of :func:`watch` for :class:`~spliit.AsyncSpliit`.
+
+    Args:
+        client: Client of the group to watch
+        watcher: Watcher holding the known state and polling intervals
+        page_size: Number of expenses requested per page
+        stop: Event that ends the iteration and interrupts the wait between polls
+    """
+    watcher = watcher or ExpenseWatcher()
+    while stop is None or not stop.is_set():
+        listing = watcher.adiff(
+            client.iter_expenses(page_size=page_size),
+            lambda: client.iter_expenses(page_size=page_size),
+        )
+        async for event in listing:
+            yield event
+        if stop is None:
+            await asyncio.sleep(watcher.interval)
+            continue
+        try:
+            await asyncio.wait_for(stop.wait(), watcher.interval)
+        except asyncio.TimeoutError:
+            pass
@@ -1,12 +1,15 @@
 # tests/conftest.py
+import json
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, PropertyMock
 
 @pytest.fixture
 def mock_response():
-    """Create a mock response object."""
+    """Create a mock response object whose content is the encoded json() value."""
     mock = MagicMock()
     mock.raise_for_status = MagicMock()
+    mock.status_code = 200
+    type(mock).content = PropertyMock(side_effect=lambda: json.dumps(mock.json()).encode())
     return mock
 
 @pytest.fixture
@@ -15,7 +18,9 @@ def mock_requests(monkeypatch, mock_response):
     mock_get = MagicMock(return_value=mock_response)
     mock_post = MagicMock(return_value=mock_response)
     
-    monkeypatch.setattr("requests.get", mock_get)
-    monkeypatch.setattr("requests.post", mock_post)
+    def request(session, method, url, **kwargs):
+        return (mock_post if method == "POST" else mock_get)(url, **kwargs)
+
+    monkeypatch.setattr("requests.Session.request", request)
     
     return mock_get, mock_post
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from spliit import AsyncSpliit, CATEGORIES
+
+
+def _result(data):
+    return [{"result": {"data": {"json": data}}}]
+
+
+def _client(handler, **kwargs):
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncSpliit(group_id="test_group", http_client=http_client, **kwargs)
+
+
+def test_get_participants():
+    """Test that the async client parses the group like the sync one."""
+    def handler(request):
+        assert request.url.path.endswith("/groups.get,groups.getDetails")
+        return httpx.Response(200, json=_result({"group": {"participants": [
+            {"id": "user1", "name": "John"},
+            {"id": "user2", "name": "Jane"},
+        ]}}))
+
+    async def run():
+        async with _client(handler) as client:
+            return await client.get_participants()
+
+    assert asyncio.run(run()) == {"John": "user1", "Jane": "user2"}
+
+
+def test_add_expense_payload():
+    """Test that add_expense shares the sync payload builder."""
+    seen = {}
+
+    def handler(request):
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(200, json=_result({"expenseId": "e1"}))
+
+    async def run():
+        async with _client(handler) as client:
+            return await client.add_expense(
+                title="Test Expense",
+                paid_by="user1",
+                paid_for=[("user1", 50), ("user2", 50)],
+                amount=1000,
+                category=CATEGORIES["Food and Drink"]["Dining Out"],
+            )
+
+    result = asyncio.run(run())
+    assert json.loads(result)[0]["result"]["data"]["json"]["expenseId"] == "e1"
+    expense_values = seen["body"]["0"]["json"]["expenseFormValues"]
+    assert expense_values["title"] == "Test Expense"
+    assert expense_values["category"] == 8
+
+
+def test_concurrency_is_bounded():
+    """Test that no more than max_concurrency requests are in flight."""
+    state = {"active": 0, "peak": 0}
+
+    async def handler(request):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        expense_id = json.loads(request.url.params["input"])["0"]["json"]["expenseId"]
+        return httpx.Response(200, json=_result({"expense": {"id": expense_id}}))
+
+    async def run():
+        async with _client(handler, max_concurrency=3) as client:
+            return await asyncio.gather(*(client.get_expense(str(i)) for i in range(20)))
+
+    expenses = asyncio.run(run())
+    assert [expense["id"] for expense in expenses] == [str(i) for i in range(20)]
+    assert state["peak"] == 3
+
+
+def test_iter_expenses_pages():
+    """Test that the async iterator follows the cursor."""
+    def handler(request):
+        params = json.loads(request.url.params["input"])["0"]["json"]
+        cursor = params["cursor"]
+        expenses = [{"id": f"e{cursor}", "expenseDate": "2025-02-11T00:00:00.000Z"}]
+        return httpx.Response(200, json=_result({
+            "expenses": expenses, "hasMore": cursor < 2, "nextCursor": cursor + 1,
+        }))
+
+    async def run():
+        async with _client(handler) as client:
+            return [expense["id"] async for expense in client.iter_expenses(page_size=1)]
+
+    assert asyncio.run(run()) == ["e0", "e1", "e2"]
@@ -0,0 +1,55 @@
+import random
+import pytest
+from spliit import compute_balances
+from spliit.balances import _load_numpy
+
+np = _load_numpy()
+
+
+def _expense(amount, paid_by, paid_for, split_mode="EVENLY"):
+    return {
+        "amount": amount,
+        "paidBy": {"id": paid_by},
+        "paidFor": [{"participant": {"id": pid}, "shares": shares} for pid, shares in paid_for],
+        "splitMode": split_mode,
+    }
+
+
+EXPENSES = [
+    _expense(1000, "a", [("a", 1), ("b", 1), ("c", 1)]),
+    _expense(6000, "b", [("a", 7000), ("b", 3000)], "BY_PERCENTAGE"),
+    _expense(400, "c", [("a", 100), ("c", 300)], "BY_AMOUNT"),
+    _expense(8000, "a", [("b", 1), ("c", 3)], "BY_SHARES"),
+]
+
+
+@pytest.mark.parametrize("use_numpy", [False, pytest.param(True, marks=pytest.mark.skipif(np is None, reason="NumPy not installed"))])
+def test_balances_all_split_modes(use_numpy):
+    """Test shares, remainders and rounding for every split mode."""
+    balances = compute_balances(EXPENSES, use_numpy=use_numpy)
+
+    # a: 333.33 + 4200 + 100; b: 333.33 + 1800 + 2000; c: 333.33 (remainder) + 300 + 6000
+    assert (balances["a"].paid, balances["a"].paid_for) == (9000, 4633)
+    assert (balances["b"].paid, balances["b"].paid_for) == (6000, 4133)
+    assert (balances["c"].paid, balances["c"].paid_for) == (400, 6633)
+    assert balances["a"].total == 4367
+    assert balances["c"].total == -6233
+
+
+@pytest.mark.skipif(np is None, reason="NumPy not installed")
+def test_numpy_matches_python():
+    """Test that both implementations agree on random groups."""
+    rng = random.Random(42)
+    people = [f"p{i}" for i in range(8)]
+    expenses = []
+    for _ in range(500):
+        mode = rng.choice(["EVENLY", "BY_SHARES", "BY_PERCENTAGE", "BY_AMOUNT"])
+        members = rng.sample(people, rng.randint(1, len(people)))
+        expenses.append(_expense(
+            rng.randint(1, 100000),
+            rng.choice(people),
+            [(member, rng.randint(1, 500)) for member in members],
+            mode,
+        ))
+
+    assert compute_balances(expenses, use_numpy=True) == compute_balances(expenses, use_numpy=False)
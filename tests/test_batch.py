@@ -0,0 +1,91 @@
+import json
+import pytest
+from spliit import Spliit, SpliitError, TRPCError
+
+
+def _result(data):
+    return {"result": {"data": {"json": data}}}
+
+
+def _error(message, code="NOT_FOUND", status=404):
+    return {"error": {"json": {
+        "message": message,
+        "code": -32004,
+        "data": {"code": code, "httpStatus": status, "path": "groups.expenses.get"},
+    }}}
+
+
+def test_batch_coalesces_queries(mock_requests):
+    """Test that queued queries are sent in one GET and demultiplexed."""
+    mock_get, _ = mock_requests
+    mock_get.return_value.json.return_value = [
+        _result({"expense": {"id": "e1"}}),
+        _error("Expense not found"),
+        _result({"expense": {"id": "e3"}}),
+    ]
+
+    client = Spliit(group_id="test_group")
+    with client.batch() as batch:
+        first = batch.get_expense("e1")
+        missing = batch.get_expense("e2")
+        third = batch.get_expense("e3")
+
+    mock_get.assert_called_once()
+    url = mock_get.call_args[0][0]
+    assert url.endswith("/groups.expenses.get,groups.expenses.get,groups.expenses.get")
+    params_input = json.loads(mock_get.call_args[1]["params"]["input"])
+    assert params_input["1"]["json"] == {"groupId": "test_group", "expenseId": "e2"}
+
+    assert first.result() == {"id": "e1"}
+    assert third.result() == {"id": "e3"}
+    assert isinstance(missing.error, TRPCError)
+    assert missing.error.code == "NOT_FOUND"
+    with pytest.raises(TRPCError):
+        missing.result()
+
+
+def test_batch_splits_by_kind_and_size(mock_requests, mock_response):
+    """Test that mutations use POST and chunks respect max_size."""
+    mock_get, mock_post = mock_requests
+    mock_response.json.side_effect = [
+        [_result({"expense": {"id": "e1"}}), _result({"expense": {"id": "e2"}})],
+        [_result({"expense": {"id": "e3"}})],
+        [_result({"expenseId": "new"})],
+    ]
+
+    client = Spliit(group_id="test_group")
+    batch = client.batch(max_size=2)
+    for expense_id in ("e1", "e2", "e3"):
+        batch.get_expense(expense_id)
+    created = batch.add_expense(
+        title="Lunch", amount=1000, paid_by="user1", paid_for=[("user1", 1)]
+    )
+    calls = batch.execute()
+
+    assert mock_get.call_count == 2
+    mock_post.assert_called_once()
+    body = json.loads(mock_post.call_args[1]["data"])
+    assert body["0"]["json"]["expenseFormValues"]["title"] == "Lunch"
+    assert created.result() == "new"
+    assert [call.result()["id"] for call in calls[:3]] == ["e1", "e2", "e3"]
+
+
+def test_batch_request_failure_marks_every_call(mock_requests, mock_response):
+    """Test that a failed request is reported on each call."""
+    mock_response.json.side_effect = ValueError("not json")
+    mock_response.raise_for_status.side_effect = SpliitError("boom")
+
+    client = Spliit(group_id="test_group")
+    with client.batch() as batch:
+        calls = [batch.get_expense("e1"), batch.get_group()]
+
+    assert all(isinstance(call.error, SpliitError) for call in calls)
+
+
+def test_unexecuted_call_raises():
+    """Test that results are unavailable before execution."""
+    batch = Spliit(group_id="test_group").batch()
+    call = batch.get_expenses()
+    assert not call.done
+    with pytest.raises(SpliitError):
+        call.result()
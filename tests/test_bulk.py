@@ -0,0 +1,40 @@
+from spliit import Spliit, TRPCError
+from spliit.bulk import bounded_map, chunked
+
+
+def _result(data):
+    return {"result": {"data": {"json": data}}}
+
+
+def _expense(title):
+    return {"title": title, "amount": 1000, "paid_by": "user1", "paid_for": [("user1", 1)]}
+
+
+def test_add_expenses_reports_partial_failures(mock_requests, mock_response):
+    """Test chunking, input order and per-item errors."""
+    _, mock_post = mock_requests
+    mock_response.json.side_effect = [
+        [_result({"expenseId": "e0"}), {"error": {"json": {
+            "message": "Invalid amount", "data": {"code": "BAD_REQUEST"},
+        }}}],
+        [_result({"expenseId": "e3"})],
+    ]
+
+    client = Spliit(group_id="test_group")
+    expenses = [_expense("a"), _expense("b"), {"title": "missing fields"}, _expense("d")]
+    report = client.add_expenses(expenses, chunk_size=2)
+
+    # The invalid item never reaches the server, so the second chunk has one call
+    assert mock_post.call_count == 2
+    assert report.values == ["e0", None, None, "e3"]
+    assert [item.index for item in report.failed] == [1, 2]
+    assert isinstance(report.failed[0].error, TRPCError)
+    assert isinstance(report.failed[1].error, TypeError)
+    assert not report.ok
+
+
+def test_bounded_map_keeps_order():
+    """Test that parallel mapping preserves input order."""
+    assert list(bounded_map(lambda x: x * 2, range(50), workers=4)) == list(range(0, 100, 2))
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
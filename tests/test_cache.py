@@ -0,0 +1,99 @@
+from unittest.mock import MagicMock
+from spliit import Spliit, GroupCache
+from spliit.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _group_response(mock_get):
+    mock_get.return_value.json.return_value = [{
+        "result": {"data": {"json": {"group": {"participants": [
+            {"id": "user1", "name": "John"},
+            {"id": "user2", "name": "Jane"},
+        ]}}}}
+    }]
+
+
+def test_ttl_cache_expiry_and_eviction():
+    """Test TTL expiry and least-recently-used eviction."""
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=2, ttl=10, timer=timer)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+
+    timer.now = 11
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_cached_lookups_hit_network_once(mock_requests):
+    """Test that name lookups reuse one group fetch."""
+    mock_get, _ = mock_requests
+    _group_response(mock_get)
+
+    client = Spliit(group_id="test_group", cache=GroupCache())
+    assert client.get_username_id("John") == "user1"
+    assert client.get_username_id("Bob") is None
+    assert client.get_participants() == {"John": "user1", "Jane": "user2"}
+    assert client.get_participant_index().name_for("user2") == "Jane"
+    assert mock_get.call_count == 1
+
+    client.invalidate()
+    client.get_group()
+    assert mock_get.call_count == 2
+
+
+def test_writes_invalidate_cache(mock_requests):
+    """Test that writes through the client drop the cached group."""
+    mock_get, mock_post = mock_requests
+    _group_response(mock_get)
+
+    cache = GroupCache()
+    client = Spliit(group_id="test_group", cache=cache)
+    client.get_group()
+    assert len(cache) == 1
+
+    client.remove_expense("expense1")
+    assert len(cache) == 0
+
+
+def test_batched_writes_invalidate_after_sending(mock_requests):
+    """Test that batches and bulk writes drop the group once their writes are done."""
+    mock_get, mock_post = mock_requests
+    _group_response(mock_get)
+    cache = GroupCache()
+    client = Spliit(group_id="test_group", cache=cache)
+    created = MagicMock(status_code=200, content=b'[{"result":{"data":{"json":{"expenseId":"e1"}}}}]')
+
+    def concurrent_read(url, **kwargs):
+        # A reader refilling the cache while the write is in flight
+        client.get_group()
+        return created
+
+    mock_post.side_effect = concurrent_read
+    result = client.add_expenses([
+        {"title": "Dinner", "amount": 100, "paid_by": "user1", "paid_for": [("user1", 1)]},
+    ])
+    assert result.ok
+    assert len(cache) == 0
+
+    with client.batch() as batch:
+        batch.get_group()
+    assert len(cache) == 0
+    client.get_group()
+    with client.batch() as batch:
+        batch.get_expense("e1")
+    assert len(cache) == 1
+    with client.batch() as batch:
+        batch.remove_expense("e1")
+    assert len(cache) == 0
@@ -0,0 +1,72 @@
+from spliit import CATEGORIES, CategoryIndex, CategoryStats
+from spliit.balances import compute_balances
+from spliit.categories import CATEGORY_INDEX, split_amount
+
+
+def _expense(expense_id, amount, category, date, paid_for, split_mode="EVENLY", **extra):
+    return dict({
+        "id": expense_id,
+        "amount": amount,
+        "category": {"id": category, "grouping": "ignored", "name": "ignored"},
+        "expenseDate": date,
+        "paidBy": {"id": "u1", "name": "John"},
+        "paidFor": [{"participant": {"id": pid, "name": pid}, "shares": shares} for pid, shares in paid_for],
+        "splitMode": split_mode,
+    }, **extra)
+
+
+def test_category_index_lookups():
+    """Test lookups in both directions."""
+    index = CategoryIndex()
+    assert len(index) == sum(len(members) for members in CATEGORIES.values())
+    assert index.get(8).name == "Dining Out"
+    assert index.grouping_for(35) == "Transportation"
+    assert index.id_for("dining out") == 8
+    assert index.id_for("Transportation/Taxi") == 35
+    assert index.id_for("Home") == 11
+    assert index.id_for("nope") is None
+    assert index.by_grouping["Food and Drink"] == [7, 8, 9, 10]
+    assert 42 in CATEGORY_INDEX and 43 not in CATEGORY_INDEX
+
+
+def test_split_amount_assigns_remainder_to_last():
+    """Test per-participant parts for even and weighted splits."""
+    assert split_amount(_expense("e", 100, 0, "", [("a", 1), ("b", 1), ("c", 1)])) == [("a", 33), ("b", 33), ("c", 34)]
+    assert split_amount(_expense("e", 1000, 0, "", [("a", 7000), ("b", 3000)], "BY_PERCENTAGE")) == [("a", 700), ("b", 300)]
+
+
+def test_split_amount_rounds_refunds_like_balances():
+    """Test that negative amounts are rounded the same way as the balances."""
+    refund = _expense("e", -700, 0, "", [("a", 1), ("b", 1), ("c", 1)], "BY_SHARES")
+    balances = compute_balances([refund], use_numpy=False)
+    parts = dict(split_amount(refund))
+    assert parts == {"a": -233, "b": -233, "c": -234}
+    assert parts["a"] == balances["a"].paid_for
+    assert parts["b"] == balances["b"].paid_for
+
+
+def test_stats_are_updated_incrementally():
+    """Test adding, replacing and removing expenses."""
+    stats = CategoryStats.from_expenses([
+        _expense("e1", 3000, 8, "2025-01-10T00:00:00.000Z", [("u1", 1), ("u2", 1)]),
+        _expense("e2", 1000, 35, "2025-02-01T00:00:00.000Z", [("u2", 1)]),
+        _expense("e3", 500, 1, "2025-02-02T00:00:00.000Z", [("u2", 1)], isReimbursement=True),
+    ])
+    assert stats.total == 4000
+    assert stats.by_category == {8: 3000, 35: 1000}
+    assert stats.by_grouping == {"Food and Drink": 3000, "Transportation": 1000}
+    assert stats.by_participant == {"u1": 1500, "u2": 2500}
+    assert stats.by_month == {"2025-01": 3000, "2025-02": 1000}
+    assert stats.by_category_name() == {"Dining Out": 3000, "Taxi": 1000}
+
+    # An updated expense replaces its earlier contribution
+    stats.add(_expense("e2", 1200, 9, "2025-02-01T00:00:00.000Z", [("u1", 1)]))
+    assert stats.by_category == {8: 3000, 9: 1200}
+    assert stats.by_participant == {"u1": 2700, "u2": 1500}
+
+    assert stats.remove("e1")
+    assert not stats.remove("e1")
+    assert stats.by_month == {"2025-02": 1200}
+    assert stats.by_participant_category == {("u1", 9): 1200}
+    assert [(category.name, amount) for category, amount in stats.top()] == [("Groceries", 1200)]
+    assert len(stats) == 1
@@ -0,0 +1,106 @@
+import json
+import subprocess
+import sys
+import pytest
+from spliit import Spliit
+from spliit.cli import main
+from spliit.fake_server import FakeSpliitServer
+
+
+@pytest.fixture
+def group(monkeypatch):
+    with FakeSpliitServer() as server:
+        with Spliit.create_group(
+            "Trip", server_url=server.url, participants=[{"name": "John"}, {"name": "Jane"}]
+        ) as client:
+            monkeypatch.setenv("SPLIIT_GROUP_ID", client.group_id)
+            yield client
+
+
+def _run(capsys, *argv):
+    status = main(["--server-url", argv[0], *argv[1:]])
+    out, err = capsys.readouterr()
+    return status, out, err
+
+
+def test_add_list_balances_and_delete(group, capsys):
+    """Test the main subcommands against the fake server."""
+    url = group.server_url
+    status, out, _ = _run(capsys, url, "add", "Dinner", "30.00", "--paid-by", "John",
+                          "--for", "John", "--for", "Jane", "--category", "Dining Out", "--date", "2025-02-01")
+    assert status == 0
+    expense_id = out.strip()
+
+    status, out, _ = _run(capsys, url, "expenses")
+    assert out.splitlines() == [f"2025-02-01\t30.00\tDinner\tJohn\t{expense_id}"]
+
+    status, out, _ = _run(capsys, url, "balances", "--json")
+    assert json.loads(out)["Jane"]["total"] == -1500
+
+    status, out, _ = _run(capsys, url, "export", "-")
+    assert len(out.splitlines()) == 3
+
+    status, out, err = _run(capsys, url, "purge", "--title", "^Din", "--dry-run")
+    assert out.split() == [expense_id]
+    assert "Would remove 1 expenses" in err
+
+    status, out, _ = _run(capsys, url, "delete", expense_id)
+    assert status == 0
+    assert group.get_expenses() == []
+
+
+def test_errors_are_reported(group, capsys):
+    """Test that validation and server errors exit with status 1."""
+    status, _, err = _run(capsys, group.server_url, "add", "Dinner", "10", "--paid-by", "Max")
+    assert status == 1
+    assert "Unknown participant: 'Max'" in err
+
+    status, _, err = _run(capsys, group.server_url, "delete", "missing")
+    assert status == 1
+    assert "missing: " in err and "NOT_FOUND" in err
+
+
+def test_add_percentage_split_and_batched_delete(group, capsys):
+    """Test that percentages are sent as basis points and deletes are batched."""
+    url = group.server_url
+    ids = []
+    for title in ("Taxi", "Bus"):
+        status, out, _ = _run(capsys, url, "add", title, "12", "--paid-by", "Jane",
+                              "--for", "John:60", "--for", "Jane:40", "--split-mode", "BY_PERCENTAGE")
+        assert status == 0
+        ids.append(out.strip())
+    shares = [row["shares"] for row in group.get_expense(ids[0])["paidFor"]]
+    assert sorted(shares) == [4000, 6000]
+
+    status, _, err = _run(capsys, url, "add", "Taxi", "12", "--paid-by", "Jane",
+                          "--for", "John:60", "--for", "Jane:30", "--split-mode", "BY_PERCENTAGE")
+    assert status == 1
+    assert "add up to 90%" in err
+
+    status, out, _ = _run(capsys, url, "delete", *ids)
+    assert status == 0
+    assert out.split() == ids
+    assert group.get_expenses() == []
+
+
+def test_import_accepts_the_importer_options(group, capsys, tmp_path):
+    """Test that spliit import takes the same column mapping and worker options as the importer."""
+    source = tmp_path / "ledger.csv"
+    source.write_text("what,amount,paid_by,paid_for\nLunch,12.50,John,John;Jane\nSnack,2,Jane,Jane\n")
+    status, _, err = _run(capsys, group.server_url, "import", str(source), "--title-column", "what",
+                          "--workers", "2", "--chunk-size", "1")
+    assert status == 0
+    assert "Imported 2 of 2 rows" in err
+    assert sorted(expense["title"] for expense in group.get_expenses()) == ["Lunch", "Snack"]
+
+
+def test_startup_does_not_import_requests():
+    """Test that parsing arguments only loads the standard library."""
+    code = (
+        "import sys\n"
+        "from spliit.cli import build_parser\n"
+        "build_parser().parse_args(['expenses'])\n"
+        "print(sorted(name for name in ('requests', 'numpy', 'httpx', 'spliit.client') if name in sys.modules))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
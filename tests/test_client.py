@@ -91,7 +91,9 @@ def test_get_participants(mock_requests):
 def test_add_expense(mock_requests):
     """Test the add_expense method."""
     _, mock_post = mock_requests
-    mock_post.return_value.content.decode.return_value = "Success"
+    mock_post.return_value.json.return_value = [
+        {"result": {"data": {"json": {"expenseId": "expense1"}}}}
+    ]
 
     client = Spliit(group_id="test_group")
     result = client.add_expense(
@@ -102,7 +104,7 @@ def test_add_expense(mock_requests):
         category=CATEGORIES["Food and Drink"]["Dining Out"]
     )
 
-    assert result == "Success"
+    assert json.loads(result)[0]["result"]["data"]["json"]["expenseId"] == "expense1"
     
     # Verify the API call
     mock_post.assert_called_once()
@@ -110,7 +112,7 @@ def test_add_expense(mock_requests):
     assert "groups.expenses.create" in call_args[0][0]
     
     # Verify request payload
-    json_data = call_args[1]["json"]
+    json_data = json.loads(call_args[1]["data"])
     expense_values = json_data["0"]["json"]["expenseFormValues"]
     assert expense_values["title"] == "Test Expense"
     assert expense_values["amount"] == 1000
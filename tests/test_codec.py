@@ -0,0 +1,37 @@
+import json
+import pytest
+from spliit import Spliit, get_codec
+from spliit.codec import CODECS, msgspec, orjson
+
+AVAILABLE = ["json"] + [name for name, module in (("orjson", orjson), ("msgspec", msgspec)) if module is not None]
+
+
+@pytest.mark.parametrize("name", AVAILABLE)
+def test_codec_round_trip(name):
+    """Test that every installed codec encodes and decodes alike."""
+    codec = get_codec(name)
+    payload = {"0": {"json": {"groupId": "g", "amount": 1350, "notes": "café"}}}
+
+    assert json.loads(codec.dumps(payload)) == payload
+    assert codec.loads(codec.dumps_bytes(payload)) == payload
+    with pytest.raises(ValueError):
+        codec.loads(b"{not json")
+
+
+def test_client_uses_codec(mock_requests):
+    """Test that the client encodes input with its codec."""
+    mock_get, _ = mock_requests
+    mock_get.return_value.json.return_value = [
+        {"result": {"data": {"json": {"expenses": []}}}}
+    ]
+
+    client = Spliit(group_id="test_group", codec=get_codec("json"))
+    assert client.get_expenses() == []
+    assert mock_get.call_args[1]["params"]["input"] == '{"0":{"json":{"groupId":"test_group"}}}'
+
+
+def test_unknown_codec():
+    """Test that unknown codec names are rejected."""
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+    assert set(CODECS) == {"json", "orjson", "msgspec"}
@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+import subprocess
+import sys
+import pytest
+from spliit import Spliit
+from spliit.export import FIELDS, export_expenses, flatten_expense
+from spliit.fake_server import FakeSpliitServer
+
+
+@pytest.fixture
+def client():
+    with FakeSpliitServer() as server:
+        client = Spliit.create_group(
+            "Trip", server_url=server.url, participants=[{"name": "John"}, {"name": "Jane"}]
+        )
+        john, jane = client.get_username_id("John"), client.get_username_id("Jane")
+        result = client.add_expenses([
+            {"title": f"Item {index}", "amount": 100 * index, "paid_by": john,
+             "paid_for": [(john, 1), (jane, 2)], "category": 8}
+            for index in range(1, 6)
+        ])
+        assert result.ok
+        yield client
+        client.close()
+
+
+def test_flatten_expense():
+    """Test one row per paidFor entry with names taken from the listing."""
+    expense = {
+        "id": "e1", "title": "Dinner", "amount": 300, "category": {"id": 8, "name": "Dining Out"},
+        "expenseDate": "2025-02-01T00:00:00.000Z", "paidBy": {"id": "u1", "name": "John"},
+        "paidFor": [
+            {"participant": {"id": "u1", "name": "John"}, "shares": 1},
+            {"participantId": "u2", "shares": 2},
+        ],
+        "splitMode": "BY_SHARES",
+    }
+    rows = list(flatten_expense(expense))
+    assert [(row["participant_id"], row["participant_name"], row["shares"]) for row in rows] == [
+        ("u1", "John", 1), ("u2", None, 2),
+    ]
+    assert rows[0]["category"] == 8
+    assert rows[0]["paid_by_name"] == "John"
+    assert list(flatten_expense(dict(expense, paidFor=[])))[0]["participant_id"] is None
+
+
+def test_export_csv_and_jsonl(client, tmp_path):
+    """Test streaming exports with the format taken from the file name."""
+    path = tmp_path / "expenses.csv"
+    assert client.export_expenses(str(path), page_size=2) == 10
+    with open(path, newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert list(rows[0]) == list(FIELDS)
+    assert {row["participant_name"] for row in rows} == {"John", "Jane"}
+
+    buffer = io.StringIO()
+    assert export_expenses(client, buffer, format="jsonl", limit=3) == 3
+    lines = [json.loads(line) for line in buffer.getvalue().splitlines()]
+    assert [line["amount"] for line in lines] == [int(row["amount"]) for row in rows[:3]]
+
+
+def test_export_parquet_row_groups(client, tmp_path):
+    """Test that Parquet output is written in row groups."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "expenses.parquet"
+
+    assert client.export_expenses(str(path), row_group_size=4) == 10
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column_names == list(FIELDS)
+    assert sorted(set(table.column("amount").to_pylist())) == [100, 200, 300, 400, 500]
+    assert str(table.schema.field("expense_date").type) == "timestamp[ms, tz=UTC]"
+
+
+def test_import_does_not_load_pyarrow():
+    """Test that pyarrow is only imported by Arrow and Parquet exports."""
+    code = (
+        "import sys, io\n"
+        "from spliit.export import write_csv\n"
+        "write_csv([{'expense_id': 'e1'}], io.StringIO())\n"
+        "print('pyarrow' in sys.modules, 'requests' in sys.modules)\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "False False"
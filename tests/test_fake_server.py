@@ -0,0 +1,114 @@
+import json
+import pytest
+import requests
+from spliit import AsyncSpliit, Spliit, SplitMode, TRPCError
+from spliit.fake_server import FakeSpliitServer
+
+
+@pytest.fixture
+def server():
+    with FakeSpliitServer(seed=0) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    client = Spliit.create_group(
+        "Trip", server_url=server.url, participants=[{"name": "John"}, {"name": "Jane"}]
+    )
+    yield client
+    client.close()
+
+
+def test_group_and_expense_lifecycle(client):
+    """Test the client end to end against the fake server."""
+    group = client.get_group()
+    assert group["name"] == "Trip"
+    john = client.get_username_id("John")
+    jane = client.get_username_id("Jane")
+
+    response = json.loads(client.add_expense(
+        title="Dinner",
+        amount=3000,
+        paid_by=john,
+        paid_for=[(john, 50), (jane, 50)],
+        split_mode=SplitMode.BY_PERCENTAGE,
+        category=8,
+    ))
+    expense_id = response[0]["result"]["data"]["json"]["expenseId"]
+
+    expense = client.get_expense(expense_id)
+    assert expense["amount"] == 3000
+    assert expense["paidBy"]["id"] == john
+    assert {row["participantId"] for row in expense["paidFor"]} == {john, jane}
+
+    listed = client.get_expenses()
+    assert [item["id"] for item in listed] == [expense_id]
+    assert listed[0]["category"]["id"] == 8
+
+    balances = client.get_balances()
+    assert balances[john].total == 1500
+    assert balances[jane].total == -1500
+
+    client.remove_expense(expense_id)
+    assert client.get_expenses() == []
+
+
+def test_pagination_and_batching(client):
+    """Test cursor pagination and a batched request of several expenses."""
+    john = client.get_username_id("John")
+    result = client.add_expenses(
+        [{"title": f"Item {index}", "amount": 100 + index, "paid_by": john, "paid_for": [(john, 1)]}
+         for index in range(7)],
+        chunk_size=3,
+    )
+    assert result.ok
+
+    pages = list(client.iter_expenses(page_size=3))
+    assert len(pages) == 7
+    assert sorted(expense["amount"] for expense in pages) == list(range(100, 107))
+
+    with client.batch() as batch:
+        calls = [batch.get_expense(expense["id"]) for expense in pages[:4]]
+    assert [call.result()["id"] for call in calls] == [expense["id"] for expense in pages[:4]]
+
+
+def test_unknown_expense_is_not_found(client):
+    """Test that errors use the tRPC error envelope and status."""
+    with pytest.raises(requests.HTTPError) as error:
+        client.get_expense("missing")
+    assert error.value.response.status_code == 404
+    body = error.value.response.json()
+    assert body[0]["error"]["json"]["data"]["code"] == "NOT_FOUND"
+
+    with client.batch() as batch:
+        call = batch.get_expense("missing")
+    with pytest.raises(TRPCError) as trpc_error:
+        call.result()
+    assert trpc_error.value.code == "NOT_FOUND"
+
+
+def test_injected_failures(client, server):
+    """Test that injected failures are retried for queries only."""
+    client.transport.retry.sleep = lambda delay: None
+    server.fail_next(1, status=503)
+    assert client.get_expenses() == []
+    assert client.stats()["groups.expenses.list"]["retries"] == 1
+
+    john = client.get_username_id("John")
+    server.fail_next(1, status=503)
+    with pytest.raises(requests.HTTPError):
+        client.add_expense("Lunch", 100, john, [(john, 1)])
+    assert client.get_expenses() == []
+
+
+def test_async_client(server, client):
+    """Test the asyncio client against the fake server."""
+    pytest.importorskip("httpx")
+    import asyncio
+
+    async def main():
+        async with AsyncSpliit(group_id=client.group_id, server_url=server.url) as async_client:
+            return await async_client.get_participants()
+
+    assert set(asyncio.run(main())) == {"John", "Jane"}
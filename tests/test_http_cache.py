@@ -0,0 +1,103 @@
+import pytest
+from spliit import Spliit, Transport
+from spliit.fake_server import FakeSpliitServer
+from spliit.http_cache import ResponseCache
+from spliit.utils import SplitMode
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def server():
+    with FakeSpliitServer(etags=True) as server:
+        yield server
+
+
+def _group(server, cache):
+    transport = Transport(cache=cache)
+    client = Spliit.create_group(
+        "Trip", server_url=server.url, participants=[{"name": "John"}, {"name": "Jane"}], transport=transport
+    )
+    return client, transport
+
+
+def _add(client):
+    ids = client.get_participants()
+    client.add_expense(
+        title="Dinner", paid_by=ids["John"], paid_for=[(ids["John"], 1), (ids["Jane"], 1)],
+        amount=1000, split_mode=SplitMode.EVENLY,
+    )
+
+
+def test_revalidation_with_etags(server):
+    """Test that unchanged responses are reused after a 304."""
+    cache = ResponseCache()
+    client, transport = _group(server, cache)
+    _add(client)
+
+    first = client.get_expenses()
+    count = server.request_count
+    assert client.get_expenses() == first
+    assert server.request_count == count + 1
+    assert cache.stats()["revalidated"] == 1
+    assert cache.stats()["hits"] == 0
+    transport.close()
+
+
+def test_fresh_responses_skip_the_server_and_mutations_invalidate(server):
+    """Test max_age, and that writes to a group drop its responses."""
+    clock = Clock()
+    cache = ResponseCache(max_age=30, clock=clock)
+    client, transport = _group(server, cache)
+
+    assert client.get_expenses() == []
+    count = server.request_count
+    assert client.get_expenses() == []
+    assert server.request_count == count
+    assert cache.stats()["hits"] == 1
+
+    _add(client)
+    assert len(client.get_expenses()) == 1
+
+    clock.now += 60
+    count = server.request_count
+    assert len(client.get_expenses()) == 1
+    assert server.request_count == count + 1
+    assert cache.stats()["revalidated"] == 1
+
+    client.invalidate()
+    assert len(cache) == 0
+    transport.close()
+
+
+def test_eviction_and_persistence(tmp_path):
+    """Test LRU eviction by count and size, and reopening a cache file."""
+    clock = Clock()
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(path, max_entries=2, max_bytes=100, clock=clock)
+    headers = {"ETag": '"1"', "Content-Type": "application/json"}
+    for key in ("a", "b", "c"):
+        clock.now += 1
+        cache.put(key, b"x" * 10, headers)
+    assert cache.get("a") is None
+    clock.now += 1
+    cache.get("b")
+    clock.now += 1
+    cache.put("d", b"x" * 85, headers)
+    assert cache.get("c") is None
+    assert cache.get("b").body == b"x" * 10
+    cache.put("huge", b"x" * 101, headers)
+    assert cache.get("huge") is None
+    cache.close()
+
+    reopened = ResponseCache(path)
+    assert reopened.get("d").conditional_headers() == {"If-None-Match": '"1"'}
+    assert not reopened.should_store({"ETag": '"1"', "Cache-Control": "no-store"})
+    assert not reopened.should_store({})
+    reopened.close()
@@ -0,0 +1,145 @@
+import io
+import json
+import threading
+import pytest
+from spliit import Spliit, SplitMode
+from spliit.fake_server import FakeSpliitServer
+from spliit.importer import ExpenseImporter, import_file, main, read_rows
+
+CSV = """title,amount,paid_by,paid_for,split_mode,date,category
+Dinner,30.50,John,John;Jane,,2025-02-01,Dining Out
+Taxi,12,jane,John:60;Jane:40,BY_PERCENTAGE,2025-02-02T10:00:00.000Z,Transportation/Taxi
+Broken,abc,John,John,,,
+Hotel,100,John,John:25;Jane:75,BY_AMOUNT,,32
+Nobody,5,Max,John,,,
+"""
+
+
+@pytest.fixture
+def client():
+    with FakeSpliitServer() as server:
+        client = Spliit.create_group(
+            "Trip", server_url=server.url, participants=[{"name": "John"}, {"name": "Jane"}]
+        )
+        yield client
+        client.close()
+
+
+def test_import_csv_resolves_and_validates(client):
+    """Test name resolution, amount conversion and per-row errors."""
+    report = import_file(client, io.StringIO(CSV), format="csv", chunk_size=2)
+
+    assert report.rows == 5
+    assert report.imported == 3
+    assert [(error.row, error.error) for error in report.errors] == [
+        (3, "Invalid amount: 'abc'"),
+        (5, "Unknown participant: 'Max'"),
+    ]
+    expenses = {expense["title"]: expense for expense in client.get_expenses()}
+    assert expenses["Dinner"]["amount"] == 3050
+    assert expenses["Taxi"]["category"]["id"] == 35
+    assert expenses["Taxi"]["paidBy"]["id"] == client.get_username_id("Jane")
+    assert [row["shares"] for row in expenses["Taxi"]["paidFor"]] == [6000, 4000]
+    assert [row["shares"] for row in expenses["Hotel"]["paidFor"]] == [2500, 7500]
+
+
+def test_prepare_rejects_inconsistent_splits(client):
+    """Test the local split validation."""
+    importer = ExpenseImporter(client)
+    row = {"title": "Taxi", "amount": "10", "paid_by": "John", "paid_for": "John:50;Jane:40", "split_mode": "BY_PERCENTAGE"}
+    with pytest.raises(ValueError, match="add up to 90%"):
+        importer.prepare(row)
+    row["paid_for"] = "John:33.33;Jane:66.67"
+    assert importer.prepare(row)["paid_for"][1][1] == 6667
+    row["paid_for"] = "John:33.333;Jane:66.667"
+    with pytest.raises(ValueError, match="more than two decimals"):
+        importer.prepare(row)
+    row = {"title": "Taxi", "amount": 10, "paid_by": "John", "paid_for": {"John": 1, "Jane": 3}, "split_mode": "by_shares"}
+    assert importer.prepare(row)["split_mode"] is SplitMode.BY_SHARES
+    row["paid_for"] = "John:1.5;Jane:2"
+    with pytest.raises(ValueError, match="whole numbers"):
+        importer.prepare(row)
+    row["paid_for"] = "John:2.0;Jane:1"
+    assert importer.prepare(row)["paid_for"][0][1] == 2
+
+
+def test_import_resumes_from_checkpoint(client, tmp_path):
+    """Test that an interrupted import continues after the last completed chunk."""
+    checkpoint = tmp_path / "import.ckpt"
+    rows = [{"title": f"Item {index}", "amount": "1", "paid_by": "John", "paid_for": "John"} for index in range(1, 8)]
+
+    def crashing_rows():
+        for index, row in enumerate(rows, start=1):
+            if index == 6:
+                raise KeyboardInterrupt
+            yield row
+
+    with pytest.raises(KeyboardInterrupt):
+        ExpenseImporter(client).run(crashing_rows(), checkpoint=str(checkpoint), chunk_size=2)
+    assert json.loads(checkpoint.read_text())["rows"] == 4
+    assert len(client.get_expenses()) == 4
+
+    report = ExpenseImporter(client).run(rows, checkpoint=str(checkpoint), chunk_size=2)
+    assert report.resumed_from == 4
+    assert report.imported == 3
+    assert sorted(expense["title"] for expense in client.get_expenses()) == [f"Item {index}" for index in range(1, 8)]
+    assert not checkpoint.exists()
+
+
+def test_resume_skips_chunks_finished_out_of_order(client, tmp_path, monkeypatch):
+    """Test that chunks finished by other workers are not sent again after a crash mid-chunk."""
+    checkpoint = tmp_path / "import.ckpt"
+    rows = [{"title": f"Item {index}", "amount": "1", "paid_by": "John", "paid_for": "John"} for index in range(1, 11)]
+    add_expenses = client.add_expenses
+    others_done = threading.Event()
+
+    def crash_first_chunk(expenses, **kwargs):
+        if expenses[0]["title"] == "Item 1":
+            others_done.wait(5)
+            raise KeyboardInterrupt
+        result = add_expenses(expenses, **kwargs)
+        if expenses[0]["title"] == "Item 7":
+            others_done.set()
+        return result
+
+    monkeypatch.setattr(client, "add_expenses", crash_first_chunk)
+    with pytest.raises(KeyboardInterrupt):
+        ExpenseImporter(client).run(rows, checkpoint=str(checkpoint), chunk_size=2, workers=2)
+    state = json.loads(checkpoint.read_text())
+    assert (state["rows"], state["chunks"]) == (0, [[3, 4], [5, 6], [7, 8]])
+    monkeypatch.undo()
+
+    report = ExpenseImporter(client).run(rows, checkpoint=str(checkpoint), chunk_size=2, workers=2)
+    assert (report.resumed_from, report.imported) == (6, 4)
+    assert sorted(expense["title"] for expense in client.get_expenses()) == sorted(row["title"] for row in rows)
+    assert not checkpoint.exists()
+
+
+def test_main_dry_run_reads_jsonl(client, tmp_path, capsys):
+    """Test the command-line entry point with custom columns."""
+    source = tmp_path / "ledger.jsonl"
+    source.write_text(
+        json.dumps({"what": "Lunch", "amount": 1250, "paid_by": "John", "paid_for": ["John", "Jane"]}) + "\n\n"
+        + json.dumps({"what": "", "amount": 1, "paid_by": "John", "paid_for": ["John"]}) + "\n"
+    )
+    assert [row["what"] for row in read_rows(str(source))] == ["Lunch", ""]
+
+    status = main([
+        client.group_id, str(source), "--server-url", client.server_url,
+        "--title-column", "what", "--cents", "--dry-run",
+    ])
+
+    assert status == 1
+    assert "row 2: Missing title" in capsys.readouterr().err
+    assert client.get_expenses() == []
+
+
+def test_read_rows_json_array(tmp_path):
+    """Test that .json files are read as an array of records, not JSON Lines."""
+    source = tmp_path / "ledger.json"
+    source.write_text(json.dumps([{"title": "Lunch"}, {"title": "Taxi"}]), encoding="utf-8")
+    assert [row["title"] for row in read_rows(str(source))] == ["Lunch", "Taxi"]
+
+    source.write_text(json.dumps({"title": "Lunch"}), encoding="utf-8")
+    with pytest.raises(ValueError, match="array of records"):
+        list(read_rows(str(source)))
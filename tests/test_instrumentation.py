@@ -0,0 +1,88 @@
+import logging
+import pytest
+import requests
+from spliit import Spliit, Transport
+from spliit.instrumentation import LatencyHistogram, procedure_from_url
+from spliit.retry import RetryPolicy
+
+
+def _expenses_response(mock_get):
+    mock_get.return_value.json.return_value = [
+        {"result": {"data": {"json": {"expenses": []}}}}
+    ]
+
+
+def test_hooks_receive_events(mock_requests):
+    """Test that hooks see the procedure, payload size, status and timing."""
+    mock_get, _ = mock_requests
+    _expenses_response(mock_get)
+    before, after = [], []
+
+    client = Spliit(group_id="test_group")
+    client.add_hook(before_request=before.append, after_response=after.append)
+    client.get_expenses()
+
+    assert [event.procedure for event in before] == ["groups.expenses.list"]
+    event = after[0]
+    assert event.method == "GET"
+    assert event.status == 200
+    assert event.payload_size > 0
+    assert event.elapsed >= 0
+
+
+def test_stats_per_procedure(mock_requests):
+    """Test the built-in counters and histograms."""
+    mock_get, _ = mock_requests
+    _expenses_response(mock_get)
+
+    client = Spliit(group_id="test_group")
+    client.get_expenses()
+    client.get_expenses()
+    stats = client.stats()["groups.expenses.list"]
+
+    assert stats["requests"] == 2
+    assert stats["errors"] == 0
+    assert stats["statuses"] == {200: 2}
+    assert stats["latency"]["count"] == 2
+
+
+def test_errors_are_reported(mock_requests):
+    """Test that failed requests reach on_error and the error counters."""
+    mock_get, _ = mock_requests
+    mock_get.side_effect = requests.ConnectionError("unreachable")
+    errors = []
+
+    client = Spliit(group_id="test_group", transport=Transport(retry=RetryPolicy(max_retries=0)))
+    client.add_hook(on_error=errors.append)
+    with pytest.raises(requests.ConnectionError):
+        client.get_expense("e1")
+
+    assert isinstance(errors[0].error, requests.ConnectionError)
+    assert client.stats()["groups.expenses.get"]["errors"] == 1
+
+
+def test_debug_output_is_logged(mock_requests, capsys, caplog):
+    """Test that writes no longer print and log at debug level instead."""
+    _, mock_post = mock_requests
+    mock_post.return_value.json.return_value = [
+        {"result": {"data": {"json": {"expenseId": "e1"}}}}
+    ]
+
+    client = Spliit(group_id="test_group")
+    with caplog.at_level(logging.DEBUG, logger="spliit"):
+        client.add_expense(title="Lunch", amount=100, paid_by="u1", paid_for=[("u1", 1)])
+
+    assert capsys.readouterr().out == ""
+    assert any("groups.expenses.create" in record.getMessage() for record in caplog.records)
+
+
+def test_procedure_from_url_and_histogram():
+    """Test batch URL parsing and quantile estimates."""
+    url = "https://spliit.app/api/trpc/groups.expenses.get,groups.expenses.get?batch=1"
+    assert procedure_from_url(url) == ("groups.expenses.get", 2)
+
+    histogram = LatencyHistogram()
+    for value in (0.001, 0.002, 0.003, 0.2):
+        histogram.observe(value)
+    assert histogram.quantile(0.5) == 0.005
+    assert histogram.quantile(1.0) == 0.2
@@ -0,0 +1,79 @@
+import threading
+import pytest
+import requests
+from spliit import Spliit
+from spliit.fake_server import FakeSpliitServer
+from spliit.manager import SpliitManager
+
+
+@pytest.fixture
+def server():
+    with FakeSpliitServer(latency=0.01) as server:
+        yield server
+
+
+def _create_groups(server, count):
+    group_ids = []
+    for index in range(count):
+        with Spliit.create_group(f"Group {index}", server_url=server.url, participants=[{"name": "John"}]) as client:
+            group_ids.append(client.group_id)
+    return group_ids
+
+
+def test_fan_out_reports_results_and_errors(server):
+    """Test per-group results, including a group that does not exist."""
+    group_ids = _create_groups(server, 4)
+    with SpliitManager(group_ids + ["missing"], server_url=server.url, max_workers=3) as manager:
+        results = manager.get_groups()
+
+        assert [item.group_id for item in results] == group_ids + ["missing"]
+        assert [results.values[group_id]["name"] for group_id in group_ids] == [f"Group {index}" for index in range(4)]
+        assert isinstance(results.errors["missing"], requests.HTTPError)
+        assert not results.ok
+        # Every handle shares the manager's transport
+        assert all(manager[group_id].transport is manager.transport for group_id in manager)
+
+
+def test_add_expenses_across_groups(server):
+    """Test bulk writes to several groups at once."""
+    group_ids = _create_groups(server, 3)
+    with SpliitManager(group_ids, server_url=server.url) as manager:
+        payer = {group_id: manager[group_id].get_username_id("John") for group_id in group_ids}
+        results = manager.add_expenses({
+            group_id: [{"title": f"Item {index}", "amount": 100, "paid_by": payer[group_id], "paid_for": [(payer[group_id], 1)]}
+                       for index in range(count)]
+            for count, group_id in enumerate(group_ids, start=1)
+        })
+
+        assert results.ok
+        assert [len(results[group_id].value) for group_id in group_ids] == [1, 2, 3]
+        expenses = manager.get_expenses()
+        assert [len(expenses.values[group_id]) for group_id in group_ids] == [1, 2, 3]
+
+
+def test_concurrency_cap_is_global(server):
+    """Test that parallel fan-outs from several threads share the cap."""
+    group_ids = _create_groups(server, 6)
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def before(event):
+        with lock:
+            in_flight.append(event)
+            peak.append(len(in_flight))
+
+    def after(event):
+        with lock:
+            in_flight.pop()
+
+    with SpliitManager(group_ids, server_url=server.url, max_workers=2) as manager:
+        manager.transport.hooks.add(before_request=before, after_response=after)
+        threads = [threading.Thread(target=manager.get_expenses) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(peak) == 18
+    assert max(peak) <= 2
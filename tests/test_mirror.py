@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+from spliit import ExpenseMirror
+
+
+def _expense(expense_id, day, paid_by="user1", category=0, title=None, shares=None):
+    return {
+        "id": expense_id,
+        "title": title or f"Expense {expense_id}",
+        "amount": 1000,
+        "category": category,
+        "expenseDate": f"2025-02-{day:02d}T00:00:00.000Z",
+        "paidBy": {"id": paid_by, "name": paid_by},
+        "paidFor": [
+            {"participant": {"id": participant, "name": participant}, "shares": 1}
+            for participant in (shares or ["user1", "user2"])
+        ],
+        "splitMode": "EVENLY",
+        "isReimbursement": False,
+    }
+
+
+class StubClient:
+    """Serves a fixed group and expense list instead of the API."""
+
+    server_url = "https://spliit.app"
+    group_id = "test_group"
+
+    def __init__(self, expenses):
+        self.expenses = expenses
+
+    def get_group(self):
+        return {"name": "Trip", "currency": "$", "participants": [
+            {"id": "user1", "name": "John"},
+            {"id": "user2", "name": "Jane"},
+            {"id": "user3", "name": "Bob"},
+        ]}
+
+    def iter_expenses(self, page_size=100):
+        return iter(self.expenses)
+
+
+def test_incremental_sync():
+    """Test that only new, changed and deleted expenses are written."""
+    client = StubClient([_expense("e1", 1), _expense("e2", 2), _expense("e3", 3)])
+    with ExpenseMirror() as mirror:
+        first = mirror.sync(client)
+        assert (first.added, first.updated, first.deleted) == (3, 0, 0)
+
+        client.expenses = [_expense("e1", 1), _expense("e2", 2, title="Renamed"), _expense("e4", 4)]
+        second = mirror.sync(client)
+        assert (second.added, second.updated, second.deleted, second.unchanged) == (1, 1, 1, 1)
+
+        assert mirror.get_expense("test_group", "e3") is None
+        assert mirror.get_expense("test_group", "e2")["title"] == "Renamed"
+        assert mirror.participants("test_group")["Bob"] == "user3"
+
+
+def test_local_queries():
+    """Test the indexed filters of the mirror."""
+    client = StubClient([
+        _expense("e1", 1, paid_by="user1", category=8),
+        _expense("e2", 10, paid_by="user2", category=9, shares=["user2", "user3"]),
+        _expense("e3", 20, paid_by="user1", category=8),
+    ])
+    with ExpenseMirror() as mirror:
+        mirror.sync(client)
+
+        def ids(**filters):
+            return [expense["id"] for expense in mirror.expenses("test_group", **filters)]
+
+        assert ids() == ["e3", "e2", "e1"]
+        assert ids(paid_by="user1") == ["e3", "e1"]
+        assert ids(category=9) == ["e2"]
+        assert ids(participant="user3") == ["e2"]
+        assert ids(
+            date_from=datetime(2025, 2, 5, tzinfo=timezone.utc),
+            date_to=datetime(2025, 2, 20, tzinfo=timezone.utc),
+        ) == ["e2"]
+        assert ids(limit=1) == ["e3"]
@@ -0,0 +1,93 @@
+import time
+import pytest
+from spliit import Spliit, Transport
+from spliit.fake_server import FakeSpliitServer
+from spliit.outbox import Outbox
+from spliit.retry import RetryPolicy
+
+
+@pytest.fixture
+def group():
+    with FakeSpliitServer() as server:
+        with Spliit.create_group(
+            "Trip", server_url=server.url, participants=[{"name": "John"}, {"name": "Jane"}]
+        ) as client:
+            yield server, client
+
+
+def _outbox(server, path=":memory:", **kwargs):
+    return Outbox(path, server_url=server.url, transport=Transport(retry=RetryPolicy(max_retries=0)), **kwargs)
+
+
+def _add(outbox, client, title, **kwargs):
+    ids = client.get_participants()
+    return outbox.add_expense(
+        client.group_id, title=title, amount=1000, paid_by=ids["John"],
+        paid_for=[(ids["John"], 1), (ids["Jane"], 1)], **kwargs
+    )
+
+
+def test_flush_in_batches_with_dedupe(group):
+    """Test that writes are queued, deduplicated and sent in order in batches."""
+    server, client = group
+    with _outbox(server, batch_size=2) as outbox:
+        keys = [_add(outbox, client, f"Expense {n}") for n in range(5)]
+        assert _add(outbox, client, "Duplicate", idempotency_key=keys[0]) == keys[0]
+        assert len(outbox) == 5
+        assert client.get_expenses() == []
+
+        count = server.request_count
+        result = outbox.flush()
+        assert (result.sent, result.failed, result.deferred) == (5, 0, 0)
+        assert server.request_count - count == 3
+
+        titles = {expense["id"]: expense["title"] for expense in client.get_expenses()}
+        entries = [outbox.status(key) for key in keys]
+        assert [titles[entry.result] for entry in entries] == [f"Expense {n}" for n in range(5)]
+        assert all(entry.status == "done" and entry.attempts == 1 for entry in entries)
+
+        outbox.remove_expense(client.group_id, entries[0].result)
+        outbox.remove_expense(client.group_id, entries[0].result)
+        outbox.add_expense(client.group_id, "Bad", 100, "nobody", [("nobody", 1)])
+        result = outbox.flush()
+        assert (result.sent, result.failed) == (2, 1)
+        assert len(client.get_expenses()) == 4
+        assert [entry.procedure for entry in outbox.failed()] == ["groups.expenses.create"]
+        stats = outbox.stats()
+        assert (stats["pending"], stats["failed"], stats["done"]) == (0, 1, 7)
+
+
+def test_transient_failures_keep_writes_queued(group, tmp_path):
+    """Test that a failed request defers the group's writes and survives a restart."""
+    server, client = group
+    path = str(tmp_path / "outbox.db")
+    outbox = _outbox(server, path)
+    first = _add(outbox, client, "First")
+    second = _add(outbox, client, "Second")
+    server.fail_next(1, status=503)
+    result = outbox.flush()
+    assert (result.sent, result.deferred) == (0, 2)
+    assert outbox.status(first).status == "pending"
+    assert outbox.status(first).attempts == 1
+    assert outbox.stats()["consecutive_failures"] == 1
+    outbox.close()
+
+    with _outbox(server, path) as reopened:
+        assert len(reopened) == 2
+        assert reopened.flush().sent == 2
+        assert reopened.status(second).status == "done"
+        assert len(client.get_expenses()) == 2
+
+
+def test_background_flush(group):
+    """Test that the background thread sends new writes promptly."""
+    server, client = group
+    with _outbox(server) as outbox:
+        outbox.start(interval=10)
+        key = _add(outbox, client, "Coffee")
+        deadline = time.monotonic() + 5
+        while outbox.status(key).status == "pending" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        outbox.stop()
+        assert outbox.status(key).status == "done"
+        assert outbox.stats()["sent"] == 1
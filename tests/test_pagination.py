@@ -0,0 +1,46 @@
+import json
+from datetime import datetime, timezone
+from spliit import Spliit
+
+
+def _page(ids, has_more, next_cursor):
+    expenses = [
+        {"id": expense_id, "expenseDate": f"2025-02-{day:02d}T00:00:00.000Z"}
+        for expense_id, day in ids
+    ]
+    return [{"result": {"data": {"json": {
+        "expenses": expenses, "hasMore": has_more, "nextCursor": next_cursor,
+    }}}}]
+
+
+def test_iter_expenses_follows_cursor(mock_requests, mock_response):
+    """Test that pages are fetched lazily with cursor and limit."""
+    mock_get, _ = mock_requests
+    mock_response.json.side_effect = [
+        _page([("e1", 20), ("e2", 19)], True, 2),
+        _page([("e3", 18)], False, 4),
+    ]
+
+    client = Spliit(group_id="test_group")
+    expenses = client.iter_expenses(page_size=2)
+
+    assert next(expenses)["id"] == "e1"
+    assert mock_get.call_count == 1
+    assert [expense["id"] for expense in expenses] == ["e2", "e3"]
+    assert mock_get.call_count == 2
+
+    inputs = [json.loads(call[1]["params"]["input"])["0"]["json"] for call in mock_get.call_args_list]
+    assert [(i["cursor"], i["limit"]) for i in inputs] == [(0, 2), (2, 2)]
+
+
+def test_iter_expenses_since_stops_early(mock_requests, mock_response):
+    """Test that iteration stops at the first expense older than since."""
+    mock_get, _ = mock_requests
+    mock_response.json.side_effect = [
+        _page([("e1", 20), ("e2", 10)], True, 2),
+    ]
+
+    client = Spliit(group_id="test_group")
+    since = datetime(2025, 2, 15, tzinfo=timezone.utc)
+    assert [expense["id"] for expense in client.iter_expenses(since=since)] == ["e1"]
+    assert mock_get.call_count == 1
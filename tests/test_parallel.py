@@ -0,0 +1,21 @@
+from spliit import Spliit, TRPCError
+from spliit.fake_server import FakeSpliitServer
+
+
+def test_map_get_expense_in_parallel():
+    """Test parallel expense fetching against the fake server, with a missing ID."""
+    with FakeSpliitServer(latency=0.01) as server:
+        with Spliit.create_group("Trip", server_url=server.url, participants=[{"name": "John"}]) as client:
+            john = client.get_participants()["John"]
+            created = client.add_expenses(
+                [{"title": f"E{n}", "amount": 100 + n, "paid_by": john, "paid_for": [(john, 1)]} for n in range(12)]
+            ).values
+            ids = created[:6] + ["missing"] + created[6:]
+
+            report = client.map_get_expense(ids, workers=4, chunk_size=3)
+            assert [item.index for item in report.failed] == [6]
+            assert isinstance(report.failed[0].error, TRPCError)
+            assert [expense["title"] for expense in report.values if expense] == [f"E{n}" for n in range(12)]
+
+            report = client.map(lambda c, expense_id: c.get_expense(expense_id)["amount"], created, workers=6)
+            assert report.values == [100 + n for n in range(12)]
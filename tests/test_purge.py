@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+from spliit import Spliit, TRPCError
+from spliit.fake_server import FakeSpliitServer
+
+
+def test_remove_expenses_and_purge():
+    """Test batched removal, purge filters and dry runs against the fake server."""
+    with FakeSpliitServer() as server:
+        with Spliit.create_group("Trip", server_url=server.url, participants=[{"name": "John"}]) as client:
+            john = client.get_participants()["John"]
+            client.add_expenses([
+                {"title": title, "amount": 100, "paid_by": john, "paid_for": [(john, 1)], "category": category,
+                 "expense_date": datetime(2025, month, 1, tzinfo=timezone.utc)}
+                for title, category, month in [
+                    ("Taxi", 0, 1), ("Import: Hotel", 0, 2), ("Import: Dinner", 8, 3), ("Import: Bar", 8, 4),
+                ]
+            ])
+
+            report = client.purge(title_pattern="^Import", category="Dining Out", dry_run=True)
+            assert len(report) == 2
+            assert len(client.get_expenses()) == 4
+
+            count = server.request_count
+            report = client.purge(
+                date_from=datetime(2025, 2, 1), date_to=datetime(2025, 4, 1), title_pattern="^Import", chunk_size=10,
+            )
+            assert report.ok and len(report) == 2
+            assert server.request_count - count == 2  # one listing page, one batched delete
+            assert sorted(expense["title"] for expense in client.get_expenses()) == ["Import: Bar", "Taxi"]
+
+            ids = [expense["id"] for expense in client.get_expenses()]
+            report = client.remove_expenses(ids + ["missing"], chunk_size=2, workers=2)
+            assert report.values == ids + [None]
+            assert isinstance(report.failed[0].error, TRPCError)
+            assert client.get_expenses() == []
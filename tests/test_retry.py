@@ -0,0 +1,93 @@
+import pytest
+from unittest.mock import MagicMock
+from spliit import Spliit, Transport
+from spliit.retry import RetryPolicy, TokenBucket, parse_retry_after
+
+
+def _response(status, headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.headers = headers or {}
+    response.content = b'[{"result": {"data": {"json": {"expenses": []}}}}]'
+    return response
+
+
+def _transport(delays, **kwargs):
+    policy = RetryPolicy(sleep=delays.append, random=lambda: 0.5, **kwargs)
+    return Transport(retry=policy)
+
+
+def test_queries_are_retried_with_backoff_and_retry_after(mock_requests):
+    """Test exponential backoff, Retry-After and the final successful response."""
+    mock_get, _ = mock_requests
+    mock_get.side_effect = [
+        _response(503),
+        _response(429, {"Retry-After": "7"}),
+        _response(502),
+        _response(200),
+    ]
+    delays = []
+
+    client = Spliit(group_id="test_group", transport=_transport(delays))
+    assert client.get_expenses() == []
+
+    assert mock_get.call_count == 4
+    # Full jitter with random() == 0.5 halves the 0.5s, 1s and 2s backoffs
+    assert delays == [0.25, 7.0, 1.0]
+    assert client.stats()["groups.expenses.list"]["retries"] == 3
+
+
+def test_retries_are_bounded_and_mutations_not_retried(mock_requests):
+    """Test that the last error response is returned and POSTs are sent once."""
+    mock_get, mock_post = mock_requests
+    mock_get.side_effect = None
+    mock_get.return_value = _response(500)
+    mock_post.return_value = _response(503)
+    delays = []
+    transport = _transport(delays, max_retries=2)
+
+    assert transport.get("https://spliit.app/api/trpc/groups.get").status_code == 500
+    assert mock_get.call_count == 3
+    assert transport.post("https://spliit.app/api/trpc/groups.expenses.create").status_code == 503
+    assert mock_post.call_count == 1
+    assert len(delays) == 2
+
+
+def test_parse_retry_after():
+    """Test both Retry-After forms and invalid values."""
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+    assert RetryPolicy(max_retry_after=10).delay(1, "3600") == 10
+
+
+def test_token_bucket_spaces_requests_and_pauses():
+    """Test bursts up to capacity, the sustained rate and pause()."""
+    now = [0.0]
+    bucket = TokenBucket(rate=10, capacity=2, clock=lambda: now[0])
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+
+    now[0] = 1.0
+    bucket.pause(5)
+    assert bucket.reserve() == pytest.approx(5.1)
+    # The caller queued during the pause goes first
+    now[0] = 6.0
+    assert bucket.reserve() == pytest.approx(0.2)
+
+
+def test_rate_limiter_is_paused_by_429(mock_requests):
+    """Test that a rate-limited response pauses the shared limiter."""
+    mock_get, _ = mock_requests
+    mock_get.side_effect = [_response(429, {"Retry-After": "2"}), _response(200)]
+    bucket = MagicMock(spec=TokenBucket)
+    transport = Transport(retry=RetryPolicy(sleep=lambda delay: None), rate_limiter=bucket)
+
+    transport.get("https://spliit.app/api/trpc/groups.get")
+
+    assert bucket.acquire.call_count == 2
+    bucket.pause.assert_called_once_with(2.0)
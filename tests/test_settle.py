@@ -0,0 +1,54 @@
+import json
+import random
+import pytest
+from spliit import Spliit, Transfer, plan_settlement
+
+
+def _apply(balances, transfers):
+    remaining = dict(balances)
+    for transfer in transfers:
+        assert transfer.amount > 0
+        remaining[transfer.from_id] += transfer.amount
+        remaining[transfer.to_id] -= transfer.amount
+    return remaining
+
+
+@pytest.mark.parametrize("method", ["greedy", "exact", "auto"])
+def test_plan_settles_every_balance(method):
+    """Test that every method brings all balances to zero."""
+    rng = random.Random(7)
+    for _ in range(50):
+        amounts = [rng.randint(-5000, 5000) for _ in range(7)]
+        amounts.append(-sum(amounts))
+        balances = {f"p{i}": amount for i, amount in enumerate(amounts)}
+        transfers = plan_settlement(balances, method=method)
+        assert all(value == 0 for value in _apply(balances, transfers).values())
+
+
+def test_exact_finds_fewer_transfers():
+    """Test that the exact solver exploits zero-sum subgroups."""
+    balances = {"a": -900, "b": -700, "c": -400, "d": 900, "e": 1100}
+    greedy = plan_settlement(balances, method="greedy")
+    exact = plan_settlement(balances, method="exact")
+
+    # {a, d} and {b, c, e} settle independently: 1 + 2 transfers
+    assert len(exact) == 3
+    assert len(greedy) == 4
+
+
+def test_add_reimbursements(mock_requests, mock_response):
+    """Test that transfers are submitted as reimbursement expenses."""
+    _, mock_post = mock_requests
+    mock_response.json.return_value = [
+        {"result": {"data": {"json": {"expenseId": "r1"}}}},
+    ]
+
+    client = Spliit(group_id="test_group")
+    report = client.add_reimbursements([Transfer("bob", "alice", 1250)])
+
+    assert report.values == ["r1"]
+    values = json.loads(mock_post.call_args[1]["data"])["0"]["json"]["expenseFormValues"]
+    assert values["isReimbursement"] is True
+    assert values["paidBy"] == "bob"
+    assert values["paidFor"] == [{"participant": "alice", "shares": 1}]
+    assert values["amount"] == 1250
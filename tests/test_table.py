@@ -0,0 +1,94 @@
+from datetime import datetime, timezone
+import pytest
+from spliit import ExpenseTable, SplitMode, compute_balances
+
+
+def _expense(expense_id, amount, paid_by, day, category=0, paid_for=("a", "b"), split_mode="EVENLY"):
+    return {
+        "id": expense_id,
+        "title": f"Expense {expense_id}",
+        "amount": amount,
+        "category": category,
+        "expenseDate": f"2025-02-{day:02d}T12:00:00.000Z",
+        "paidBy": {"id": paid_by, "name": paid_by},
+        "paidFor": [{"participant": {"id": pid, "name": pid}, "shares": 100} for pid in paid_for],
+        "splitMode": split_mode,
+        "isReimbursement": False,
+    }
+
+
+EXPENSES = [
+    _expense("e1", 1000, "a", 3, category=8),
+    _expense("e2", 500, "b", 1, category=9, paid_for=("b", "c")),
+    _expense("e3", 2000, "a", 2, category=8, split_mode="BY_SHARES"),
+]
+
+
+def test_rows_and_columns():
+    """Test that rows round-trip the expense fields."""
+    table = ExpenseTable.from_expenses(EXPENSES)
+
+    assert len(table) == 3
+    assert table.participants == ["a", "b", "c"]
+    row = table[1]
+    assert row.id == "e2"
+    assert row.paid_by == "b"
+    assert row.paid_for == [("b", 100.0), ("c", 100.0)]
+    assert row.expense_date == datetime(2025, 2, 1, 12, tzinfo=timezone.utc)
+    assert table[-1].split_mode is SplitMode.BY_SHARES
+    with pytest.raises(AttributeError):
+        row.extra = 1
+
+
+def test_filter_sort_group():
+    """Test filtering, sorting and aggregation."""
+    table = ExpenseTable.from_expenses(EXPENSES)
+
+    assert [row.id for row in table.sort_by("expense_date")] == ["e2", "e3", "e1"]
+    assert [row.id for row in table.where(category=8)] == ["e1", "e3"]
+    assert [row.id for row in table.where(participant="c")] == ["e2"]
+    assert [row.id for row in table.filter([True, False, True])] == ["e1", "e3"]
+    assert [row.id for row in table.filter(lambda row: row.amount > 900)] == ["e1", "e3"]
+    assert table.sum_by("paid_by") == {"a": 3000, "b": 500}
+    assert {key: len(group) for key, group in table.group_by("category").items()} == {8: 2, 9: 1}
+
+
+def test_share_matrix_matches_balances():
+    """Test that balances from the table match those from raw expenses."""
+    table = ExpenseTable.from_expenses(EXPENSES)
+    assert compute_balances(table.to_share_matrix()) == compute_balances(EXPENSES)
+    assert compute_balances(table.where(category=8).to_share_matrix(), use_numpy=False)["a"].paid == 3000
+
+
+def test_numpy_and_python_paths_agree(monkeypatch):
+    """Test that the vectorized selections match the plain Python fallback."""
+    pytest.importorskip("numpy")
+    from spliit import balances
+
+    expenses = EXPENSES + [_expense("e4", 700, "c", 2, category=9, paid_for=("a", "c")), _expense("e5", 300, "b", 2)]
+    table = ExpenseTable.from_expenses(expenses)
+
+    def snapshot():
+        groups = table.group_by("paid_by")
+        return (
+            [row.id for row in table.sort_by("expense_date", reverse=True)],
+            [row.id for row in table.sort_by("paid_by")],
+            [row.paid_for for row in table.take([4, -1, 0])],
+            [row.id for row in table.where(participant="a", date_from=datetime(2025, 2, 2, tzinfo=timezone.utc))],
+            {key: [row.id for row in group] for key, group in groups.items()},
+            table.sum_by("category"),
+            all(group.participants is table.participants for group in groups.values()),
+        )
+
+    vectorized = snapshot()
+    monkeypatch.setattr(balances, "_numpy_loaded", True)
+    monkeypatch.setattr(balances, "np", None)
+    assert snapshot() == vectorized
+    assert vectorized[0] == ["e1", "e3", "e4", "e5", "e2"]
+    assert vectorized[4] == {"a": ["e1", "e3"], "b": ["e2", "e5"], "c": ["e4"]}
+    assert vectorized[6]
+
+    subset = table.take([0])
+    subset.append(_expense("e6", 100, "d", 4))
+    assert subset.participants == ["a", "b", "c", "d"]
+    assert table.participants == ["a", "b", "c"]
@@ -0,0 +1,82 @@
+import pytest
+from unittest.mock import MagicMock
+from spliit import Spliit, SpliitError, Transport, PoolConfig
+
+
+def test_transport_applies_pool_config():
+    """Test that the session adapters use the configured pool sizes."""
+    transport = Transport(PoolConfig(pool_connections=3, pool_maxsize=7, keep_alive=False))
+    adapter = transport.session.get_adapter("https://spliit.app")
+
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 7
+    assert transport.session.headers["Connection"] == "close"
+
+
+def test_transport_reused_across_calls(mock_requests):
+    """Test that every call goes through the same session with a timeout."""
+    mock_get, _ = mock_requests
+    mock_get.return_value.json.return_value = [
+        {"result": {"data": {"json": {"expenses": []}}}}
+    ]
+
+    client = Spliit(group_id="test_group")
+    session = client.transport.session
+    client.get_expenses()
+    client.get_expenses()
+
+    assert client.transport.session is session
+    assert mock_get.call_count == 2
+    assert mock_get.call_args[1]["timeout"] == PoolConfig().timeout
+
+
+def test_shared_transport_lifecycle():
+    """Test that clients only close transports they own."""
+    with Transport() as transport:
+        session = transport.session
+        with Spliit(group_id="a", transport=transport) as client_a:
+            client_b = Spliit(group_id="b", transport=transport)
+            assert client_a.transport is client_b.transport
+        assert not transport.closed
+        assert transport.session is session
+    assert transport.closed
+
+    owned = Spliit(group_id="c")
+    owned.transport.session
+    owned.close()
+    assert owned.transport.closed
+
+
+def test_sessions_are_per_thread_over_one_pool():
+    """Test that threads get their own session sharing the transport's adapter."""
+    import threading
+
+    transport = Transport()
+    sessions = []
+    threads = [threading.Thread(target=lambda: sessions.append(transport.session)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(session) for session in sessions}) == 3
+    main = transport.session
+    assert transport.session is main
+    assert len({id(session.get_adapter("https://spliit.app")) for session in sessions + [main]}) == 1
+    assert not transport.closed
+    transport.close()
+    assert transport.closed
+    with pytest.raises(SpliitError, match="closed"):
+        transport.session
+    with pytest.raises(SpliitError, match="closed"):
+        transport.get("https://spliit.app/api/trpc/groups.get")
+    transport.close()
+
+
+def test_request_keeps_the_http_method(monkeypatch):
+    """Test that every method is sent as is rather than as a GET."""
+    request = MagicMock(return_value=MagicMock(status_code=204, headers={}))
+    monkeypatch.setattr("requests.Session.request", request)
+    with Transport() as transport:
+        transport.request("DELETE", "https://spliit.app/api/trpc/groups.get")
+    assert request.call_args[0] == ("DELETE", "https://spliit.app/api/trpc/groups.get")
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+from datetime import datetime, timezone
+import pytest
+from spliit import Spliit
+from spliit.fake_server import FakeSpliitServer
+from spliit.utils import SplitMode
+from spliit.watch import EventKind, ExpenseWatcher
+
+
+def _expense(expense_id, amount=100):
+    return {"id": expense_id, "title": "Dinner", "amount": amount}
+
+
+def _kinds(events):
+    return [(event.kind, event.expense_id) for event in events]
+
+
+def test_diff_events_and_adaptive_interval():
+    """Test seeding, added/updated/deleted events and the polling interval."""
+    watcher = ExpenseWatcher(min_interval=1, max_interval=5, backoff=2)
+    assert list(watcher.diff([_expense("a"), _expense("b")])) == []
+    assert watcher.interval == 1
+
+    assert list(watcher.diff([_expense("a"), _expense("b")])) == []
+    assert watcher.interval == 2
+    list(watcher.diff([_expense("a"), _expense("b")]))
+    list(watcher.diff([_expense("a"), _expense("b")]))
+    assert watcher.interval == 5
+
+    events = list(watcher.diff([_expense("c"), _expense("a", 200)]))
+    assert _kinds(events) == [
+        (EventKind.ADDED, "c"), (EventKind.UPDATED, "a"), (EventKind.DELETED, "b"),
+    ]
+    assert events[1].expense["amount"] == 200
+    assert events[2].expense is None
+    assert watcher.interval == 1
+    assert set(watcher.fingerprints) == {"a", "c"}
+
+
+def test_emit_existing():
+    """Test that the first listing can be reported as additions."""
+    watcher = ExpenseWatcher(emit_existing=True)
+    assert _kinds(watcher.diff([_expense("a")])) == [(EventKind.ADDED, "a")]
+
+
+def test_watch_fake_server():
+    """Test the sync watch loop against the fake server, changing the group between polls."""
+    with FakeSpliitServer() as server:
+        with Spliit.create_group(
+            "Trip", server_url=server.url, participants=[{"name": "John"}, {"name": "Jane"}]
+        ) as client:
+            ids = client.get_participants()
+
+            def add(title):
+                response = client.add_expense(
+                    title=title, paid_by=ids["John"], paid_for=[(ids["John"], 1), (ids["Jane"], 1)],
+                    amount=1000, split_mode=SplitMode.EVENLY,
+                )
+                return client.codec.loads(response)[0]["result"]["data"]["json"]["expenseId"]
+
+            existing = add("Existing")
+            waits = []
+            changes = [lambda: add("Lunch"), lambda: client.remove_expense(existing)]
+
+            def sleep(interval):
+                waits.append(interval)
+                if changes:
+                    changes.pop(0)()
+
+            watcher = ExpenseWatcher(min_interval=1, max_interval=4)
+            events = []
+            for event in client.watch(watcher=watcher, sleep=sleep):
+                events.append(event)
+                if len(events) == 2:
+                    break
+            assert [(event.kind, event.expense and event.expense["title"]) for event in events] == [
+                (EventKind.ADDED, "Lunch"), (EventKind.DELETED, None),
+            ]
+            assert events[1].expense_id == existing
+            assert waits == [1, 1]
+
+            stop = threading.Event()
+            stop.set()
+            assert list(client.watch(stop=stop)) == []
+
+
+def test_awatch_fake_server():
+    """Test the async watch loop against the fake server."""
+    pytest.importorskip("httpx")
+    from spliit.async_client import AsyncSpliit
+
+    with FakeSpliitServer() as server:
+        with Spliit.create_group(
+            "Trip", server_url=server.url, participants=[{"name": "John"}]
+        ) as client:
+            ids = client.get_participants()
+
+            async def run():
+                stop = asyncio.Event()
+                watcher = ExpenseWatcher(min_interval=0.01, max_interval=0.05)
+                events = []
+                async with AsyncSpliit(group_id=client.group_id, server_url=server.url) as async_client:
+                    async for event in async_client.watch(watcher=watcher, stop=stop):
+                        events.append(event)
+                        stop.set()
+                    return events
+
+            def add():
+                client.add_expense(
+                    title="Dinner", paid_by=ids["John"], paid_for=[(ids["John"], 1)],
+                    amount=500, split_mode=SplitMode.EVENLY,
+                )
+
+            timer = threading.Timer(0.1, add)
+            timer.start()
+            events = asyncio.run(run())
+            timer.join()
+            assert _kinds(events) == [(EventKind.ADDED, events[0].expense_id)]
+            assert events[0].expense["title"] == "Dinner"
+
+
+def test_deletion_during_listing_is_not_reported():
+    """Test that an expense skipped by a shifted page is confirmed as present by a new listing."""
+    with FakeSpliitServer() as server:
+        with Spliit.create_group(
+            "Trip", server_url=server.url, participants=[{"name": "John"}]
+        ) as client:
+            ids = client.get_participants()
+            for day in (3, 2, 1):
+                client.add_expense(
+                    title=f"Day {day}", paid_by=ids["John"], paid_for=[(ids["John"], 1)], amount=100,
+                    expense_date=datetime(2025, 1, day, tzinfo=timezone.utc),
+                )
+            first, second, third = [expense["id"] for expense in client.get_expenses()]
+            watcher = ExpenseWatcher()
+            list(watcher.diff(client.iter_expenses(page_size=1)))
+
+            def listing():
+                # The first expense is deleted after the first page, so the second one is skipped
+                for index, expense in enumerate(client.iter_expenses(page_size=1)):
+                    if index == 0:
+                        client.remove_expense(first)
+                    yield expense
+
+            def relist():
+                return client.iter_expenses(page_size=1)
+
+            assert list(watcher.diff(listing(), relist)) == []
+            assert set(watcher.fingerprints) == {first, second, third}
+            assert _kinds(watcher.diff(client.iter_expenses(page_size=1), relist)) == [(EventKind.DELETED, first)]
+
+            events = watcher.diff([_expense(second)], relist)
+            assert next(events).kind is EventKind.UPDATED
+            assert _kinds(watcher.diff([_expense(second)])) == [(EventKind.UPDATED, second), (EventKind.DELETED, third)]